@@ -4,6 +4,7 @@ from django_filters import rest_framework as filters
 from rest_framework.exceptions import NotFound
 from rest_framework.exceptions import PermissionDenied
 
+from connect.common.authorizations import AuthorizationResolver
 from connect.common.models import Project, ServiceStatus
 
 
@@ -22,8 +23,8 @@ class StatusServiceFilter(filters.FilterSet):
     def filter_project_uuid(self, queryset, name, value):
         request = self.request
         try:
-            project = Project.objects.get(uuid=value)
-            authorization = project.organization.get_user_authorization(request.user)
+            project = Project.objects.select_related("organization").get(uuid=value)
+            authorization = AuthorizationResolver.for_request(request).organization(project.organization)
             if not authorization.can_read:
                 raise PermissionDenied()
             return queryset.filter(project__uuid=value)
@@ -1,9 +1,7 @@
-from django.utils import timezone
-from django.utils.timezone import timedelta
 from django.utils.translation import ugettext_lazy as _
 from rest_framework import serializers
 
-from connect.common.models import ServiceStatus, Service, NewsletterLanguage
+from connect.common.models import ServiceStatus, Service, ServiceHealth, NewsletterLanguage
 
 
 class NewsletterSerializer(serializers.ModelSerializer):
@@ -40,62 +38,25 @@ class StatusServiceSerializer(serializers.ModelSerializer):
         read_only=True,
     )
 
-    def get_service__status(self, obj):
-        def percentage(total_requests: int, percentage: int):
-            return int(total_requests * (percentage / 100))
+    def get_health(self, obj):
+        try:
+            return obj.service.health
+        except ServiceHealth.DoesNotExist:
+            obj.service.health = ServiceHealth.objects.refresh(obj.service)
+            return obj.service.health
 
+    def get_service__status(self, obj):
         if obj.service.maintenance:
             return {
                 "status": "maintenance",
                 "intercurrence": obj.service.start_maintenance,
             }
 
-        query = obj.service.log_service.filter(
-            created_at__range=[
-                timezone.now() - timedelta(minutes=30),
-                timezone.now(),
-            ],
-        )
-        total_requests = int(query.count())
-        total_fail = int(query.filter(status=False).count())
-        total_success = int(query.filter(status=True).count())
-
-        intercurrence = query.filter(status=False).first()
-
-        if (
-            percentage(total_requests=total_requests, percentage=30) <= total_fail
-            and total_success >= 1
-        ):
-            return {
-                "status": "intermittent",
-                "intercurrence": None
-                if intercurrence is None
-                else intercurrence.created_at,
-            }
-        elif percentage(total_requests=total_requests, percentage=100) <= total_fail:
-            return {
-                "status": "offline",
-                "intercurrence": None
-                if intercurrence is None
-                else intercurrence.created_at,
-            }
-
-        intercurrence = obj.service.log_service.filter(
-            created_at__range=[
-                timezone.now() - timedelta(days=10),
-                timezone.now(),
-            ],
-            status=False,
-        ).first()
-
+        health = self.get_health(obj)
         return {
-            "status": "online",
-            "intercurrence": None
-            if intercurrence is None
-            else intercurrence.created_at,
+            "status": health.status,
+            "intercurrence": health.intercurrence,
         }
 
     def get_service__last_updated(self, obj):
-        if obj.service.log_service.all().exists():
-            return obj.service.log_service.latest("created_at").created_at
-        return None
+        return self.get_health(obj).last_updated
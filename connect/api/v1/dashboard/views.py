@@ -41,6 +41,6 @@ class StatusServiceViewSet(mixins.ListModelMixin, GenericViewSet):
     """
 
     serializer_class = StatusServiceSerializer
-    queryset = ServiceStatus.objects.all()
+    queryset = ServiceStatus.objects.select_related("service", "service__health")
     filter_class = StatusServiceFilter
     permission_classes = [IsAuthenticated]
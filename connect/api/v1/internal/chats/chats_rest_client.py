@@ -1,8 +1,7 @@
 from django.conf import settings
 
-import requests
-
 from connect.api.v1.internal.internal_authentication import InternalAuthentication
+from connect.common.http import get_session
 from connect.common.models import ChatsRole
 
 
@@ -10,6 +9,7 @@ class ChatsRESTClient:
     def __init__(self):
         self.base_url = settings.CHATS_REST_ENDPOINT
         self.authentication_instance = InternalAuthentication()
+        self.session = get_session("chats")
 
     def update_user_permission(
         self, permission: int, user_email: str, project_uuid: str
@@ -24,7 +24,7 @@ class ChatsRESTClient:
             user=user_email,
             project=project_uuid
         )
-        requests.put(
+        self.session.put(
             url=f"{self.base_url}/v1/internal/permission/project/",
             headers=self.authentication_instance.headers,
             json=body,
@@ -33,7 +33,7 @@ class ChatsRESTClient:
 
     def update_user_language(self, user_email: str, language: str):
         body = dict(user_email=user_email, language=language)
-        requests.put(
+        self.session.put(
             url=f"{self.base_url}/v1/internal/user/language/",
             headers=self.authentication_instance.headers,
             json=body,
@@ -58,7 +58,7 @@ class ChatsRESTClient:
         if photo_url:
             body.update(dict(photo_url=photo_url))
 
-        requests.post(
+        self.session.post(
             url=f"{self.base_url}/v1/internal/user/",
             headers=self.authentication_instance.headers,
             json=body,
@@ -81,7 +81,7 @@ class ChatsRESTClient:
             is_template=is_template,
             user_email=user_email
         )
-        response = requests.post(
+        response = self.session.post(
             url=f"{self.base_url}/v1/internal/project/",
             headers=self.authentication_instance.headers,
             json=body,
@@ -89,7 +89,7 @@ class ChatsRESTClient:
         return response
 
     def delete_chat(self, project_uuid: str):
-        requests.delete(
+        self.session.delete(
             url=f"{self.base_url}/v1/internal/project/{project_uuid}/",
             headers=self.authentication_instance.headers,
         )
@@ -111,7 +111,7 @@ class ChatsRESTClient:
             user=user_email,
             project=str(project_uuid)
         )
-        requests.post(
+        self.session.post(
             url=f"{self.base_url}/v1/internal/permission/project/",
             headers=self.authentication_instance.headers,
             json=body
@@ -1,9 +1,9 @@
 from django.conf import settings
 
 import os
-import requests
 
 from connect.api.v1.internal.internal_authentication import InternalAuthentication
+from connect.common.http import get_session
 from connect.api.v1.internal.flows.helpers import add_classifier_to_flow
 
 
@@ -14,6 +14,7 @@ class FlowsRESTClient:
     def __init__(self):
         self.base_url = settings.FLOWS_REST_ENDPOINT
         self.authentication_instance = InternalAuthentication()
+        self.session = get_session("flows")
 
     def create_template_project(self, project_name: str, user_email: str, project_timezone: str):
         body = dict(
@@ -21,7 +22,7 @@ class FlowsRESTClient:
             timezone=project_timezone,
             user_email=user_email
         )
-        response = requests.post(
+        response = self.session.post(
             url=f"{self.base_url}/api/v2/internals/template-orgs/",
             headers=self.authentication_instance.headers,
             json=body
@@ -37,7 +38,7 @@ class FlowsRESTClient:
             sample_flow=sample_flow,
             classifier_uuid=classifier_uuid
         )
-        response = requests.post(
+        response = self.session.post(
             url=f"{self.base_url}/api/v2/internals/flows/",
             headers=self.authentication_instance.headers,
             json=body
@@ -51,7 +52,7 @@ class FlowsRESTClient:
             user_email=user_email
         )
 
-        response = requests.post(
+        response = self.session.post(
             url=f"{self.base_url}/api/v2/internals/template-orgs/",
             headers=self.authentication_instance.headers,
             json=body
@@ -65,7 +66,7 @@ class FlowsRESTClient:
         }
         if organization_name:
             body['name'] = organization_name
-        response = requests.patch(
+        response = self.session.patch(
             url=f"{self.base_url}/",
             headers=self.authentication_instance.headers,
             json=body
@@ -78,7 +79,7 @@ class FlowsRESTClient:
             user_email=user_email
         )
 
-        response = requests.delete(
+        response = self.session.delete(
             url=f"{self.base_url}/",
             headers=self.authentication_instance.headers,
             json=body
@@ -95,7 +96,7 @@ class FlowsRESTClient:
             permission=permissions.get(permission)
         )
 
-        response = requests.delete(
+        response = self.session.delete(
             url=f"{self.base_url}/",
             headers=self.authentication_instance.headers,
             json=body
@@ -111,7 +112,7 @@ class FlowsRESTClient:
             is_active=is_active,
         )
 
-        response = requests.get(
+        response = self.session.get(
             url=f"{self.base_url}/",
             headers=self.authentication_instance.headers,
             json=body
@@ -128,7 +129,7 @@ class FlowsRESTClient:
             name=classifier_name,
             access_token=access_token,
         )
-        response = requests.post(
+        response = self.session.post(
             url=f"{self.base_url}/",
             headers=self.authentication_instance.headers,
             json=body
@@ -141,7 +142,7 @@ class FlowsRESTClient:
             uuid=classifier_uuid,
             user_email=user_email
         )
-        response = requests.delete(
+        response = self.session.delete(
             url=f"{self.base_url}/",
             headers=self.authentication_instance.headers,
             json=body
@@ -150,7 +151,7 @@ class FlowsRESTClient:
 
     def get_user_api_token(self, project_uuid: str, user_email: str):
         params = dict(org=project_uuid, user=user_email)
-        response = requests.get(
+        response = self.session.get(
             url=f"{self.base_url}/api/v2/internals/users/api-token",
             params=params,
             headers=self.authentication_instance.headers
@@ -165,7 +166,7 @@ class FlowsRESTClient:
             config=config
         )
 
-        response = requests.post(
+        response = self.session.post(
             url=f"{self.base_url}/api/v2/internals/ticketers/",
             headers=self.authentication_instance.headers,
             json=body
@@ -1,8 +1,8 @@
 from django.conf import settings
 
-import requests
 import json
 from connect.api.v1.internal.internal_authentication import InternalAuthentication
+from connect.common.http import get_session
 
 
 class IntegrationsRESTClient:
@@ -10,6 +10,7 @@ class IntegrationsRESTClient:
     def __init__(self):
         self.base_url = settings.INTEGRATIONS_REST_ENDPOINT
         self.authentication_instance = InternalAuthentication()
+        self.session = get_session("integrations")
 
     def update_user_permission_project(self, project_uuid, user_email, role):
         body = {
@@ -17,7 +18,7 @@ class IntegrationsRESTClient:
             "user": user_email,
             "role": role
         }
-        response = requests.patch(
+        response = self.session.patch(
             url=f"{self.base_url}/api/v1/internal/user-permission/{project_uuid}/",
             headers=self.authentication_instance.headers,
             json=body
@@ -38,7 +39,7 @@ class IntegrationsRESTClient:
         if last_name:
             body["last_name"] = last_name
 
-        response = requests.post(
+        response = self.session.post(
             url=f"{self.base_url}/api/v1/internal/user/",
             headers=self.authentication_instance.headers,
             json=body
@@ -57,7 +58,7 @@ class IntegrationsRESTClient:
         data = {
             "project_uuid": project_uuid
         }
-        response = requests.post(url, data=json.dumps(data), headers=headers)
+        response = self.session.post(url, data=json.dumps(data), headers=headers)
 
         if response.status_code != 201:
             raise Exception(response.text)
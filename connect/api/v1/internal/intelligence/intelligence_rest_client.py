@@ -1,9 +1,9 @@
 import logging
-import requests
 import json
 from django.conf import settings
 
 from connect.api.v1.internal.internal_authentication import InternalAuthentication
+from connect.common.http import get_session
 
 logger = logging.getLogger(__name__)
 
@@ -12,9 +12,10 @@ class IntelligenceRESTClient:
     def __init__(self):
         self.base_url = settings.INTELLIGENCE_REST_ENDPOINT
         self.authentication_instance = InternalAuthentication()
+        self.session = get_session("intelligence")
 
     def list_organizations(self, user_email):
-        response = requests.get(
+        response = self.session.get(
             url=f"{self.base_url}v2/internal/organization/",
             headers=self.authentication_instance.headers,
             params={"user_email": user_email},
@@ -23,7 +24,7 @@ class IntelligenceRESTClient:
         return response.json()
 
     def get_user_organization_permission_role(self, user_email, organization_id):
-        response = requests.get(
+        response = self.session.get(
             url=f"{self.base_url}v2/internal/user/permission/",
             headers=self.authentication_instance.headers,
             params={"user_email": user_email, "org_id": organization_id},
@@ -31,7 +32,7 @@ class IntelligenceRESTClient:
         return response.json().get("role")
 
     def create_organization(self, user_email, organization_name):
-        response = requests.post(
+        response = self.session.post(
             url=f"{self.base_url}v2/internal/organization/",
             headers=self.authentication_instance.headers,
             json={"user_email": user_email, "organization_name": organization_name},
@@ -40,7 +41,7 @@ class IntelligenceRESTClient:
         return response.json()
 
     def delete_organization(self, organization_id, user_email):
-        response = requests.delete(
+        response = self.session.delete(
             url=f"{self.base_url}v2/internal/organization/{organization_id}/",
             headers=self.authentication_instance.headers,
             params={"user_email": user_email},
@@ -48,7 +49,7 @@ class IntelligenceRESTClient:
         return response.json()
 
     def update_organization(self, organization_id, organization_name, user_email):
-        response = requests.put(
+        response = self.session.put(
             url=f"{self.base_url}v2/internal/organization/{organization_id}/",
             headers=self.authentication_instance.headers,
             params={"user_email": user_email},
@@ -61,7 +62,7 @@ class IntelligenceRESTClient:
             user_email=user_email,
             org_id=organization_id
         )
-        requests.delete(
+        self.session.delete(
             url=f"{self.base_url}v2/internal/user/permissions",
             headers=self.authentication_instance.headers,
             params=params
@@ -70,7 +71,7 @@ class IntelligenceRESTClient:
     def update_user_permission_organization(
         self, organization_id, user_email, permission
     ):
-        response = requests.put(
+        response = self.session.put(
             url=f"{self.base_url}v2/internal/user/permission/",
             headers=self.authentication_instance.headers,
             params={"org_id": organization_id, "user_email": user_email},
@@ -80,7 +81,7 @@ class IntelligenceRESTClient:
 
     def get_organization_intelligences(self, intelligence_name, organization_id):
 
-        response = requests.get(
+        response = self.session.get(
             url=f"{self.base_url}v2/internal/repository/",
             headers=self.authentication_instance.headers,
             params={"name": intelligence_name, "org_id": organization_id},
@@ -89,7 +90,7 @@ class IntelligenceRESTClient:
         return response.json()
 
     def update_language(self, user_email, language):
-        response = requests.put(
+        response = self.session.put(
             url=f"{self.base_url}v2/internal/user/language/",
             headers=self.authentication_instance.headers,
             params={"user_email": user_email},
@@ -98,7 +99,7 @@ class IntelligenceRESTClient:
         return response.json()
 
     def get_organization_statistics(self, organization_id, user_email):
-        response = requests.get(
+        response = self.session.get(
             url=f"{self.base_url}v2/internal/organization/{organization_id}/",
             headers=self.authentication_instance.headers,
             params={"user_email": user_email},
@@ -108,7 +109,7 @@ class IntelligenceRESTClient:
     def get_count_intelligences_project(self, classifiers):
         auth_list = set()
         for classifier in classifiers:
-            response = requests.get(
+            response = self.session.get(
                 url=f"{self.base_url}v2/internal/repository/retrieve_authorization/",
                 headers=self.authentication_instance.headers,
                 params={
@@ -125,7 +126,7 @@ class IntelligenceRESTClient:
         body = {
             "email": user_email,
         }
-        response = requests.get(
+        response = self.session.get(
             url=f"{self.base_url}v2/repository/authorization-by-user/",
             headers=self.authentication_instance.headers,
             json=body
@@ -1,20 +1,127 @@
-import requests
+import logging
+import threading
+import time
+from collections import namedtuple
+
 from django.conf import settings
 
+from connect.common.http import get_session
 
-class InternalAuthentication:
-    # TODO: make this method private
-    def get_module_token(self):
-        request = requests.post(
-            url=settings.OIDC_OP_TOKEN_ENDPOINT,
+logger = logging.getLogger(__name__)
+
+
+CachedToken = namedtuple("CachedToken", ["token", "expires_at"])
+
+
+class TokenUnavailable(Exception):
+    pass
+
+
+class TokenProvider:
+    """
+    Process-wide cache of client credentials tokens, keyed by client id.
+
+    A token is reused until `refresh_margin` seconds before its `expires_in`.
+    Inside the margin a single caller refreshes it while the others keep
+    using the still valid token; once it is expired the other callers wait
+    for that single refresh instead of requesting their own. The locks are
+    plain threading locks, which gevent patches into greenlet-aware ones.
+    """
+
+    DEFAULT_EXPIRES_IN = 60
+
+    def __init__(self, refresh_margin: float = None):
+        self.refresh_margin = (
+            settings.INTERNAL_TOKEN_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        )
+        self.tokens = {}
+        self.locks = {}
+        self.locks_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        with self.locks_lock:
+            return {"hits": self.hits, "misses": self.misses, "cached": len(self.tokens)}
+
+    def clear(self):
+        with self.locks_lock:
+            self.tokens.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def count(self, hit: bool):
+        with self.locks_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def lock_for(self, client_id: str):
+        with self.locks_lock:
+            return self.locks.setdefault(client_id, threading.Lock())
+
+    def fetch(self, endpoint: str, client_id: str, client_secret: str):
+        request = get_session("keycloak").post(
+            url=endpoint,
             data={
-                "client_id": settings.OIDC_RP_CLIENT_ID,
-                "client_secret": settings.OIDC_RP_CLIENT_SECRET,
+                "client_id": client_id,
+                "client_secret": client_secret,
                 "grant_type": "client_credentials",
             },
         )
-        # TODO: exception token None
-        token = request.json().get("access_token")
+        data = request.json()
+        token = data.get("access_token")
+        if token is None:
+            return None
+        expires_in = data.get("expires_in") or self.DEFAULT_EXPIRES_IN
+        return CachedToken(token, time.monotonic() + float(expires_in))
+
+    def get_token(self, endpoint: str, client_id: str, client_secret: str):
+        cached = self.tokens.get(client_id)
+        now = time.monotonic()
+        if cached is not None and now < cached.expires_at - self.refresh_margin:
+            self.count(hit=True)
+            return cached.token
+
+        lock = self.lock_for(client_id)
+        still_valid = cached is not None and now < cached.expires_at
+        if not lock.acquire(blocking=not still_valid):
+            # another caller is already refreshing it
+            self.count(hit=True)
+            return cached.token
+        try:
+            cached = self.tokens.get(client_id)
+            if cached is not None and time.monotonic() < cached.expires_at - self.refresh_margin:
+                self.count(hit=True)
+                return cached.token
+
+            self.count(hit=False)
+            fetched = self.fetch(endpoint, client_id, client_secret)
+            if fetched is None:
+                # not cached, so the next caller tries again
+                logger.error(f"[keycloak] no access token returned for client {client_id}")
+                return None
+            self.tokens[client_id] = fetched
+            return fetched.token
+        finally:
+            lock.release()
+
+
+token_provider = TokenProvider()
+
+
+class InternalAuthentication:
+    # TODO: make this method private
+    def get_module_token(self):
+        token = token_provider.get_token(
+            settings.OIDC_OP_TOKEN_ENDPOINT,
+            settings.OIDC_RP_CLIENT_ID,
+            settings.OIDC_RP_CLIENT_SECRET,
+        )
+        if token is None:
+            # refuse to call the internal services unauthenticated
+            raise TokenUnavailable(f"no access token for client {settings.OIDC_RP_CLIENT_ID}")
         return f"Bearer {token}"
 
     @property
@@ -1,6 +1,10 @@
+import calendar
+from datetime import timedelta
+
 from rest_framework import serializers
 
 from connect.api.v1.project.serializers import ProjectSerializer
+from connect.billing.gateways.stripe_gateway import StripeGateway
 from connect.common.models import Invoice, InvoiceProject
 
 
@@ -18,6 +22,35 @@ class InvoiceProjectSerializer(serializers.ModelSerializer):
     project = ProjectSerializer(many=False, read_only=True)
 
 
+class InvoiceListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        """
+        Reads the Stripe charges of the whole page with one listing per
+        customer, so card_data does not call Stripe once per invoice.
+        """
+        invoices = list(data.all() if hasattr(data, "all") else data)
+        charges = {}
+        for invoice in invoices:
+            customer = invoice.organization.organization_billing.stripe_customer
+            if invoice.stripe_charge and invoice.paid_date and customer:
+                charges.setdefault(customer, []).append(invoice)
+
+        payment_method_details = self.context.setdefault("payment_method_details", {})
+        if charges:
+            gateway = StripeGateway()
+            for customer, paid_invoices in charges.items():
+                # the charge is made on the paid date, a day earlier covers the timezones
+                oldest = min(invoice.paid_date for invoice in paid_invoices) - timedelta(days=1)
+                payment_method_details.update(
+                    gateway.get_charges_payment_method_details(
+                        customer,
+                        [invoice.stripe_charge for invoice in paid_invoices],
+                        since=calendar.timegm(oldest.timetuple()),
+                    )
+                )
+        return super().to_representation(invoices)
+
+
 class InvoiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Invoice
@@ -37,7 +70,15 @@ class InvoiceSerializer(serializers.ModelSerializer):
             "card_data"
         ]
         ref_name = None
+        list_serializer_class = InvoiceListSerializer
 
+    card_data = serializers.SerializerMethodField()
     invoice_details = InvoiceProjectSerializer(
         many=True, source="organization_billing_invoice_project"
     )
+
+    def get_card_data(self, obj):
+        payment_method_details = self.context.get("payment_method_details", {})
+        if obj.stripe_charge and obj.stripe_charge not in payment_method_details:
+            return obj.card_data
+        return obj.format_card_data(payment_method_details.get(obj.stripe_charge))
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, status
 from rest_framework.filters import OrderingFilter, SearchFilter
@@ -9,7 +10,15 @@ from django.utils import timezone
 from connect.api.v1.invoice.filters import InvoiceFilter
 from connect.api.v1.invoice.serializers import InvoiceSerializer
 from connect.api.v1.metadata import Metadata
-from connect.common.models import Invoice, Organization, BillingPlan, GenericBillingData
+from connect.api.v1.project.serializers import ProjectSerializer
+from connect.common.models import (
+    Invoice,
+    InvoiceProject,
+    Organization,
+    BillingPlan,
+    GenericBillingData,
+    Project,
+)
 from connect.billing.gateways.stripe_gateway import StripeGateway
 from connect.utils import count_contacts
 from django.http import JsonResponse
@@ -34,6 +43,18 @@ class InvoiceViewSet(
     lookup_field = "pk"
     metadata_class = Metadata
 
+    def get_queryset(self, *args, **kwargs):
+        if getattr(self, "swagger_fake_view", False):
+            # queryset just for schema generation metadata
+            return Invoice.objects.none()  # pragma: no cover
+        projects = ProjectSerializer.setup_eager_loading(Project.objects.all(), self.request.user)
+        return self.queryset.select_related("organization__organization_billing").prefetch_related(
+            Prefetch(
+                "organization_billing_invoice_project",
+                queryset=InvoiceProject.objects.prefetch_related(Prefetch("project", queryset=projects)),
+            )
+        )
+
     @action(
         detail=True,
         methods=["GET"],
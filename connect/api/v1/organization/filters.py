@@ -4,6 +4,7 @@ from django_filters import rest_framework as filters
 from rest_framework.exceptions import NotFound
 from rest_framework.exceptions import PermissionDenied
 from connect.api.v1 import READ_METHODS
+from connect.common.authorizations import AuthorizationResolver
 
 from connect.common.models import (
     OrganizationAuthorization,
@@ -27,8 +28,9 @@ class OrganizationAuthorizationFilter(filters.FilterSet):
     def filter_organization_uuid(self, queryset, name, value):
         request = self.request
         try:
-            organization = Organization.objects.get(uuid=value)
-            authorization = organization.get_user_authorization(request.user)
+            resolver = AuthorizationResolver.for_request(request)
+            organization = resolver.get_organization(value)
+            authorization = resolver.organization(organization)
             if request.method in READ_METHODS:
                 if not authorization.can_contribute:
                     raise PermissionDenied()
@@ -57,8 +59,9 @@ class RequestPermissionOrganizationFilter(filters.FilterSet):
     def filter_organization_uuid(self, queryset, name, value):
         request = self.request
         try:
-            organization = Organization.objects.get(uuid=value)
-            authorization = organization.get_user_authorization(request.user)
+            resolver = AuthorizationResolver.for_request(request)
+            organization = resolver.get_organization(value)
+            authorization = resolver.organization(organization)
 
             if not authorization.is_admin:
                 raise PermissionDenied()
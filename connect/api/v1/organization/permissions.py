@@ -1,13 +1,14 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 from rest_framework import permissions
 
 from connect.api.v1 import READ_METHODS, WRITE_METHODS
-from connect.common.models import Organization, Project
+from connect.common.authorizations import AuthorizationResolver
+from connect.common.models import Invoice, Organization, Project
 
 
 class OrganizationHasPermission(permissions.BasePermission):  # pragma: no cover
     def has_object_permission(self, request, view, obj):
-        authorization = obj.get_user_authorization(request.user)
+        authorization = AuthorizationResolver.for_request(request).organization(obj)
         if request.method in READ_METHODS and not request.user.is_authenticated:
             return authorization.can_read
 
@@ -24,7 +25,7 @@ class OrganizationAdminManagerAuthorization(
     permissions.BasePermission
 ):  # pragma: no cover
     def has_object_permission(self, request, view, obj):
-        authorization = obj.organization.get_user_authorization(request.user)
+        authorization = AuthorizationResolver.for_request(request).organization(obj.organization)
         return authorization.is_admin
 
 
@@ -33,12 +34,14 @@ class OrganizationHasPermissionBilling(permissions.BasePermission):
         # if the request pass organization uuid in query params else call has_object_permission
         uuid = request.query_params.get("organization")
         if uuid:
-            obj = Organization.objects.get(uuid=uuid)
+            obj = AuthorizationResolver.for_request(request).get_organization(uuid)
             return self.has_object_permission(request, view, obj)
         return True
 
     def has_object_permission(self, request, view, obj):
-        authorization = obj.get_user_authorization(request.user)
+        if isinstance(obj, Invoice):
+            obj = obj.organization
+        authorization = AuthorizationResolver.for_request(request).organization(obj)
         return authorization.can_contribute_billing
 
 
@@ -46,10 +49,14 @@ class Has2FA(permissions.BasePermission):
     def has_permission(self, request, view):
         uuid = request.query_params.get("organization")
         if uuid:
-            organization = get_object_or_404(Organization, uuid=uuid)
+            resolver = AuthorizationResolver.for_request(request)
+            try:
+                organization = resolver.get_organization(uuid)
+            except Organization.DoesNotExist:
+                raise Http404
 
             if organization.enforce_2fa:
-                auth = organization.get_user_authorization(request._user)
+                auth = resolver.organization(organization)
                 return auth.has_2fa
             else:
                 # return true to pass this permisson check and verify others
@@ -63,7 +70,7 @@ class Has2FA(permissions.BasePermission):
             org = obj.organization
 
         if org.enforce_2fa:
-            auth = org.get_user_authorization(request.user)
+            auth = AuthorizationResolver.for_request(request).organization(org)
             return auth.has_2fa
         else:
             return True
@@ -175,7 +175,7 @@ class OrganizationSeralizer(serializers.HyperlinkedModelSerializer):
                     "role": i.role,
                     "photo_user": i.user.photo_url,
                 }
-                for i in obj.authorizations.exclude(role__in=exclude_roles)
+                for i in obj.authorizations.exclude(role__in=exclude_roles).select_related("user")
             ],
         }
 
@@ -261,13 +261,16 @@ class RequestPermissionOrganizationSerializer(serializers.ModelSerializer):
         return attrs
 
     def get_user_data(self, obj):
-        user = User.objects.filter(email=obj.email)
+        users = self.context.get("users")
+        if users is None:
+            user = User.objects.filter(email=obj.email).first()
+        else:
+            user = users.get(obj.email)
         user_data = dict(
             name=f"{obj.email}",
             photo=None
         )
-        if user.exists():
-            user = user.first()
+        if user is not None:
             user_data = dict(
                 name=f"{user.first_name} {user.last_name}",
                 photo=user.photo_url
@@ -34,6 +34,7 @@ from ..project.serializers import ProjectSerializer, TemplateProjectSerializer
 
 from connect.authentication.models import User
 from connect.celery import app as celery_app
+from connect.common.authorizations import AuthorizationResolver
 from connect.common.models import (
     Organization,
     OrganizationAuthorization,
@@ -46,6 +47,7 @@ from connect.common.models import (
 )
 from connect import billing
 from connect.billing.gateways.stripe_gateway import StripeGateway
+from connect.billing.models import ContactSketch
 from connect.utils import count_contacts
 from connect.api.v1.internal.intelligence.intelligence_rest_client import IntelligenceRESTClient
 import pendulum
@@ -80,7 +82,7 @@ class OrganizationViewSet(
             .filter(user=self.request.user)
             .values("organization")
         )
-        return self.queryset.filter(pk__in=auth)
+        return self.queryset.filter(pk__in=auth).select_related("organization_billing")
 
     def list(self, request, *args, **kwargs):
         page = self.paginate_queryset(
@@ -138,20 +140,17 @@ class OrganizationViewSet(
             if not settings.TESTING:
                 try:
                     if project_info.get("template"):
-                        flows_info = tasks.create_template_project.delay(
+                        flows_info = tasks.create_template_project(
                             project_info.get("name"),
                             user.email,
                             project_info.get("timezone")
                         )
                     else:
-                        flows_info = tasks.create_project.delay(
+                        flows_info = tasks.create_project(
                             project_name=project_info.get("name"),
                             user_email=user.email,
                             project_timezone=project_info.get("timezone")
                         )
-
-                    flows_info.wait()
-                    flows_info = flows_info.result
                 except Exception as error:
                     data.update({
                         "message": "Could not create project",
@@ -318,9 +317,14 @@ class OrganizationViewSet(
         before = pendulum.parse(before, strict=False).end_of("day")
         after = pendulum.parse(after, strict=False).start_of("day")
 
-        result = {"projects": []}
+        projects = organization.project.all()
+        result = {
+            "projects": [],
+            # approximate union over the projects, which may share contacts
+            "organization_active_contacts": ContactSketch.objects.estimate(projects, after=after, before=before),
+        }
 
-        for project in organization.project.all():
+        for project in projects:
             result["projects"].append(
                 {
                     "uuid": project.uuid,
@@ -703,7 +707,7 @@ class OrganizationAuthorizationViewSet(
             # queryset just for schema generation metadata
             return OrganizationAuthorization.objects.none()  # pragma: no cover
         exclude_roles = [ProjectRole.VIEWER.value, ProjectRole.NOT_SETTED.value]
-        return self.queryset.exclude(role__in=exclude_roles)
+        return self.queryset.exclude(role__in=exclude_roles).select_related("user")
 
     def get_object(self):
         organization_uuid = self.kwargs.get("organization__uuid")
@@ -726,6 +730,8 @@ class OrganizationAuthorizationViewSet(
             OrganizationAdminManagerAuthorization,
         ]
         response = super().update(*args, **kwargs)
+        # the role just written must be checked again, not the one read before
+        AuthorizationResolver.for_request(self.request).clear()
         instance = self.get_object()
         instance.send_new_role_email(self.request.user)
         return response
@@ -775,3 +781,16 @@ class RequestPermissionOrganizationViewSet(
     permission_classes = [IsAuthenticated, OrganizationAdminManagerAuthorization]
     filter_class = RequestPermissionOrganizationFilter
     metadata_class = Metadata
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        invites = queryset if page is None else page
+        # users already registered with the invited emails, in a single query
+        users = User.objects.in_bulk([invite.email for invite in invites], field_name="email")
+        serializer = self.get_serializer(
+            invites, many=True, context={**self.get_serializer_context(), "users": users}
+        )
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
@@ -4,6 +4,7 @@ from django_filters import rest_framework as filters
 from rest_framework.exceptions import NotFound
 from rest_framework.exceptions import PermissionDenied
 
+from connect.common.authorizations import AuthorizationResolver
 from connect.common.models import Project, Organization
 
 
@@ -21,8 +22,9 @@ class ProjectOrgFilter(filters.FilterSet):
     def filter_organization_uuid(self, queryset, name, value):  # pragma: no cover
         request = self.request
         try:
-            organization = Organization.objects.get(uuid=value)
-            authorization = organization.get_user_authorization(request.user)
+            resolver = AuthorizationResolver.for_request(request)
+            organization = resolver.get_organization(value)
+            authorization = resolver.organization(organization)
             if not authorization.can_read:
                 raise PermissionDenied()
             new_queryset = queryset.filter(organization=organization)
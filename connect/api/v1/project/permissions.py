@@ -1,11 +1,12 @@
 from rest_framework import permissions
 
 from connect.api.v1 import READ_METHODS, WRITE_METHODS
+from connect.common.authorizations import AuthorizationResolver
 
 
 class ProjectHasPermission(permissions.BasePermission):  # pragma: no cover
     def has_object_permission(self, request, view, obj):
-        authorization = obj.organization.get_user_authorization(request.user)
+        authorization = AuthorizationResolver.for_request(request).organization(obj.organization)
         if request.method in READ_METHODS and not request.user.is_authenticated:
             return authorization.can_read
 
@@ -3,6 +3,7 @@ import logging
 import uuid
 
 from django.conf import settings
+from django.db.models import OuterRef, Prefetch, Subquery
 from django.utils.translation import ugettext_lazy as _
 from rest_framework import serializers
 
@@ -21,6 +22,7 @@ from connect.common.models import (
     ProjectAuthorization,
     RocketAuthorization,
     Service,
+    ServiceStatus,
     Project,
     Organization,
     RequestPermissionProject,
@@ -94,74 +96,169 @@ class ProjectSerializer(serializers.ModelSerializer):
     wa_demo_token = serializers.SerializerMethodField()
     redirect_url = serializers.SerializerMethodField()
 
+    @staticmethod
+    def authorizations_queryset():
+        return ProjectAuthorization.objects.select_related(
+            "user", "rocket_authorization", "chats_authorization"
+        )
+
+    @staticmethod
+    def pending_authorizations_queryset():
+        # chats role of each invite, requested through Rocket or Chats
+        def requested_role(model):
+            return Subquery(
+                model.objects.filter(email=OuterRef("email")).order_by("pk").values("role")[:1]
+            )
+
+        return RequestPermissionProject.objects.select_related("created_by").annotate(
+            rocket_role=requested_role(RequestRocketPermission),
+            chats_role=requested_role(RequestChatsPermission),
+        )
+
+    @staticmethod
+    def chat_services_queryset():
+        return ServiceStatus.objects.filter(
+            service__service_type=Service.SERVICE_TYPE_CHAT
+        ).select_related("service")
+
+    @staticmethod
+    def setup_eager_loading(queryset, user):
+        """
+        Loads everything the serializer reads in a constant number of
+        queries, whatever the number of projects being listed.
+        """
+        return queryset.select_related("organization").prefetch_related(
+            Prefetch(
+                "template_project",
+                queryset=TemplateProject.objects.select_related("authorization__user").order_by("uuid"),
+                to_attr="prefetched_templates",
+            ),
+            Prefetch(
+                "project_authorizations",
+                queryset=ProjectSerializer.authorizations_queryset().exclude(
+                    role__in=[ProjectRole.SUPPORT.value]
+                ),
+                to_attr="prefetched_authorizations",
+            ),
+            Prefetch(
+                "project_authorizations",
+                queryset=ProjectSerializer.authorizations_queryset().filter(user=user),
+                to_attr="prefetched_user_authorizations",
+            ),
+            Prefetch(
+                "requestpermissionproject_set",
+                queryset=ProjectSerializer.pending_authorizations_queryset(),
+                to_attr="prefetched_pending_authorizations",
+            ),
+            Prefetch(
+                "service_status",
+                queryset=ProjectSerializer.chat_services_queryset(),
+                to_attr="prefetched_chat_services",
+            ),
+            Prefetch(
+                "opened_project",
+                queryset=OpenedProject.objects.filter(user=user).order_by("pk"),
+                to_attr="prefetched_opened_projects",
+            ),
+        )
+
+    def related(self, obj, attr: str, queryset):
+        """
+        Rows prefetched by `setup_eager_loading` in `attr`; instances loaded
+        some other way run `queryset` once and keep it for the other fields.
+        """
+        rows = getattr(obj, attr, None)
+        if rows is None:
+            rows = list(queryset)
+            setattr(obj, attr, rows)
+        return rows
+
+    def get_templates(self, obj):
+        return self.related(
+            obj,
+            "prefetched_templates",
+            obj.template_project.select_related("authorization__user").order_by("uuid"),
+        )
+
+    def get_ready_template(self, obj):
+        for template in self.get_templates(obj):
+            if template.flow_uuid is not None and template.wa_demo_token is not None and template.redirect_url is not None:
+                return template
+        return None
+
+    def get_user_authorization(self, obj, user):
+        authorizations = self.related(
+            obj,
+            "prefetched_user_authorizations",
+            self.authorizations_queryset().filter(project=obj, user=user),
+        )
+        if authorizations:
+            return authorizations[0]
+        return obj.get_user_authorization(user)
+
     def get_project_type(self, obj):
-        if obj.is_template and obj.template_project.exists():
+        if obj.is_template and self.get_templates(obj):
             return "template"
         else:
             return "blank"
 
     def get_flow_uuid(self, obj):
-        if obj.is_template and obj.template_project.exists():
-            template = obj.template_project.filter(flow_uuid__isnull=False, wa_demo_token__isnull=False, redirect_url__isnull=False).first()
+        if obj.is_template and self.get_templates(obj):
+            template = self.get_ready_template(obj)
             return template.flow_uuid
         ...
 
     def get_first_access(self, obj):
-        if obj.is_template and obj.template_project.exists():
+        if obj.is_template and self.get_templates(obj):
             user = self.context["request"].user
             email = user.email
-            authorization = obj.get_user_authorization(user)
-
-            try:
-                template = obj.template_project.get(authorization__user__email=email)
-                return template.first_access
-            except TemplateProject.DoesNotExist:
-                template_project = obj.template_project.filter(flow_uuid__isnull=False, wa_demo_token__isnull=False, redirect_url__isnull=False).first()
-                template = obj.template_project.create(
-                    flow_uuid=template_project.flow_uuid,
-                    wa_demo_token=template_project.wa_demo_token,
-                    redirect_url=template_project.redirect_url,
-                    authorization=authorization
-                )
+            authorization = self.get_user_authorization(obj, user)
+
+            for template in self.get_templates(obj):
+                if template.authorization.user.email == email:
+                    return template.first_access
+
+            template_project = self.get_ready_template(obj)
+            template = obj.template_project.create(
+                flow_uuid=template_project.flow_uuid,
+                wa_demo_token=template_project.wa_demo_token,
+                redirect_url=template_project.redirect_url,
+                authorization=authorization
+            )
         ...
 
     def get_wa_demo_token(self, obj):
-        if obj.is_template and obj.template_project.exists():
-            template = obj.template_project.filter(flow_uuid__isnull=False, wa_demo_token__isnull=False, redirect_url__isnull=False).first()
+        if obj.is_template and self.get_templates(obj):
+            template = self.get_ready_template(obj)
             return template.wa_demo_token
         ...
 
     def get_redirect_url(self, obj):
-        if obj.is_template and obj.template_project.exists():
-            template = obj.template_project.filter(flow_uuid__isnull=False, wa_demo_token__isnull=False, redirect_url__isnull=False).first()
+        if obj.is_template and self.get_templates(obj):
+            template = self.get_ready_template(obj)
             return template.redirect_url
         ...
 
     def get_menu(self, obj):
         chats_formatted_url = settings.CHATS_URL + "loginexternal/{{token}}/"
+        chat_services = self.related(
+            obj, "prefetched_chat_services", self.chat_services_queryset().filter(project=obj)
+        )
         return {
             "inteligence": settings.INTELIGENCE_URL,
             "flows": settings.FLOWS_URL,
             "integrations": settings.INTEGRATIONS_URL,
             "chats": chats_formatted_url,
-            "chat": list(
-                obj.service_status.filter(
-                    service__service_type=Service.SERVICE_TYPE_CHAT
-                ).values_list("service__url", flat=True)
-            ),
+            "chat": [service_status.service.url for service_status in chat_services],
         }
 
     def create(self, validated_data):
         user = self.context["request"].user
-        task = tasks.create_project.delay(  # pragma: no cover
+        project = tasks.create_project(
             validated_data.get("name"),
             user.email,
             str(validated_data.get("timezone")),
         )
-        if not settings.TESTING:
-            task.wait()  # pragma: no cover
-
-        project = task.result
 
         validated_data.update(
             {
@@ -183,12 +280,16 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     def get_authorizations(self, obj):
         exclude_roles = [ProjectRole.SUPPORT.value]
-        queryset = obj.project_authorizations.exclude(role__in=exclude_roles)
+        authorizations = self.related(
+            obj,
+            "prefetched_authorizations",
+            self.authorizations_queryset().filter(project=obj).exclude(role__in=exclude_roles),
+        )
         response = dict(
-            count=queryset.count(),
+            count=len(authorizations),
             users=[]
         )
-        for i in queryset:
+        for i in authorizations:
             chats_role = None
             if i.rocket_authorization:
                 chats_role = i.rocket_authorization.role
@@ -208,22 +309,17 @@ class ProjectSerializer(serializers.ModelSerializer):
         return response
 
     def get_pending_authorizations(self, obj):
+        pending_authorizations = self.related(
+            obj,
+            "prefetched_pending_authorizations",
+            self.pending_authorizations_queryset().filter(project=obj),
+        )
         response = {
-            "count": obj.requestpermissionproject_set.count(),
+            "count": len(pending_authorizations),
             "users": [],
         }
-        for i in obj.requestpermissionproject_set.all():
-            rocket_authorization = RequestRocketPermission.objects.filter(email=i.email)
-            chats_authorization = RequestChatsPermission.objects.filter(email=i.email)
-            chats_role = None
-            if(len(rocket_authorization) > 0):
-                rocket_authorization = rocket_authorization.first()
-                chats_role = rocket_authorization.role
-
-            if len(chats_authorization) > 0:
-                chats_authorization = chats_authorization.first()
-                chats_role = chats_authorization.role
-
+        for i in pending_authorizations:
+            chats_role = i.chats_role if i.chats_role is not None else i.rocket_role
             response["users"].append(
                 dict(
                     email=i.email,
@@ -240,7 +336,7 @@ class ProjectSerializer(serializers.ModelSerializer):
             return None
 
         data = ProjectAuthorizationSerializer(
-            obj.get_user_authorization(request.user)
+            self.get_user_authorization(obj, request.user)
         ).data
         return data
 
@@ -248,11 +344,14 @@ class ProjectSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
             return None
-        opened = OpenedProject.objects.filter(user__email=request.user, project=obj.uuid)
+        opened = self.related(
+            obj,
+            "prefetched_opened_projects",
+            OpenedProject.objects.filter(user=request.user, project=obj).order_by("pk"),
+        )
         response = None
-        if opened.exists():
-            opened = opened.first()
-            response = opened.day
+        if opened:
+            response = opened[0].day
         return response
 
 
@@ -394,12 +493,11 @@ class ListChannelSerializer(serializers.Serializer):
     channel_data = serializers.SerializerMethodField()
 
     def get_channel_data(self, obj):
-        task = tasks.list_channels.delay(
+        channels = tasks.list_channels(
             project_uuid=str(obj.flow_organization),
             channel_type=self.context["channel_type"],
         )
-        task.wait()
-        return dict(project_uuid=obj.uuid, channels=task.result)
+        return dict(project_uuid=obj.uuid, channels=channels)
 
 
 class CreateWACChannelSerializer(serializers.Serializer):
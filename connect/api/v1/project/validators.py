@@ -1,10 +1,12 @@
 from django.utils.translation import ugettext_lazy as _
 from rest_framework.exceptions import PermissionDenied
 
+from connect.common.authorizations import AuthorizationResolver
+
 
 class CanContributeInOrganizationValidator(object):
     def __call__(self, value):
-        user_authorization = value.get_user_authorization(self.request.user)
+        user_authorization = AuthorizationResolver.for_request(self.request).organization(value)
         if not user_authorization.can_contribute:
             raise PermissionDenied(
                 _("You can't contribute in this organization")
@@ -40,6 +40,7 @@ from connect.api.v1.project.serializers import (
 )
 
 from connect.celery import app as celery_app
+from connect.common.authorizations import AuthorizationResolver
 from connect.common.models import (
     Organization,
     ChatsAuthorization,
@@ -97,7 +98,8 @@ class ProjectViewSet(
         ) & Q(
             opened_project__user=self.request.user
         )
-        return self.queryset.filter(organization__pk__in=auth).filter(filter).order_by("-opened_project__day")
+        queryset = self.queryset.filter(organization__pk__in=auth).filter(filter).order_by("-opened_project__day")
+        return ProjectSerializer.setup_eager_loading(queryset, self.request.user)
 
     def perform_destroy(self, instance):
         flow_organization = instance.flow_organization
@@ -129,25 +131,21 @@ class ProjectViewSet(
 
         project = Project.objects.get(pk=serializer.data.get("project_uuid"))
 
-        user_authorization = project.organization.get_user_authorization(
-            self.request.user
+        user_authorization = AuthorizationResolver.for_request(request).organization(
+            project.organization
         )
         if not user_authorization.can_contribute:
             raise PermissionDenied(
                 _("You can't contribute in this organization")
             )  # pragma: no cover
 
-        task = celery_app.send_task(  # pragma: no cover
-            name="search_project",
-            args=[
-                project.organization.inteligence_organization,
-                str(project.flow_organization),
-                serializer.data.get("text"),
-            ],
+        result = tasks.search_project(  # pragma: no cover
+            project.organization.inteligence_organization,
+            str(project.flow_organization),
+            serializer.data.get("text"),
         )
-        task.wait()  # pragma: no cover
 
-        return Response(task.result)
+        return Response(result)
 
     @action(
         detail=True,
@@ -250,10 +248,8 @@ class ProjectViewSet(
         if not channel_type:
             raise ValidationError("Need pass the channel_type")
 
-        task = tasks.list_channels.delay(channel_type)
-        task.wait()
         response = dict(
-            channels=task.result
+            channels=tasks.list_channels(channel_type)
         )
         return JsonResponse(status=status.HTTP_200_OK, data=response)
 
@@ -267,12 +263,11 @@ class ProjectViewSet(
     def release_channel(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        task = tasks.realease_channel.delay(
+        released = tasks.realease_channel(
             channel_uuid=serializer.validated_data.get("channel_uuid"),
             user=serializer.validated_data.get("user"),
         )
-        task.wait()
-        return JsonResponse(status=status.HTTP_200_OK, data={"release": task.result})
+        return JsonResponse(status=status.HTTP_200_OK, data={"release": released})
 
     @action(
         detail=True,
@@ -286,14 +281,13 @@ class ProjectViewSet(
         if serializer.is_valid(raise_exception=True):
             project_uuid = serializer.validated_data.get("project_uuid")
             project = Project.objects.get(uuid=project_uuid)
-            task = tasks.create_channel.delay(
+            channel = tasks.create_channel(
                 user=serializer.validated_data.get("user"),
                 project_uuid=str(project.flow_organization),
                 data=json.dumps(serializer.validated_data.get("data")),
                 channeltype_code=serializer.validated_data.get("channeltype_code"),
             )
-            task.wait()
-            return JsonResponse(status=status.HTTP_200_OK, data=task.result)
+            return JsonResponse(status=status.HTTP_200_OK, data=channel)
 
     @action(
         detail=True,
@@ -307,15 +301,13 @@ class ProjectViewSet(
         if serializer.is_valid(raise_exception=True):
             project_uuid = serializer.validated_data.get("project_uuid")
             project = Project.objects.get(uuid=project_uuid)
-            task = tasks.create_wac_channel.delay(
+            channel = tasks.create_wac_channel(
                 user=serializer.validated_data.get("user"),
                 flow_organization=str(project.flow_organization),
                 config=serializer.validated_data.get("config"),
                 phone_number_id=serializer.validated_data.get("phone_number_id"),
             )
-
-            task.wait()
-            return JsonResponse(status=status.HTTP_200_OK, data=task.result)
+            return JsonResponse(status=status.HTTP_200_OK, data=channel)
 
     @action(
         detail=True,
@@ -330,8 +322,7 @@ class ProjectViewSet(
             classifier_uuid = serializer.validated_data.get("uuid")
             user_email = serializer.validated_data.get("user_email")
 
-            task = tasks.destroy_classifier.delay(str(classifier_uuid), user_email)
-            task.wait()
+            tasks.destroy_classifier(str(classifier_uuid), user_email)
             return JsonResponse(status=status.HTTP_200_OK)
 
     @action(
@@ -347,9 +338,8 @@ class ProjectViewSet(
         if serializer.is_valid(raise_exception=True):
             classifier_uuid = serializer.validated_data.get("uuid")
 
-            task = tasks.retrieve_classifier.delay(str(classifier_uuid))
-            task.wait()
-            return JsonResponse(status=status.HTTP_200_OK, data=task.result)
+            classifier = tasks.retrieve_classifier(str(classifier_uuid))
+            return JsonResponse(status=status.HTTP_200_OK, data=classifier)
 
     @action(
         detail=True,
@@ -364,14 +354,13 @@ class ProjectViewSet(
         if serializer.is_valid(raise_exception=True):
             project_uuid = serializer.validated_data.get("project_uuid")
             project = Project.objects.get(uuid=project_uuid)
-            task = tasks.create_classifier.delay(
+            classifier = tasks.create_classifier(
                 project_uuid=str(project.flow_organization),
                 user_email=serializer.validated_data.get("user"),
                 classifier_name=serializer.validated_data.get("name"),
                 access_token=serializer.validated_data.get("access_token"),
             )
-            task.wait()
-            return JsonResponse(status=status.HTTP_200_OK, data=task.result)
+            return JsonResponse(status=status.HTTP_200_OK, data=classifier)
 
     @action(
         detail=True,
@@ -385,9 +374,8 @@ class ProjectViewSet(
         if serializer.is_valid(raise_exception=True):
             project_uuid = serializer.validated_data.get("project_uuid")
             project = Project.objects.get(uuid=project_uuid)
-            task = tasks.list_classifier.delay(str(project.flow_organization))
-            task.wait()
-            return JsonResponse(status=status.HTTP_200_OK, data=task.result)
+            classifiers = tasks.list_classifier(str(project.flow_organization))
+            return JsonResponse(status=status.HTTP_200_OK, data=classifiers)
 
     @action(
         detail=True,
@@ -566,7 +554,7 @@ class TemplateProjectViewSet(
             ProjectAuthorization.objects.exclude(role=0)
             .filter(user=self.request.user)
         )
-        return self.queryset.filter(authorization__in=auth)
+        return self.queryset.filter(authorization__in=auth).select_related("authorization__user")
 
     def get_object(self):
         lookup_url_kwarg = self.lookup_field
@@ -8,6 +8,7 @@ from connect.api.v1.dashboard.views import StatusServiceViewSet, NewsletterViewS
 from connect.api.v1.tests.utils import create_user_and_token
 from connect.common.models import (
     Service,
+    ServiceHealth,
     Organization,
     Newsletter,
     NewsletterLanguage,
@@ -60,6 +61,17 @@ class ListStatusServiceTestCase(TestCase):
         self.assertEqual(len(content_data["results"]), 1)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_status_reads_health_summary(self):
+        self.service.log_service.create(status=True)
+        health = ServiceHealth.objects.refresh(self.service)
+
+        response, content_data = self.request(self.token)
+        result = content_data["results"][0]
+        self.assertEqual(result["service__status"]["status"], ServiceHealth.STATUS_ONLINE)
+        self.assertIsNone(result["service__status"]["intercurrence"])
+        self.assertIsNotNone(result["service__last_updated"])
+        self.assertEqual(ServiceHealth.objects.get(service=self.service).pk, health.pk)
+
 
 class ListNewsletterTestCase(TestCase):
     def setUp(self):
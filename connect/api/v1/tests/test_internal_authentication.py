@@ -0,0 +1,83 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from connect.api.v1.internal.internal_authentication import (
+    InternalAuthentication,
+    TokenProvider,
+    TokenUnavailable,
+    token_provider,
+)
+
+
+def token_response(token, expires_in=300):
+    return MagicMock(json=MagicMock(return_value={"access_token": token, "expires_in": expires_in}))
+
+
+class TokenProviderTestCase(TestCase):
+    def setUp(self):
+        self.provider = TokenProvider(refresh_margin=30)
+
+    def get_token(self):
+        return self.provider.get_token("http://keycloak/token", "connect", "secret")
+
+    @patch("requests.Session.post")
+    def test_token_is_cached_until_the_refresh_margin(self, post):
+        post.return_value = token_response("first")
+        self.assertEqual(self.get_token(), "first")
+        self.assertEqual(self.get_token(), "first")
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(self.provider.stats(), {"hits": 1, "misses": 1, "cached": 1})
+
+        post.return_value = token_response("second")
+        now = time.monotonic()
+        with patch("connect.api.v1.internal.internal_authentication.time.monotonic") as monotonic:
+            monotonic.return_value = now + 280
+            self.assertEqual(self.get_token(), "second")
+        self.assertEqual(post.call_count, 2)
+
+    @patch("requests.Session.post")
+    def test_missing_token_is_not_cached(self, post):
+        post.return_value = MagicMock(json=MagicMock(return_value={"error": "invalid_client"}))
+        self.assertIsNone(self.get_token())
+        self.assertIsNone(self.get_token())
+        self.assertEqual(post.call_count, 2)
+
+    @patch("requests.Session.post")
+    def test_concurrent_callers_share_a_single_refresh(self, post):
+        def slow_response(**kwargs):
+            time.sleep(0.2)
+            return token_response("shared")
+
+        post.side_effect = slow_response
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(self.get_token())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(tokens, ["shared"] * 8)
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(self.provider.misses, 1)
+        self.assertEqual(self.provider.hits, 7)
+
+
+class InternalAuthenticationTestCase(TestCase):
+    def tearDown(self):
+        token_provider.clear()
+
+    @patch("requests.Session.post")
+    def test_headers_reuse_the_cached_token(self, post):
+        post.return_value = token_response("token")
+        for _ in range(3):
+            self.assertEqual(InternalAuthentication().headers["Authorization"], "Bearer token")
+        self.assertEqual(post.call_count, 1)
+
+    @patch("requests.Session.post")
+    def test_missing_token_is_not_sent(self, post):
+        post.return_value = MagicMock(json=MagicMock(return_value={"error": "invalid_client"}))
+        with self.assertRaises(TokenUnavailable):
+            InternalAuthentication().headers
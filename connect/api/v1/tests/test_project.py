@@ -6,6 +6,8 @@ from django.test import RequestFactory
 from django.test import TestCase
 from django.test.client import MULTIPART_CONTENT
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from connect.api.v1.project.views import ProjectViewSet, TemplateProjectViewSet
@@ -50,9 +52,9 @@ class CreateProjectAPITestCase(TestCase):
         content_data = json.loads(response.content)
         return (response, content_data)
 
-    @patch("connect.common.tasks.create_project.delay")
+    @patch("connect.common.tasks.create_project")
     def test_okay(self, task_create_project):
-        task_create_project.return_value.result = {"uuid": uuid4.uuid4()}
+        task_create_project.return_value = {"uuid": uuid4.uuid4()}
         response, content_data = self.request(
             {
                 "name": "Project 1",
@@ -168,6 +170,41 @@ class ListProjectAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(content_data.get("count"), 0)
 
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response, content_data = self.request(
+                "organization",
+                self.organization.uuid,
+                self.owner_token,
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries), content_data
+
+    def test_list_runs_a_constant_number_of_queries(self):
+        for project in (self.project, self.project2):
+            RequestPermissionProject.objects.create(
+                project=project, email="invite@user.com", role=2, created_by=self.owner
+            )
+        self.count_list_queries()
+        few_projects_queries, content_data = self.count_list_queries()
+        self.assertEqual(content_data.get("count"), 2)
+
+        for index in range(8):
+            project = self.organization.project.create(
+                name=f"project test {index + 3}",
+                timezone="America/Sao_Paulo",
+                flow_organization=uuid4.uuid4(),
+            )
+            RequestPermissionProject.objects.create(
+                project=project, email=f"invite{index}@user.com", role=2, created_by=self.owner
+            )
+        self.count_list_queries()
+        many_projects_queries, content_data = self.count_list_queries()
+
+        self.assertEqual(content_data.get("count"), 10)
+        self.assertEqual(len(content_data["results"][0]["pending_authorizations"]["users"]), 1)
+        self.assertEqual(many_projects_queries, few_projects_queries)
+
 
 class UpdateProjectTestCase(TestCase):
     def setUp(self):
@@ -0,0 +1,292 @@
+import time
+import uuid as uuid4
+from collections import namedtuple
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.db import connection
+from django.test import RequestFactory
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework import status
+
+from connect.api.v1.routers import router
+from connect.api.v1.tests.utils import create_user_and_token
+from connect.authentication.models import User
+from connect.common.models import (
+    BillingPlan,
+    GenericBillingData,
+    InvoiceProject,
+    Newsletter,
+    NewsletterLanguage,
+    OpenedProject,
+    Organization,
+    OrganizationAuthorization,
+    OrganizationRole,
+    Project,
+    ProjectAuthorization,
+    ProjectRole,
+    RequestPermissionOrganization,
+    RequestPermissionProject,
+    RequestRocketPermission,
+    RocketRole,
+    Service,
+    ServiceHealth,
+    ServiceStatus,
+    TemplateProject,
+)
+
+
+Budget = namedtuple("Budget", ["queries", "seconds"])
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    Runs every list and retrieve endpoint of the v1 router against an
+    organization with 200 projects and 500 project authorizations, and fails
+    when one of them exceeds its SQL query or latency budget.
+
+    Lists are paginated by 20, so a per-row query on any page already costs
+    more than the budgets below; raise a budget only together with the
+    reason the endpoint needs the extra queries.
+    """
+
+    PROJECTS = 200
+    MEMBERS = 15
+    MEMBER_PROJECTS = 20
+    INVOICES = 2
+
+    BUDGETS = {
+        ("dashboard/newsletter", "list"): Budget(queries=5, seconds=1),
+        ("dashboard/newsletter", "retrieve"): Budget(queries=5, seconds=1),
+        ("dashboard/status-service", "list"): Budget(queries=10, seconds=1),
+        ("account/my-profile", "retrieve"): Budget(queries=5, seconds=1),
+        ("account/search-user", "list"): Budget(queries=5, seconds=1),
+        ("organization/org", "list"): Budget(queries=20, seconds=1),
+        ("organization/org", "retrieve"): Budget(queries=20, seconds=1),
+        ("organization/project", "list"): Budget(queries=20, seconds=2),
+        ("organization/project", "retrieve"): Budget(queries=15, seconds=1),
+        ("organization/authorizations", "list"): Budget(queries=8, seconds=1),
+        ("organization/request-permission", "list"): Budget(queries=10, seconds=1),
+        ("organization/invoice", "list"): Budget(queries=30, seconds=3),
+        ("organization/invoice", "retrieve"): Budget(queries=30, seconds=2),
+        ("project/request-permission", "list"): Budget(queries=5, seconds=1),
+        ("organization/rocket-permission", "list"): Budget(queries=5, seconds=1),
+        ("organization/template-project", "list"): Budget(queries=5, seconds=1),
+        ("organization/template-project", "retrieve"): Budget(queries=5, seconds=1),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner, cls.owner_token = create_user_and_token("owner")
+        cls.members = [
+            User.objects.create_user(f"member{i}@user.com", f"member{i}")
+            for i in range(cls.MEMBERS)
+        ]
+
+        cls.organization = Organization.objects.create(
+            name="budget organization",
+            description="",
+            inteligence_organization=1,
+            organization_billing__cycle=BillingPlan.BILLING_CYCLE_MONTHLY,
+            organization_billing__plan=BillingPlan.PLAN_ENTERPRISE,
+        )
+        billing = cls.organization.organization_billing
+        billing.stripe_customer = "cus_budget"
+        billing.save(update_fields=["stripe_customer"])
+        owner_authorization = cls.organization.authorizations.create(
+            user=cls.owner, role=OrganizationRole.ADMIN.value
+        )
+        # bulk inserts skip the signals replicating every row to the other modules
+        member_authorizations = OrganizationAuthorization.objects.bulk_create(
+            OrganizationAuthorization(
+                user=member, organization=cls.organization, role=OrganizationRole.CONTRIBUTOR.value
+            )
+            for member in cls.members
+        )
+
+        cls.projects = Project.objects.bulk_create(
+            Project(
+                name=f"project {i}",
+                organization=cls.organization,
+                timezone="America/Sao_Paulo",
+                flow_organization=uuid4.uuid4(),
+                created_by=cls.owner,
+            )
+            for i in range(cls.PROJECTS)
+        )
+        owner_project_authorizations = ProjectAuthorization.objects.bulk_create(
+            ProjectAuthorization(
+                user=cls.owner,
+                project=project,
+                organization_authorization=owner_authorization,
+                role=ProjectRole.MODERATOR.value,
+            )
+            for project in cls.projects
+        )
+        ProjectAuthorization.objects.bulk_create(
+            ProjectAuthorization(
+                user=authorization.user,
+                project=project,
+                organization_authorization=authorization,
+                role=ProjectRole.CONTRIBUTOR.value,
+            )
+            for authorization in member_authorizations
+            for project in cls.projects[: cls.MEMBER_PROJECTS]
+        )
+        OpenedProject.objects.bulk_create(
+            OpenedProject(user=cls.owner, project=project, day=timezone.now() - timedelta(minutes=i))
+            for i, project in enumerate(cls.projects)
+        )
+        TemplateProject.objects.bulk_create(
+            TemplateProject(project=authorization.project, authorization=authorization, wa_demo_token="token")
+            for authorization in owner_project_authorizations[:5]
+        )
+
+        services = [
+            Service.objects.create(url=f"http://{service_type}.test", service_type=service_type)
+            for service_type, _ in Service.SERVICE_TYPE_CHOICES
+        ]
+        ServiceHealth.objects.bulk_create(
+            ServiceHealth(service=service, status=ServiceHealth.STATUS_ONLINE) for service in services
+        )
+        ServiceStatus.objects.bulk_create(
+            ServiceStatus(service=service, project=project)
+            for project in cls.projects
+            for service in services
+        )
+
+        RequestPermissionOrganization.objects.bulk_create(
+            RequestPermissionOrganization(
+                email=email,
+                organization=cls.organization,
+                role=OrganizationRole.CONTRIBUTOR.value,
+                created_by=cls.owner,
+            )
+            for email in [member.email for member in cls.members[:5]] + [f"guest{i}@user.com" for i in range(5)]
+        )
+        RequestPermissionProject.objects.bulk_create(
+            RequestPermissionProject(
+                email=f"guest{i}@user.com", project=project, role=ProjectRole.CONTRIBUTOR.value, created_by=cls.owner
+            )
+            for i, project in enumerate(cls.projects[:10])
+        )
+        RequestRocketPermission.objects.bulk_create(
+            RequestRocketPermission(
+                email=f"guest{i}@user.com", project=project, role=RocketRole.USER.value, created_by=cls.owner
+            )
+            for i, project in enumerate(cls.projects[:10])
+        )
+
+        GenericBillingData.get_generic_billing_data_instance()
+        cls.invoices = [
+            cls.organization.organization_billing_invoice.create(
+                due_date=timezone.now() + timedelta(days=10),
+                invoice_random_id=i + 1,
+                paid_date=timezone.now().date(),
+                stripe_charge=f"ch_budget{i}",
+                cost_per_whatsapp=settings.BILLING_COST_PER_WHATSAPP,
+            )
+            for i in range(cls.INVOICES)
+        ]
+        InvoiceProject.objects.bulk_create(
+            InvoiceProject(invoice=invoice, project=project, contact_count=10)
+            for invoice in cls.invoices
+            for project in cls.projects
+        )
+
+        cls.newsletter = NewsletterLanguage.objects.create(
+            newsletter=Newsletter.objects.create(), language=cls.owner.language, title="news", description="news"
+        )
+
+    def setUp(self):
+        # invoices read their card from Stripe, which must not be called from the suite
+        self.gateway = self.patch_gateway()
+        self.factory = RequestFactory()
+
+    def patch_gateway(self):
+        gateway = MagicMock()
+        for target in ("connect.common.models.StripeGateway", "connect.api.v1.invoice.serializers.StripeGateway"):
+            patcher = patch(target, return_value=gateway)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        def details(stripe_charge_id):
+            return {"response": {"final_card_number": "4242", "brand": "visa"}, "status": "SUCCESS"}
+
+        gateway.get_payment_method_details.side_effect = details
+        gateway.get_charges_payment_method_details.side_effect = lambda customer, stripe_charge_ids, since: {
+            stripe_charge_id: details(stripe_charge_id) for stripe_charge_id in stripe_charge_ids
+        }
+        return gateway
+
+    def endpoints(self):
+        organization = {"organization": self.organization.uuid}
+        project = self.projects[0]
+        return {
+            ("dashboard/newsletter", "list"): ("dashboard/newsletter/", {}),
+            ("dashboard/newsletter", "retrieve"): (f"dashboard/newsletter/{self.newsletter.pk}/", {}),
+            ("dashboard/status-service", "list"): ("dashboard/status-service/", {"project_uuid": project.uuid}),
+            ("account/my-profile", "retrieve"): ("account/my-profile/", {}),
+            ("account/search-user", "list"): ("account/search-user/", {"search": "member"}),
+            ("organization/org", "list"): ("organization/org/", {}),
+            ("organization/org", "retrieve"): (f"organization/org/{self.organization.uuid}/", {}),
+            ("organization/project", "list"): ("organization/project/", organization),
+            ("organization/project", "retrieve"): (f"organization/project/{project.uuid}/", {}),
+            ("organization/authorizations", "list"): ("organization/authorizations/", organization),
+            ("organization/request-permission", "list"): ("organization/request-permission/", organization),
+            ("organization/invoice", "list"): ("organization/invoice/", organization),
+            ("organization/invoice", "retrieve"): (f"organization/invoice/{self.invoices[0].pk}/", organization),
+            ("project/request-permission", "list"): ("project/request-permission/", {}),
+            ("organization/rocket-permission", "list"): ("organization/rocket-permission/", {}),
+            ("organization/template-project", "list"): ("organization/template-project/", {}),
+            ("organization/template-project", "retrieve"): (f"organization/template-project/{project.uuid}/", {}),
+        }
+
+    def measure(self, path, params):
+        path = f"/v1/{path}"
+        request = self.factory.get(
+            path, params, HTTP_AUTHORIZATION="Token {}".format(self.owner_token.key)
+        )
+        match = resolve(path)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = match.func(request, *match.args, **match.kwargs)
+            response.render()
+            elapsed = time.perf_counter() - started
+        return response, queries, elapsed
+
+    def test_every_endpoint_has_a_budget(self):
+        for prefix, viewset, basename in router.registry:
+            for action in ("list", "retrieve"):
+                if hasattr(viewset, action):
+                    self.assertIn((prefix, action), self.BUDGETS)
+                    self.assertIn((prefix, action), self.endpoints())
+
+    def test_endpoints_within_budget(self):
+        for endpoint, (path, params) in self.endpoints().items():
+            budget = self.BUDGETS[endpoint]
+            with self.subTest(endpoint=endpoint):
+                response, queries, elapsed = self.measure(path, params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+                self.assertLessEqual(
+                    len(queries),
+                    budget.queries,
+                    "\n".join(query["sql"] for query in queries.captured_queries),
+                )
+                self.assertLessEqual(elapsed, budget.seconds)
+
+    def test_invoice_list_reads_the_charges_once(self):
+        response, queries, elapsed = self.measure("organization/invoice/", {"organization": self.organization.uuid})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertEqual(self.gateway.get_charges_payment_method_details.call_count, 1)
+        self.gateway.get_payment_method_details.assert_not_called()
+        self.assertEqual(
+            sorted(self.gateway.get_charges_payment_method_details.call_args[0][1]),
+            sorted(invoice.stripe_charge for invoice in self.invoices),
+        )
@@ -0,0 +1,100 @@
+import logging
+
+from django.db import transaction
+
+from connect.billing.models import Channel, Contact, ContactActivity, Message, current_month_range
+from connect.common.fanout import FanOutExecutor
+from connect.common.models import Project
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_messages(flow_instance, project: Project, contacts: list, before: str, after: str):
+    """
+    Last message of each contact between `after` and `before`, read with
+    concurrent MessageDetail calls (see FanOutExecutor).
+    """
+    return FanOutExecutor("get_messages").run(
+        contacts,
+        lambda contact: flow_instance.get_message(
+            str(project.flow_organization), str(contact.contact_flow_uuid), before, after
+        ),
+    )
+
+
+def resolve_channels(project: Project, messages: list) -> dict:
+    """
+    Channels of `messages` by channel_flow_id, read in one query; the
+    missing ones are created for `project` in one insert.
+    """
+    channel_types = {message.channel_id: message.channel_type for message in messages}
+    channels = Channel.objects.in_bulk(list(channel_types), field_name="channel_flow_id")
+    missing = [
+        Channel(project=project, channel_flow_id=channel_flow_id, channel_type=channel_type)
+        for channel_flow_id, channel_type in channel_types.items()
+        if channel_flow_id not in channels
+    ]
+    if missing:
+        Channel.objects.bulk_create(missing, ignore_conflicts=True)
+        channels.update(
+            Channel.objects.in_bulk([channel.channel_flow_id for channel in missing], field_name="channel_flow_id")
+        )
+    return channels
+
+
+def enrich_contacts(flow_instance, project: Project, contacts, before: str, after: str) -> list:
+    """
+    Stores the last message and channel of each contact in a constant number
+    of queries. Contacts without a message in the range nor earlier in the
+    month are deleted, and contacts whose call failed are left as they are.
+    Returns the errors to log on the sync task.
+    """
+    result = fetch_messages(flow_instance, project, list(contacts), before, after)
+    messages = {contact: message for contact, message in result.succeeded if message and message.uuid}
+    errors = [f"{contact.contact_flow_uuid}: {error}" for contact, error in result.failed]
+    errors += [f"{contact.contact_flow_uuid}: timed out" for contact in result.timed_out]
+
+    without_message = [contact.pk for contact, message in result.succeeded if contact not in messages]
+    if without_message:
+        start_of_month, start_of_next_month = current_month_range()
+        with_month_message = set(
+            Message.objects.filter(
+                contact__in=without_message,
+                created_on__gte=start_of_month,
+                created_on__lt=start_of_next_month,
+            ).values_list("contact_id", flat=True)
+        )
+        deleted = [pk for pk in without_message if pk not in with_month_message]
+        if deleted:
+            deleted_contacts = Contact.objects.filter(pk__in=deleted)
+            with transaction.atomic():
+                # they must stop counting in the rollup used by the invoices too
+                ContactActivity.objects.forget(deleted_contacts.only("project_id", "contact_flow_uuid", "created_at"))
+                deleted_contacts.delete()
+            errors.append(f"{len(deleted)} contacts don't have delivery/received message")
+
+    if messages:
+        Message.objects.bulk_create(
+            [
+                Message(
+                    contact=contact,
+                    text=message.text,
+                    created_on=message.created_on,
+                    direction=message.direction,
+                    message_flow_uuid=message.uuid,
+                )
+                for contact, message in messages.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+        channels = resolve_channels(project, list(messages.values()))
+        for contact, message in messages.items():
+            contact.channel = channels[message.channel_id]
+        Contact.objects.bulk_update(list(messages), ["channel"])
+
+    logger.info(
+        f"[billing] project {project.uuid} enriched {len(messages)} of {result.total} contacts, "
+        f"{len(errors)} errors"
+    )
+    return errors
@@ -119,6 +119,46 @@ class StripeGateway(Gateway):
             }
         return {"response": response, "status": "SUCCESS"}
 
+    def get_charges_payment_method_details(
+        self, customer: str, stripe_charge_ids: list, since: int, max_pages: int = 2
+    ) -> dict:
+        """
+        get_payment_method_details of several charges of `customer` by
+        charge id. The charges of the customer created from `since` (unix
+        timestamp) on are listed, at most `max_pages` pages of 100, and the
+        ones not found there are retrieved one by one, so a charge made on
+        another customer still reads the card that was charged.
+        """
+        pending = set(stripe_charge_ids)
+        details = {}
+        starting_after = None
+        try:
+            for _ in range(max_pages):
+                options = {"customer": customer, "created": {"gte": since}, "limit": 100}
+                if starting_after:
+                    options["starting_after"] = starting_after
+                page = stripe.Charge.list(**options)
+                for charge in page["data"]:
+                    if charge["id"] not in pending:
+                        continue
+                    card_data = charge["payment_method_details"]["card"]
+                    details[charge["id"]] = {
+                        "response": {
+                            "final_card_number": card_data["last4"],
+                            "brand": card_data["brand"],
+                        },
+                        "status": "SUCCESS",
+                    }
+                    pending.discard(charge["id"])
+                if not pending or not page["has_more"] or not page["data"]:
+                    break
+                starting_after = page["data"][-1]["id"]
+        except self.stripe.error.InvalidRequestError:
+            pass
+        for stripe_charge_id in pending:
+            details[stripe_charge_id] = self.get_payment_method_details(stripe_charge_id)
+        return details
+
     def verify_payment_method(self, customer):
         payment_method = self.stripe.Customer.list_payment_methods(
             customer,
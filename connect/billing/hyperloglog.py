@@ -0,0 +1,71 @@
+"""
+HyperLogLog cardinality sketch used for the approximate active contact counts.
+
+With the default precision of 12 bits a sketch has 4096 one-byte registers
+(4 KiB) and a relative standard error of 1.04 / sqrt(4096) ~= 1.6%, so about
+95% of the estimates fall within +/- 3.3% of the exact distinct count. Below
+~10k distinct values the linear counting correction makes the estimate
+close to exact. Sketches with the same precision are merged with a
+register-wise max, which gives the sketch of the union of their sets: the
+count of a date range or of a whole organization never counts a contact
+twice.
+
+Exact counts are still required for invoices, see
+`ContactActivity.objects.count_distinct`.
+"""
+import hashlib
+import math
+import uuid as uuid4
+
+DEFAULT_PRECISION = 12
+HASH_BITS = 64
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: bytes = None):
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is None:
+            self.registers = bytearray(self.size)
+        else:
+            if len(registers) != self.size:
+                raise ValueError(f"Expected {self.size} registers, got {len(registers)}")
+            self.registers = bytearray(registers)
+
+    @staticmethod
+    def hash(value) -> int:
+        if isinstance(value, uuid4.UUID):
+            value = value.bytes
+        elif not isinstance(value, bytes):
+            value = str(value).encode()
+        return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "big")
+
+    def add(self, value):
+        hashed = self.hash(value)
+        index = hashed >> (HASH_BITS - self.precision)
+        remaining_bits = HASH_BITS - self.precision
+        remaining = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
@@ -0,0 +1,86 @@
+import logging
+import uuid as uuid4
+
+import pendulum
+from django.conf import settings
+
+from connect.billing.models import Contact, ContactActivity, ContactSketch
+from connect.common.fanout import FanOutExecutor
+from connect.common.models import Project
+
+logger = logging.getLogger(__name__)
+
+
+def project_hits(hits: list, project: Project) -> list:
+    """
+    Unsaved contacts of a page of Elasticsearch hits, one per contact with
+    its latest last_seen_on. Hits without a uuid or last_seen_on are skipped.
+    """
+    contacts = {}
+    for hit in hits:
+        source = hit["_source"]
+        if not source.get("uuid") or not source.get("last_seen_on"):
+            continue
+        contact = Contact(
+            contact_flow_uuid=uuid4.UUID(str(source["uuid"])),
+            name=source.get("name"),
+            last_seen_on=pendulum.parse(source["last_seen_on"]),
+            project=project,
+        )
+        current = contacts.get(contact.contact_flow_uuid)
+        if current is None or contact.last_seen_on > current.last_seen_on:
+            contacts[contact.contact_flow_uuid] = contact
+    return list(contacts.values())
+
+
+def write_contacts(contacts: list):
+    """
+    Upserts the contacts and adds every sighting to the daily rollup and
+    sketches, including the ones that did not move their row forward.
+    """
+    created, updated = Contact.objects.upsert(contacts)
+    ContactActivity.objects.record(contacts)
+    ContactSketch.objects.record(contacts)
+    return created, updated
+
+
+def ingest_slice(elastic, project: Project, before, after, slice_id: int = None, slices: int = None) -> tuple:
+    ingested = created = updated = 0
+    for hits in elastic.scroll_contacts(
+        str(project.flow_id), str(before), str(after), slice_id=slice_id, slices=slices
+    ):
+        contacts = project_hits(hits, project)
+        page_created, page_updated = write_contacts(contacts)
+        ingested += len(contacts)
+        created += len(page_created)
+        updated += len(page_updated)
+    return ingested, created, updated
+
+
+def ingest_contacts(elastic, project: Project, before, after) -> int:
+    """
+    Streams the active contacts of `project` from Elasticsearch straight into
+    the database, page by page, and returns how many distinct contacts per
+    page were written. Large projects are split in slices scrolled in
+    parallel (see ElasticFlow.contact_slices); a failed slice fails the
+    whole project.
+    """
+    slices = elastic.contact_slices(str(project.flow_id), str(before), str(after))
+    if slices == 1:
+        counts = [ingest_slice(elastic, project, before, after)]
+    else:
+        result = FanOutExecutor(
+            "ingest_contacts", max_workers=slices, call_timeout=settings.SYNC_CONTACTS_TIMEOUT
+        ).run(range(slices), lambda slice_id: ingest_slice(elastic, project, before, after, slice_id, slices))
+        if result.failed:
+            raise result.failed[0][1]
+        if result.timed_out:
+            raise TimeoutError(f"slices {result.timed_out} of {slices} timed out")
+        counts = [value for _, value in result.succeeded]
+
+    ingested, created, updated = [sum(values) for values in zip(*counts)]
+    logger.info(
+        f"[billing] project {project.uuid} ingested {ingested} contacts in {slices} slices, "
+        f"{created} new, {updated} updated"
+    )
+    return ingested
@@ -0,0 +1,152 @@
+import statistics
+import time
+import uuid as uuid4
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from connect.billing.models import Contact
+from connect.common.models import Organization, Project
+
+BENCHMARK_NAME = "contact benchmark"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds Contact rows in a local PostgreSQL database and reports the latency of the "
+        "active contact queries without and with the Contact indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--contacts", type=int, default=2000000, help="Contact rows to seed")
+        parser.add_argument("--projects", type=int, default=20, help="Projects to spread the contacts over")
+        parser.add_argument("--distinct", type=float, default=0.3, help="Ratio of distinct contact_flow_uuid")
+        parser.add_argument("--days", type=int, default=90, help="Spread of last_seen_on/created_at in days")
+        parser.add_argument("--repeat", type=int, default=10, help="Executions per query")
+        parser.add_argument("--skip-seed", action="store_true", help="Reuse the rows of a previous run")
+        parser.add_argument("--skip-compare", action="store_true", help="Only measure the current indexes")
+        parser.add_argument("--cleanup", action="store_true", help="Delete the seeded rows and exit")
+        parser.add_argument(
+            "--i-know",
+            action="store_true",
+            help="Run outside DEBUG, knowing the real Contact table is seeded and its indexes rebuilt",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The contact benchmark needs a PostgreSQL database.")
+        # seeds the real Contact table and drops its indexes without CONCURRENTLY
+        if not settings.DEBUG and not options["i_know"]:
+            raise CommandError(
+                "The contact benchmark writes to the Contact table and rebuilds its indexes, "
+                "locking it; run it with DEBUG on a local database or pass --i-know."
+            )
+
+        if options["cleanup"]:
+            Organization.objects.filter(name=BENCHMARK_NAME).delete()
+            self.stdout.write("Benchmark rows deleted.")
+            return
+
+        if not options["skip_seed"]:
+            self.seed(options["contacts"], options["projects"], options["distinct"], options["days"])
+
+        projects = list(Project.objects.filter(organization__name=BENCHMARK_NAME))
+        if not projects:
+            raise CommandError("No benchmark rows found, run without --skip-seed first.")
+
+        if not options["skip_compare"]:
+            self.drop_indexes()
+            self.report("without indexes", projects, options["repeat"])
+            self.create_indexes()
+        self.report("with indexes", projects, options["repeat"])
+
+    def seed(self, contacts: int, projects: int, distinct: float, days: int):
+        organization = Organization(name=BENCHMARK_NAME, description=BENCHMARK_NAME, inteligence_organization=0)
+        Organization.objects.bulk_create([organization])
+        project_objects = Project.objects.bulk_create(
+            [
+                Project(
+                    name=f"{BENCHMARK_NAME} {index}",
+                    organization=organization,
+                    timezone="America/Sao_Paulo",
+                    flow_organization=uuid4.uuid4(),
+                )
+                for index in range(projects)
+            ]
+        )
+
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Contact._meta.db_table}
+                    (uuid, contact_flow_uuid, name, last_seen_on, created_at, project_id)
+                SELECT
+                    md5(random()::text || i::text)::uuid,
+                    md5('contact' || (i %% %s)::text)::uuid,
+                    'contact ' || i::text,
+                    now() - random() * (%s * interval '1 day'),
+                    now() - random() * (%s * interval '1 day'),
+                    (%s::uuid[])[1 + i %% %s]
+                FROM generate_series(1, %s) AS i
+                """,
+                [
+                    max(int(contacts * distinct), 1),
+                    days,
+                    days,
+                    [str(project.uuid) for project in project_objects],
+                    projects,
+                    contacts,
+                ],
+            )
+            cursor.execute(f"ANALYZE {Contact._meta.db_table}")
+        self.stdout.write(f"Seeded {contacts} contacts in {time.perf_counter() - started:.1f}s")
+
+    def drop_indexes(self):
+        with connection.schema_editor() as schema_editor:
+            for index in Contact._meta.indexes:
+                schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}")
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Contact._meta.db_table}")
+
+    def create_indexes(self):
+        with connection.schema_editor() as schema_editor:
+            for index in Contact._meta.indexes:
+                schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}")
+                schema_editor.add_index(Contact, index)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Contact._meta.db_table}")
+
+    def get_queries(self, projects):
+        now = timezone.now()
+        project = projects[0]
+        contact_flow_uuid = (
+            Contact.objects.filter(project=project).values_list("contact_flow_uuid", flat=True).first()
+        )
+        return {
+            "count_contacts (1 day)": Contact.objects.filter(
+                project=project, last_seen_on__range=(now - timedelta(days=1), now)
+            ).distinct("contact_flow_uuid"),
+            "count_contacts (30 days)": Contact.objects.filter(
+                project=project, last_seen_on__range=(now - timedelta(days=30), now)
+            ).distinct("contact_flow_uuid"),
+            "get_contact": Contact.objects.get_contact(contact_flow_uuid),
+        }
+
+    def report(self, title: str, projects, repeat: int):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Contact queries {title}"))
+        for name, queryset in self.get_queries(projects).items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                queryset.count()
+                timings.append((time.perf_counter() - started) * 1000)
+            plan = queryset.explain().splitlines()
+            scans = [line.strip() for line in plan if "Scan" in line]
+            self.stdout.write(
+                f"  {name}: median {statistics.median(timings):.2f}ms, "
+                f"max {max(timings):.2f}ms ({scans[-1] if scans else plan[0]})"
+            )
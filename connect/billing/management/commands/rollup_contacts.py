@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from connect.billing.models import Contact, ContactActivity, ContactSketch
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills the daily active contact rollup and sketches from the raw Contact rows. "
+        "Each batch is committed on its own, and running it again adds nothing twice."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Only contacts seen in the last N days")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--without-sketches", action="store_true", help="Only backfill the rollup")
+
+    def handle(self, *args, **options):
+        # ordered by the (project, last_seen_on) index, so a sketch is merged
+        # by as few batches as possible
+        contacts = (
+            Contact.objects.exclude(last_seen_on=None)
+            .exclude(project=None)
+            .order_by("project_id", "last_seen_on")
+            .only("project_id", "last_seen_on", "contact_flow_uuid")
+        )
+        if options["days"]:
+            contacts = contacts.filter(last_seen_on__gte=timezone.now() - timedelta(days=options["days"]))
+
+        batch = []
+        processed = 0
+        for contact in contacts.iterator(chunk_size=options["batch_size"]):
+            batch.append(contact)
+            if len(batch) >= options["batch_size"]:
+                self.record(batch, options)
+                processed += len(batch)
+                batch = []
+                self.stdout.write(f" > {processed} contacts rolled up")
+        self.record(batch, options)
+        processed += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"{processed} contacts rolled up"))
+
+    def record(self, contacts: list, options: dict):
+        ContactActivity.objects.record(contacts, batch_size=options["batch_size"])
+        if not options["without_sketches"]:
+            ContactSketch.objects.record(contacts)
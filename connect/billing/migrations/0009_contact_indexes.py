@@ -0,0 +1,28 @@
+# Generated by Django 3.2.15 on 2026-10-18 14:21
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes are built concurrently so the contact table stays writable
+    atomic = False
+
+    dependencies = [
+        ('billing', '0008_auto_20220808_2133'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='contact',
+            index=models.Index(fields=['project', 'last_seen_on'], include=('contact_flow_uuid',), name='billing_contact_project_seen'),
+        ),
+        AddIndexConcurrently(
+            model_name='contact',
+            index=models.Index(fields=['contact_flow_uuid', 'created_at'], name='billing_contact_flow_created'),
+        ),
+        AddIndexConcurrently(
+            model_name='contact',
+            index=models.Index(fields=['channel', 'last_seen_on'], name='billing_contact_channel_seen'),
+        ),
+    ]
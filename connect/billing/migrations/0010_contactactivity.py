@@ -0,0 +1,27 @@
+# Generated by Django 3.2.15 on 2026-10-18 15:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0066_projectsyncstate'),
+        ('billing', '0009_contact_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactActivity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('contact_flow_uuid', models.UUIDField(verbose_name='flow identification UUID')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contact_activities', to='common.project')),
+            ],
+            options={
+                'unique_together': {('project', 'day', 'contact_flow_uuid')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.15 on 2026-10-18 15:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0066_projectsyncstate'),
+        ('billing', '0010_contactactivity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactSketch',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('precision', models.PositiveSmallIntegerField(default=12, verbose_name='precision')),
+                ('registers', models.BinaryField(verbose_name='registers')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contact_sketches', to='common.project')),
+            ],
+            options={
+                'unique_together': {('project', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0069_logservice_latency'),
+        ('billing', '0011_contactsketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactSyncWatermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('synced_until', models.DateTimeField(verbose_name='synced until')),
+                ('last_seen_on', models.DateTimeField(null=True, verbose_name='last contact seen on')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('failed_task', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='failed_watermarks', to='billing.syncmanagertask')),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='contact_sync_watermark', to='common.project')),
+            ],
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    The contacts stored before ContactActivity existed are rolled up by
+    `manage.py rollup_contacts` after the deploy, in batches committed one
+    by one, instead of scanning billing_contact inside the migration.
+    """
+
+    dependencies = [
+        ('billing', '0012_contactsyncwatermark'),
+    ]
+
+    operations = []
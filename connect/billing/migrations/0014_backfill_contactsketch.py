@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    The sketches of the contacts stored before ContactSketch existed are
+    built by `manage.py rollup_contacts` after the deploy, merged into the
+    ones recorded since (see 0013_backfill_contactactivity).
+    """
+
+    dependencies = [
+        ('billing', '0013_backfill_contactactivity'),
+    ]
+
+    operations = []
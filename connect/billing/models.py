@@ -1,13 +1,24 @@
 import logging
 import uuid as uuid4
-from django.db import models
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import models, transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
+from connect.billing.hyperloglog import DEFAULT_PRECISION, HyperLogLog
 from connect.common.models import Project
 
 logger = logging.getLogger(__name__)
 
 
+def current_month_range(moment=None):
+    start_of_month = timezone.localtime(moment).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    start_of_next_month = (start_of_month + timedelta(days=32)).replace(day=1)
+    return start_of_month, start_of_next_month
+
+
 class FailMessageLog(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     message = models.TextField()
@@ -70,15 +81,74 @@ class ContactManager(models.Manager):
         else:
             return super(ContactManager, self).create(*args, **kwargs)
 
+    def current_month(self):
+        # a range on created_at instead of __month/__year lookups, so the
+        # (contact_flow_uuid, created_at) index can be used
+        start_of_month, start_of_next_month = current_month_range()
+        return self.filter(created_at__gte=start_of_month, created_at__lt=start_of_next_month)
+
     def get_contact(self, contact_flow_uuid):
-        return self.filter(
-            created_at__date__month=timezone.now().date().month,
-            created_at__date__year=timezone.now().date().year,
-            contact_flow_uuid=contact_flow_uuid,
-        )
+        return self.current_month().filter(contact_flow_uuid=contact_flow_uuid)
+
+    def upsert(self, contacts, batch_size: int = 1000):
+        """
+        Writes the given unsaved contacts keeping one row per contact and
+        month, like `create`: contacts without a row this month are inserted
+        and the existing rows only move forward to a later last_seen_on.
+        Returns the created and the updated rows.
+        """
+        latest = {}
+        for contact in contacts:
+            current = latest.get(contact.contact_flow_uuid)
+            if current is None or contact.last_seen_on > current.last_seen_on:
+                latest[contact.contact_flow_uuid] = contact
+        if not latest:
+            return [], []
+
+        # ordered so the newest row wins when older syncs left duplicates
+        existing = {
+            row.contact_flow_uuid: row
+            for row in self.current_month().filter(contact_flow_uuid__in=latest.keys()).order_by("created_at")
+        }
+        created, updated = [], []
+        now = timezone.now()
+        for contact_flow_uuid, contact in latest.items():
+            row = existing.get(contact_flow_uuid)
+            if row is None:
+                created.append(contact)
+            elif row.last_seen_on is None or contact.last_seen_on > row.last_seen_on:
+                row.name = contact.name
+                row.last_seen_on = contact.last_seen_on
+                row.modified_at = now
+                updated.append(row)
+
+        with transaction.atomic():
+            self.bulk_create(created, batch_size=batch_size)
+            self.bulk_update(updated, ["name", "last_seen_on", "modified_at"], batch_size=batch_size)
+        return created, updated
 
 
 class Contact(models.Model):
+    class Meta:
+        indexes = [
+            # active contact counting: project + last_seen_on range, DISTINCT contact_flow_uuid
+            models.Index(
+                fields=["project", "last_seen_on"],
+                include=["contact_flow_uuid"],
+                name="billing_contact_project_seen",
+            ),
+            # ContactManager.get_contact: contact_flow_uuid + created_at month range
+            models.Index(
+                fields=["contact_flow_uuid", "created_at"],
+                name="billing_contact_flow_created",
+            ),
+            # get_messages: channel + last_seen_on range
+            models.Index(
+                fields=["channel", "last_seen_on"],
+                name="billing_contact_channel_seen",
+            ),
+        ]
+
     uuid = models.UUIDField(
         _("UUID"), primary_key=True, default=uuid4.uuid4, editable=False
     )
@@ -97,6 +167,228 @@ class Contact(models.Model):
         self.save(update_fields=["channel"])
 
 
+class ContactActivityManager(models.Manager):
+    def record(self, contacts, batch_size: int = 1000):
+        """
+        Adds the (project, day, contact) pairs of the given contacts to the
+        rollup; pairs that are already there are ignored.
+        """
+        activities = {
+            (contact.project_id, contact.last_seen_on.astimezone(timezone.utc).date(), contact.contact_flow_uuid)
+            for contact in contacts
+            if contact.last_seen_on is not None and contact.project_id is not None
+        }
+        self.bulk_create(
+            [
+                ContactActivity(project_id=project_id, day=day, contact_flow_uuid=contact_flow_uuid)
+                for project_id, day, contact_flow_uuid in activities
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+
+    def forget(self, contacts):
+        """
+        Removes the days the given contacts were counted on during the month
+        of their row, for contacts deleted because they were not billable
+        (see connect.billing.enrichment).
+        """
+        lookup = Q()
+        for contact in contacts:
+            if contact.project_id is None:
+                continue
+            start_of_month, start_of_next_month = current_month_range(contact.created_at)
+            lookup |= Q(
+                project_id=contact.project_id,
+                contact_flow_uuid=contact.contact_flow_uuid,
+                day__gte=start_of_month.astimezone(timezone.utc).date(),
+                day__lt=start_of_next_month.astimezone(timezone.utc).date(),
+            )
+        if lookup:
+            self.filter(lookup).delete()
+
+    def count_distinct(self, project, after, before):
+        """
+        Counts the distinct contacts of a project seen between `after` and
+        `before` (inclusive, like a __range lookup). Days fully inside the
+        range are read from the rollup and only the partial days at the edges
+        go to the raw Contact rows; the two sets are merged with UNION.
+        """
+        after = after.astimezone(timezone.utc)
+        before = before.astimezone(timezone.utc)
+        first_day = after.date() if after.time() == time.min else after.date() + timedelta(days=1)
+        last_day = (before + timedelta(microseconds=1)).date() - timedelta(days=1)
+
+        contacts = Contact.objects.filter(project=project)
+        if first_day > last_day:
+            return contacts.filter(last_seen_on__range=(after, before)).distinct("contact_flow_uuid").count()
+
+        first_day_start = datetime.combine(first_day, time.min, tzinfo=timezone.utc)
+        last_day_end = datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        edges = contacts.filter(
+            Q(last_seen_on__gte=after, last_seen_on__lt=first_day_start)
+            | Q(last_seen_on__gte=last_day_end, last_seen_on__lte=before)
+        ).values("contact_flow_uuid")
+        full_days = self.filter(project=project, day__range=(first_day, last_day)).values("contact_flow_uuid")
+        return full_days.union(edges).count()
+
+
+class ContactActivity(models.Model):
+    """
+    Daily rollup of active contacts: one row per project, day (UTC) and
+    distinct contact seen on that day.
+    """
+
+    class Meta:
+        unique_together = ["project", "day", "contact_flow_uuid"]
+
+    project = models.ForeignKey(Project, models.CASCADE, related_name="contact_activities")
+    day = models.DateField(_("day"))
+    contact_flow_uuid = models.UUIDField(_("flow identification UUID"))
+
+    objects = ContactActivityManager()
+
+
+class ContactSketchManager(models.Manager):
+    def record(self, contacts):
+        """
+        Adds the given contacts to the HyperLogLog sketch of their project
+        and day. Sketch rows are locked while they are merged, so concurrent
+        create_contacts tasks never lose each other's registers.
+        """
+        groups = defaultdict(set)
+        for contact in contacts:
+            if contact.last_seen_on is not None and contact.project_id is not None:
+                day = contact.last_seen_on.astimezone(timezone.utc).date()
+                groups[(contact.project_id, day)].add(contact.contact_flow_uuid)
+        if not groups:
+            return
+
+        with transaction.atomic():
+            self.bulk_create(
+                [
+                    ContactSketch(project_id=project_id, day=day, registers=HyperLogLog().to_bytes())
+                    for project_id, day in groups.keys()
+                ],
+                ignore_conflicts=True,
+            )
+            lookup = Q()
+            for project_id, day in groups.keys():
+                lookup |= Q(project_id=project_id, day=day)
+            sketches = list(self.select_for_update().filter(lookup).order_by("project_id", "day"))
+            for sketch in sketches:
+                hll = sketch.sketch
+                hll.update(groups[(sketch.project_id, sketch.day)])
+                sketch.registers = hll.to_bytes()
+            self.bulk_update(sketches, ["registers"])
+
+    def merged(self, projects, after, before) -> HyperLogLog:
+        """
+        Union of the sketches of `projects` between the days of `after` and
+        `before` (dates or datetimes, inclusive).
+        """
+        after, before = [
+            value.astimezone(timezone.utc).date() if isinstance(value, datetime) else value
+            for value in (after, before)
+        ]
+        hll = HyperLogLog()
+        for precision, registers in self.filter(project__in=projects, day__range=(after, before)).values_list(
+            "precision", "registers"
+        ):
+            hll.merge(HyperLogLog(precision, bytes(registers)))
+        return hll
+
+    def estimate(self, projects, after, before) -> int:
+        return self.merged(projects, after, before).count()
+
+
+class ContactSketch(models.Model):
+    """
+    HyperLogLog sketch of the distinct contacts a project saw on a day (UTC),
+    used for the approximate organization total on the dashboard. See
+    connect.billing.hyperloglog for the error bounds.
+    """
+
+    class Meta:
+        unique_together = ["project", "day"]
+
+    project = models.ForeignKey(Project, models.CASCADE, related_name="contact_sketches")
+    day = models.DateField(_("day"))
+    precision = models.PositiveSmallIntegerField(_("precision"), default=DEFAULT_PRECISION)
+    registers = models.BinaryField(_("registers"))
+
+    objects = ContactSketchManager()
+
+    @property
+    def sketch(self):
+        return HyperLogLog(self.precision, bytes(self.registers))
+
+
+class ContactSyncWatermarkManager(models.Manager):
+    def windows(self, projects, default, until) -> list:
+        """
+        (project, start) pairs of the projects with contacts to sync before
+        `until`, starting at the end of their last successful window or at
+        `default` for projects never synced.
+        """
+        projects = list(projects)
+        starts = dict(self.filter(project__in=projects).values_list("project_id", "synced_until"))
+        windows = [(project, starts.get(project.pk, default)) for project in projects]
+        return [(project, start) for project, start in windows if start < until]
+
+    def advance(self, project, synced_until):
+        """
+        Records that the contacts of `project` seen up to `synced_until` are
+        ingested and clears its failure. Never moves the watermark back, so a
+        late retry cannot undo a newer run.
+        """
+        last_seen_on = Contact.objects.filter(project=project).aggregate(
+            last_seen_on=models.Max("last_seen_on")
+        )["last_seen_on"]
+        watermark, created = self.get_or_create(
+            project=project, defaults={"synced_until": synced_until, "last_seen_on": last_seen_on}
+        )
+        if not created and synced_until >= watermark.synced_until:
+            watermark.synced_until = synced_until
+            watermark.last_seen_on = last_seen_on
+            watermark.failed_task = None
+            watermark.save(update_fields=["synced_until", "last_seen_on", "failed_task", "updated_at"])
+        return watermark
+
+    def fail(self, project, task, synced_until):
+        """
+        Marks `project` to be resumed by the retry of `task`; projects never
+        synced start their watermark at `synced_until`, the start of the
+        window that failed.
+        """
+        watermark, created = self.get_or_create(
+            project=project, defaults={"synced_until": synced_until, "failed_task": task}
+        )
+        if not created:
+            watermark.failed_task = task
+            watermark.save(update_fields=["failed_task", "updated_at"])
+        return watermark
+
+
+class ContactSyncWatermark(models.Model):
+    """
+    Progress of sync_contacts for a project: the contacts seen up to
+    `synced_until` are ingested, the latest of them at `last_seen_on`. Each
+    run ingests from `synced_until` on, so windows neither overlap nor leave
+    gaps, and `failed_task` points at the run whose retry resumes it.
+    """
+
+    project = models.OneToOneField(Project, models.CASCADE, related_name="contact_sync_watermark")
+    synced_until = models.DateTimeField(_("synced until"))
+    last_seen_on = models.DateTimeField(_("last contact seen on"), null=True)
+    failed_task = models.ForeignKey(
+        SyncManagerTask, models.SET_NULL, related_name="failed_watermarks", null=True
+    )
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    objects = ContactSyncWatermarkManager()
+
+
 class Message(models.Model):
     uuid = models.UUIDField(
         _("UUID"), primary_key=True, default=uuid4.uuid4, editable=False
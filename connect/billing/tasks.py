@@ -2,13 +2,17 @@ import stripe
 import pendulum
 from connect.celery import app
 from connect.common.models import Organization, Project, BillingPlan
+from connect.billing.enrichment import enrich_contacts
+from connect.billing.ingestion import ingest_contacts, project_hits, write_contacts
 from connect.billing.models import (
     Contact,
-    Message,
+    ContactSyncWatermark,
     SyncManagerTask,
     ContactCount,
-    Channel,
+    FailMessageLog,
 )
+from connect.common.fanout import FanOutExecutor
+from connect.common.retention import RetentionPolicy
 from connect.elastic.flow import ElasticFlow
 from django.utils import timezone
 from connect import utils
@@ -31,43 +35,8 @@ def get_messages(temp_channel_uuid: str, before: str, after: str, project_uuid:
     flow_instance = utils.get_grpc_types().get("flow")
     project = Project.objects.get(uuid=project_uuid)
     contacts = Contact.objects.filter(channel__uuid=temp_channel_uuid, last_seen_on__range=(after, before))
-    for contact in contacts:
-        message = flow_instance.get_message(
-            str(project.flow_organization), str(contact.contact_flow_uuid), before, after
-        )
-
-        if not message:
-            last_message = Message.objects.filter(
-                contact=contact,
-                created_on__date__month=timezone.now().date().month,
-                created_on__date__year=timezone.now().date().year,
-            )
-
-        if not last_message.exists():
-            contact.delete()
-            manager.fail_message.create(
-                message="Contact don't have delivery/received message"
-            )
-
-            continue
-
-        try:
-            Message.objects.get(message_flow_uuid=message.uuid)
-        except Message.DoesNotExist:
-            Message.objects.create(
-                contact=contact,
-                text=message.text,
-                created_on=message.created_on,
-                direction=message.direction,
-                message_flow_uuid=message.uuid,
-            )
-
-        channel = Channel.create(
-            channel_type=message.channel_type,
-            channel_flow_id=message.channel_id,
-            project=project,
-        )
-        contact.update_channel(channel)
+    for error in enrich_contacts(flow_instance, project, contacts, before, after):
+        manager.fail_message.create(message=error)
 
     count_contacts.apply_async(args=[manager.before, manager.after, project_uuid])
 
@@ -76,29 +45,23 @@ def get_messages(temp_channel_uuid: str, before: str, after: str, project_uuid:
 
 @app.task(name="create_contacts", ignore_result=True)
 def create_contacts(active_contacts: list, project_uuid: Project):
-
+    # kept for the pages still queued by older sync_contacts runs
     project = Project.objects.get(uuid=project_uuid)
-    contacts_to_save = list()
-    for elastic_contact in active_contacts:
-        contacts_to_save.append(
-            Contact(
-                contact_flow_uuid=elastic_contact["_source"].get("uuid"),
-                name=elastic_contact["_source"].get("name"),
-                last_seen_on=pendulum.parse(elastic_contact["_source"].get("last_seen_on")),
-                project=project
-            )
-        )
-    Contact.objects.bulk_create(contacts_to_save)
+    write_contacts(project_hits(active_contacts, project))
 
 
 @app.task(name="sync_contacts", ignore_result=True)
 def sync_contacts(
     sync_before: str = None, sync_after: str = None, task_uuid: str = None
 ):
+    """
+    Ingests the contacts of every project from its watermark up to now. A
+    retry (with the window and uuid of the failed run) only resumes the
+    projects that failed in that run, up to the end of its window.
+    """
     if sync_before and sync_after:
-        sync_before = pendulum.parse(sync_before)
-        sync_after = pendulum.parse(sync_after)
         manager = SyncManagerTask.objects.get(uuid=task_uuid)
+        projects = Project.objects.filter(contact_sync_watermark__failed_task=manager)
     else:
         manager = SyncManagerTask.objects.create(
             task_type="sync_contacts",
@@ -106,37 +69,29 @@ def sync_contacts(
             before=pendulum.now(),
             after=pendulum.now().subtract(hours=1),
         )
+        projects = Project.objects.exclude(flow_id=None)
 
     try:
         elastic_instance = ElasticFlow()
         update_fields = ["finished_at", "status"]
-        projects = Project.objects.exclude(flow_id=None)
-        scroll = {}
-        for project in projects:
-            if scroll != {}:
-                elastic_instance.clear_scroll(scroll_id=scroll["scroll_id"])
-            scroll, active_contacts = list(
-                elastic_instance.get_paginated_contacts(
-                    str(project.flow_id), str(manager.before), str(manager.after)
-                )
-            )
-
-            scrolled = 0
-
-            while scrolled <= scroll["scroll_size"]:
-                scrolled += len(active_contacts)
-
-                create_contacts.apply_async(args=[active_contacts, str(project.uuid)])
-                active_contacts = elastic_instance.get_paginated_contacts(
-                    str(project.flow_id), str(manager.before), str(manager.after), scroll_id=scroll["scroll_id"]
-                )
-                if scrolled == scroll["scroll_size"]:
-                    break
-
-            count_contacts.apply_async(args=[manager.before, manager.after, project.uuid])
+        windows = ContactSyncWatermark.objects.windows(projects, manager.after, manager.before)
+        result = FanOutExecutor(
+            "sync_contacts",
+            max_workers=settings.SYNC_CONTACTS_WORKERS,
+            call_timeout=settings.SYNC_CONTACTS_TIMEOUT,
+        ).run(windows, lambda window: ingest_contacts(elastic_instance, window[0], manager.before, window[1]))
+        for (project, after), _ in result.succeeded:
+            ContactSyncWatermark.objects.advance(project, manager.before)
+            count_contacts.apply_async(args=[manager.before, after, project.uuid])
+
+        errors = [(project, after, str(error)) for (project, after), error in result.failed]
+        errors += [(project, after, "timed out") for project, after in result.timed_out]
+        for project, after, error in errors:
+            manager.fail_message.create(message=f"{project.uuid}: {error}")
+            ContactSyncWatermark.objects.fail(project, manager, after)
 
         manager.finished_at = timezone.now()
-        manager.status = True
+        manager.status = not errors
         manager.save(update_fields=update_fields)
         return manager.status
     except Exception as error:
@@ -163,6 +118,15 @@ def retry_billing_tasks():
     return True
 
 
+@app.task(name="purge_billing_logs")
+def purge_billing_logs():
+    before = timezone.now() - timezone.timedelta(days=settings.BILLING_LOG_RETENTION_DAYS)
+    return [
+        RetentionPolicy(SyncManagerTask.objects.all(), date_field="started_at").purge(before),
+        RetentionPolicy(FailMessageLog.objects.all()).purge(before),
+    ]
+
+
 @app.task(name="count_contacts", ignore_result=True)
 def count_contacts(before, after, project_uuid: str, task_uuid: str = None):
     if task_uuid:
@@ -176,7 +140,7 @@ def count_contacts(before, after, project_uuid: str, task_uuid: str = None):
         )
     try:
         project = Project.objects.get(uuid=project_uuid)
-        amount = project.contacts.filter(last_seen_on__range=(after, before)).distinct("contact_flow_uuid").count()
+        amount = utils.count_contacts(project=project, before=str(before), after=str(after))
         now = pendulum.now()
         try:
             contact_count = ContactCount.objects.get(
@@ -4,18 +4,31 @@ import stripe
 import pytz
 
 from datetime import timedelta, datetime
+from io import StringIO
 from django.utils import timezone
 
 from unittest import skipIf
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 import uuid as uuid4
 
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.conf import settings
 
 from connect.billing import get_gateway
-
-from connect.billing.models import Contact, Channel, Message, SyncManagerTask
+from connect.billing.gateways.stripe_gateway import StripeGateway
+
+from connect.billing.hyperloglog import HyperLogLog
+from connect.billing.ingestion import ingest_contacts
+from connect.billing.models import (
+    Contact,
+    ContactActivity,
+    ContactSketch,
+    ContactSyncWatermark,
+    Channel,
+    Message,
+    SyncManagerTask,
+)
 from connect.common.models import Organization, Project, BillingPlan
 
 from freezegun import freeze_time
@@ -65,6 +78,29 @@ class StripeGatewayTestCase(TestCase):
         self.assertEquals(resp['status'], 'FAIL')
 
 
+@override_settings(BILLING_SETTINGS={"stripe": {"API_KEY": "sk_test"}})
+class ChargesPaymentMethodDetailsTestCase(TestCase):
+    def charge(self, charge_id, last4="4242"):
+        return {"id": charge_id, "payment_method_details": {"card": {"last4": last4, "brand": "visa"}}}
+
+    @patch("connect.billing.gateways.stripe_gateway.stripe.Charge")
+    def test_missing_charges_are_retrieved(self, charge):
+        charge.list.side_effect = [
+            {"data": [self.charge("ch_1"), self.charge("ch_other")], "has_more": True},
+            {"data": [self.charge("ch_older")], "has_more": True},
+        ]
+        charge.retrieve.return_value = self.charge("ch_2", last4="1111")
+
+        details = StripeGateway().get_charges_payment_method_details("cus_1", ["ch_1", "ch_2"], since=1648771200)
+
+        self.assertEqual(details["ch_1"]["response"]["final_card_number"], "4242")
+        self.assertEqual(details["ch_2"]["response"]["final_card_number"], "1111")
+        self.assertEqual(charge.list.call_count, 2)
+        self.assertEqual(charge.list.call_args[1]["starting_after"], "ch_other")
+        self.assertEqual(charge.list.call_args[1]["created"], {"gte": 1648771200})
+        charge.retrieve.assert_called_once_with("ch_2")
+
+
 class SyncManagerTest(TestCase):
     def setUp(self):
         self.manager = SyncManagerTask.objects.create(
@@ -191,6 +227,379 @@ class ContactTestCase(TestCase):
         self.assertEquals(self.contact.name, "contact test 1")
         self.assertEquals(self.contact.last_seen_on, datetime(2022, 4, 8, 10, 20, 0, 0, pytz.UTC))
 
+    def test_get_contact_current_month(self):
+        self.assertEquals(Contact.objects.get_contact(self.contact.contact_flow_uuid).first(), self.contact)
+        self.assertEquals(Contact.objects.create(contact_flow_uuid=self.contact.contact_flow_uuid), self.contact)
+
+        Contact.objects.filter(uuid=self.contact.uuid).update(created_at=timezone.now() - timedelta(days=40))
+        self.assertFalse(Contact.objects.get_contact(self.contact.contact_flow_uuid).exists())
+
+
+class ContactActivityTestCase(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="org test",
+            description="desc",
+            inteligence_organization=1,
+            organization_billing__cycle=BillingPlan.BILLING_CYCLE_MONTHLY,
+            organization_billing__plan=BillingPlan.PLAN_ENTERPRISE,
+        )
+        self.project = Project.objects.create(
+            name="project test",
+            timezone="America/Sao_Paulo",
+            flow_organization=uuid4.uuid4(),
+            organization=self.organization,
+        )
+        contact_uuids = [uuid4.uuid4() for _ in range(4)]
+        seen = [
+            (contact_uuids[0], datetime(2022, 4, 1, 10, 0, 0, 0, pytz.UTC)),
+            (contact_uuids[0], datetime(2022, 4, 2, 10, 0, 0, 0, pytz.UTC)),
+            (contact_uuids[1], datetime(2022, 4, 2, 23, 0, 0, 0, pytz.UTC)),
+            (contact_uuids[2], datetime(2022, 4, 3, 1, 0, 0, 0, pytz.UTC)),
+            (contact_uuids[3], datetime(2022, 4, 5, 12, 0, 0, 0, pytz.UTC)),
+        ]
+        contacts = Contact.objects.bulk_create(
+            [
+                Contact(contact_flow_uuid=contact_flow_uuid, last_seen_on=last_seen_on, project=self.project)
+                for contact_flow_uuid, last_seen_on in seen
+            ]
+        )
+        ContactActivity.objects.record(contacts)
+        ContactActivity.objects.record(contacts)
+
+    def exact_count(self, after, before):
+        return (
+            Contact.objects.filter(project=self.project, last_seen_on__range=(after, before))
+            .distinct("contact_flow_uuid")
+            .count()
+        )
+
+    def test_record_is_idempotent(self):
+        self.assertEquals(ContactActivity.objects.filter(project=self.project).count(), 5)
+
+    def test_count_matches_raw_contacts(self):
+        ranges = [
+            (datetime(2022, 4, 1, tzinfo=pytz.UTC), datetime(2022, 4, 30, tzinfo=pytz.UTC)),
+            (datetime(2022, 4, 1, tzinfo=pytz.UTC), datetime(2022, 4, 2, 23, 59, 59, 999999, pytz.UTC)),
+            (datetime(2022, 4, 1, 12, tzinfo=pytz.UTC), datetime(2022, 4, 3, 0, 30, tzinfo=pytz.UTC)),
+            (datetime(2022, 4, 2, 12, tzinfo=pytz.UTC), datetime(2022, 4, 3, 12, tzinfo=pytz.UTC)),
+            (datetime(2022, 4, 4, tzinfo=pytz.UTC), datetime(2022, 4, 5, 11, tzinfo=pytz.UTC)),
+        ]
+        for after, before in ranges:
+            self.assertEquals(
+                ContactActivity.objects.count_distinct(self.project, after, before),
+                self.exact_count(after, before),
+            )
+
+
+class HyperLogLogTestCase(TestCase):
+    def test_error_bounds(self):
+        for exact in [0, 1, 50, 1000, 20000]:
+            sketch = HyperLogLog()
+            contact_uuids = [uuid4.uuid4() for _ in range(exact)]
+            sketch.update(contact_uuids)
+            sketch.update(contact_uuids[: exact // 2])
+            # 3 standard errors of a precision 12 sketch
+            self.assertLessEqual(abs(sketch.count() - exact), max(exact * 0.05, 1))
+
+    def test_merge_is_union(self):
+        contact_uuids = [uuid4.uuid4() for _ in range(3000)]
+        first, second = HyperLogLog(), HyperLogLog()
+        first.update(contact_uuids[:2000])
+        second.update(contact_uuids[1000:])
+        self.assertLessEqual(abs(first.merge(second).count() - 3000), 3000 * 0.05)
+
+    def test_serialization(self):
+        sketch = HyperLogLog()
+        sketch.update(range(100))
+        self.assertEquals(HyperLogLog(registers=sketch.to_bytes()).count(), sketch.count())
+        with self.assertRaises(ValueError):
+            sketch.merge(HyperLogLog(precision=10))
+
+
+class ContactSketchTestCase(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="org test",
+            description="desc",
+            inteligence_organization=1,
+            organization_billing__cycle=BillingPlan.BILLING_CYCLE_MONTHLY,
+            organization_billing__plan=BillingPlan.PLAN_ENTERPRISE,
+        )
+        self.projects = [
+            Project.objects.create(
+                name=f"project {index}",
+                timezone="America/Sao_Paulo",
+                flow_organization=uuid4.uuid4(),
+                organization=self.organization,
+            )
+            for index in range(2)
+        ]
+        shared_uuids = [uuid4.uuid4() for _ in range(200)]
+        contacts = []
+        for day in range(1, 4):
+            for project in self.projects:
+                for contact_flow_uuid in shared_uuids[: 100 * day // 2] + [uuid4.uuid4() for _ in range(50)]:
+                    contacts.append(
+                        Contact(
+                            contact_flow_uuid=contact_flow_uuid,
+                            last_seen_on=datetime(2022, 4, day, 12, 0, 0, 0, pytz.UTC),
+                            project=project,
+                        )
+                    )
+        Contact.objects.bulk_create(contacts)
+        for index in range(0, len(contacts), 100):
+            ContactSketch.objects.record(contacts[index:index + 100])
+
+    def exact_count(self, projects, after, before):
+        return (
+            Contact.objects.filter(project__in=projects, last_seen_on__range=(after, before))
+            .distinct("contact_flow_uuid")
+            .count()
+        )
+
+    def test_estimate_against_exact(self):
+        after = datetime(2022, 4, 1, tzinfo=pytz.UTC)
+        before = datetime(2022, 4, 3, 23, 59, 59, tzinfo=pytz.UTC)
+        self.assertEquals(ContactSketch.objects.count(), 6)
+        self.assertEquals(ContactSketch.objects.filter(project=self.projects[0]).count(), 3)
+        for projects in [self.projects[:1], self.projects]:
+            exact = self.exact_count(projects, after, before)
+            approximate = ContactSketch.objects.estimate(projects, after, before)
+            self.assertLessEqual(abs(approximate - exact), exact * 0.05)
+
+    def test_rollup_contacts_backfills_the_sketches(self):
+        after = datetime(2022, 4, 1, tzinfo=pytz.UTC)
+        before = datetime(2022, 4, 3, 23, 59, 59, tzinfo=pytz.UTC)
+        expected = ContactSketch.objects.estimate(self.projects, after, before)
+        ContactSketch.objects.filter(day__gt=datetime(2022, 4, 1).date()).delete()
+
+        call_command("rollup_contacts", "--batch-size", "250", stdout=StringIO())
+        registers = dict(ContactSketch.objects.values_list("pk", "registers"))
+        call_command("rollup_contacts", "--batch-size", "250", stdout=StringIO())
+
+        self.assertEquals(ContactSketch.objects.estimate(self.projects, after, before), expected)
+        self.assertEquals(dict(ContactSketch.objects.values_list("pk", "registers")), registers)
+        self.assertEquals(ContactActivity.objects.count(), Contact.objects.count())
+
+
+class ContactIngestionTestCase(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="org test",
+            description="desc",
+            inteligence_organization=1,
+            organization_billing__cycle=BillingPlan.BILLING_CYCLE_MONTHLY,
+            organization_billing__plan=BillingPlan.PLAN_ENTERPRISE,
+        )
+        self.project = Project.objects.create(
+            name="project test",
+            timezone="America/Sao_Paulo",
+            flow_organization=uuid4.uuid4(),
+            organization=self.organization,
+            flow_id=11,
+        )
+        self.first, self.second = str(uuid4.uuid4()), str(uuid4.uuid4())
+
+    def hit(self, contact_flow_uuid, last_seen_on, name="contact"):
+        return {"_source": {"uuid": contact_flow_uuid, "name": name, "last_seen_on": last_seen_on}}
+
+    def ingest(self, *pages):
+        elastic = MagicMock()
+        elastic.contact_slices.return_value = 1
+        elastic.scroll_contacts.return_value = iter(pages)
+        return ingest_contacts(elastic, self.project, "2022-04-08T23:59:59Z", "2022-04-08T00:00:00Z")
+
+    def test_deduplicates_pages(self):
+        ingested = self.ingest(
+            [
+                self.hit(self.first, "2022-04-08T10:00:00Z"),
+                self.hit(self.first, "2022-04-08T11:00:00Z", name="renamed"),
+                self.hit(self.second, "2022-04-08T10:30:00Z"),
+            ],
+            [self.hit(self.first, "2022-04-08T10:45:00Z"), {"_source": {"name": "no uuid"}}],
+        )
+
+        self.assertEquals(ingested, 3)
+        self.assertEquals(Contact.objects.filter(project=self.project).count(), 2)
+        contact = Contact.objects.get(contact_flow_uuid=self.first)
+        self.assertEquals(contact.name, "renamed")
+        self.assertEquals(contact.last_seen_on, datetime(2022, 4, 8, 11, 0, 0, 0, pytz.UTC))
+        self.assertEquals(ContactActivity.objects.filter(project=self.project).count(), 2)
+
+    def test_upserts_existing_contacts(self):
+        self.ingest([self.hit(self.first, "2022-04-08T10:00:00Z"), self.hit(self.second, "2022-04-08T10:00:00Z")])
+        self.ingest([self.hit(self.first, "2022-04-08T12:00:00Z"), self.hit(self.second, "2022-04-08T09:00:00Z")])
+
+        self.assertEquals(Contact.objects.filter(project=self.project).count(), 2)
+        first = Contact.objects.get(contact_flow_uuid=self.first)
+        second = Contact.objects.get(contact_flow_uuid=self.second)
+        self.assertEquals(first.last_seen_on, datetime(2022, 4, 8, 12, 0, 0, 0, pytz.UTC))
+        self.assertIsNotNone(first.modified_at)
+        self.assertEquals(second.last_seen_on, datetime(2022, 4, 8, 10, 0, 0, 0, pytz.UTC))
+        self.assertIsNone(second.modified_at)
+
+    @patch("connect.billing.ingestion.write_contacts")
+    def test_scrolls_slices_in_parallel(self, write_contacts):
+        write_contacts.side_effect = lambda contacts: (contacts, [])
+        elastic = MagicMock()
+        elastic.contact_slices.return_value = 3
+        elastic.scroll_contacts.side_effect = lambda *args, slice_id, slices: iter(
+            [[self.hit(str(uuid4.uuid4()), "2022-04-08T10:00:00Z") for _ in range(slice_id + 1)]]
+        )
+
+        ingested = ingest_contacts(elastic, self.project, "2022-04-08T23:59:59Z", "2022-04-08T00:00:00Z")
+
+        self.assertEquals(ingested, 6)
+        self.assertEquals(
+            sorted(call[1]["slice_id"] for call in elastic.scroll_contacts.call_args_list), [0, 1, 2]
+        )
+        self.assertTrue(all(call[1]["slices"] == 3 for call in elastic.scroll_contacts.call_args_list))
+
+    @patch("connect.billing.tasks.count_contacts.apply_async")
+    @patch("connect.billing.tasks.ingest_contacts")
+    def test_sync_resumes_failed_projects(self, ingest, count_contacts):
+        failing = Project.objects.create(
+            name="failing project",
+            timezone="America/Sao_Paulo",
+            flow_organization=uuid4.uuid4(),
+            organization=self.organization,
+            flow_id=12,
+        )
+
+        def ingest_project(elastic, project, before, after):
+            if project.pk == failing.pk:
+                raise ValueError("elastic unavailable")
+            return 10
+
+        ingest.side_effect = ingest_project
+
+        with freeze_time("2022-04-08 14:00"):
+            self.assertFalse(sync_contacts())
+        manager = SyncManagerTask.objects.get(task_type="sync_contacts")
+        self.assertEquals(
+            list(manager.fail_message.values_list("message", flat=True)),
+            [f"{failing.uuid}: elastic unavailable"],
+        )
+        count_contacts.assert_called_once()
+        self.assertEquals(count_contacts.call_args[1]["args"][2], self.project.uuid)
+        self.assertEquals(self.project.contact_sync_watermark.synced_until, manager.before)
+        watermark = ContactSyncWatermark.objects.get(project=failing)
+        self.assertEquals((watermark.synced_until, watermark.failed_task), (manager.after, manager))
+
+        # the retry only resumes the failed project, from its watermark
+        ingest.reset_mock(side_effect=True)
+        self.assertTrue(sync_contacts(str(manager.before), str(manager.after), manager.uuid))
+        ingest.assert_called_once()
+        self.assertEquals(ingest.call_args[0][1:], (failing, manager.before, manager.after))
+        watermark.refresh_from_db()
+        self.assertEquals((watermark.synced_until, watermark.failed_task), (manager.before, None))
+
+        # the next run starts where the previous one ended
+        ingest.reset_mock()
+        with freeze_time("2022-04-08 15:30"):
+            sync_contacts()
+        self.assertEquals({call[0][3] for call in ingest.call_args_list}, {manager.before})
+
+
+class GetMessagesTestCase(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="org test",
+            description="desc",
+            inteligence_organization=1,
+            organization_billing__cycle=BillingPlan.BILLING_CYCLE_MONTHLY,
+            organization_billing__plan=BillingPlan.PLAN_ENTERPRISE,
+        )
+        self.project = Project.objects.create(
+            name="project test",
+            timezone="America/Sao_Paulo",
+            flow_organization=uuid4.uuid4(),
+            organization=self.organization,
+        )
+        self.temp_channel = Channel.objects.create(channel_type="WA", channel_flow_id=1, project=self.project)
+        self.contacts = Contact.objects.bulk_create(
+            [
+                Contact(
+                    contact_flow_uuid=uuid4.uuid4(),
+                    last_seen_on=datetime(2022, 4, 8, 10, 0, 0, 0, pytz.UTC),
+                    channel=self.temp_channel,
+                    project=self.project,
+                )
+                for _ in range(5)
+            ]
+        )
+        ContactActivity.objects.record(self.contacts)
+        self.stored_uuid = uuid4.uuid4()
+        # a message stored by a previous run and one earlier in the month
+        Message.objects.create(
+            contact=self.contacts[1],
+            text="stored",
+            created_on=timezone.now(),
+            direction="I",
+            message_flow_uuid=self.stored_uuid,
+        )
+        Message.objects.create(
+            contact=self.contacts[3],
+            text="earlier",
+            created_on=timezone.now(),
+            direction="I",
+            message_flow_uuid=uuid4.uuid4(),
+        )
+
+    def message(self, message_flow_uuid, channel_id=7):
+        return MagicMock(
+            uuid=str(message_flow_uuid),
+            text="Oi",
+            created_on="2022-04-08 10:00:00+00:00",
+            direction="I",
+            channel_id=channel_id,
+            channel_type="WA",
+        )
+
+    @patch("connect.billing.tasks.count_contacts.apply_async")
+    @patch("connect.billing.tasks.utils.get_grpc_types")
+    def test_enriches_contacts_in_bulk(self, get_grpc_types, count_contacts):
+        from connect.billing.tasks import get_messages
+
+        new_uuid = uuid4.uuid4()
+        responses = {
+            self.contacts[0].contact_flow_uuid: self.message(new_uuid),
+            self.contacts[1].contact_flow_uuid: self.message(self.stored_uuid),
+            self.contacts[2].contact_flow_uuid: None,
+            self.contacts[3].contact_flow_uuid: None,
+        }
+
+        def get_message(org_uuid, contact_uuid, before, after):
+            if uuid4.UUID(contact_uuid) not in responses:
+                raise ValueError("flows unavailable")
+            return responses[uuid4.UUID(contact_uuid)]
+
+        get_grpc_types.return_value.get.return_value.get_message.side_effect = get_message
+
+        get_messages(
+            str(self.temp_channel.uuid), "2022-04-08T23:59:59Z", "2022-04-08T00:00:00Z", str(self.project.uuid)
+        )
+
+        channel = Channel.objects.get(channel_flow_id=7)
+        self.assertEquals(channel.project, self.project)
+        self.assertEquals(
+            set(Contact.objects.filter(channel=channel).values_list("pk", flat=True)),
+            {self.contacts[0].pk, self.contacts[1].pk},
+        )
+        self.assertEquals(Message.objects.get(message_flow_uuid=new_uuid).contact, self.contacts[0])
+        self.assertEquals(Message.objects.count(), 3)
+        self.assertFalse(Contact.objects.filter(pk=self.contacts[2].pk).exists())
+        self.assertFalse(
+            ContactActivity.objects.filter(contact_flow_uuid=self.contacts[2].contact_flow_uuid).exists()
+        )
+        self.assertEquals(ContactActivity.objects.filter(project=self.project).count(), 4)
+        self.assertEquals(Contact.objects.get(pk=self.contacts[3].pk).channel, self.temp_channel)
+        self.assertEquals(Contact.objects.get(pk=self.contacts[4].pk).channel, self.temp_channel)
+        manager = SyncManagerTask.objects.get(task_type="get_messages")
+        self.assertEquals(manager.fail_message.count(), 2)
+        count_contacts.assert_called_once()
+
 
 @skipIf(True, "message not saved yet.")
 class MessageTestCase(TestCase):
@@ -23,6 +23,7 @@ app.conf.task_routes = {
     'retry_billing_tasks': {'queue': 'billing'},
     'create_contacts': {'queue': 'billing'},
     'get_messages': {'queue': 'billing'},
+    'purge_billing_logs': {'queue': 'billing'},
 }
 
 
@@ -39,26 +40,14 @@ app.conf.beat_schedule = {
         "task": "connect.common.tasks.check_organization_free_plan",
         "schedule": schedules.crontab(minute="*/6"),
     },
-    "sync-project-information": {
-        "task": "connect.common.tasks.sync_project_information",
-        "schedule": schedules.crontab(minute="*/5")
-    },
-    "sync-project-statistics": {
-        "task": "sync_project_statistics",
-        "schedule": schedules.crontab(minute="*/6")
-    },
-    "sync-channels-statistics": {
-        "task": "sync_channels_statistics",
-        "schedule": schedules.crontab(minute="*/7")
+    "sync-projects": {
+        "task": "sync_projects",
+        "schedule": schedules.crontab(minute="*/1")
     },
     "generate_project_invoice": {
         "task": "connect.common.tasks.generate_project_invoice",
         "schedule": schedules.crontab(minute="*/5"),
     },
-    "sync-total-active-contacts": {
-        "task": "connect.common.tasks.sync_total_contact_count",
-        "schedule": schedules.crontab(hour="3", minute=0)
-    },
     "sync-active-contacts": {
         "task": "connect.common.tasks.sync_active_contacts",
         "schedule": schedules.crontab(hour="*/6", minute=0)
@@ -71,10 +60,6 @@ app.conf.beat_schedule = {
         "task": "sync_contacts",
         "schedule": schedules.crontab(hour=settings.SYNC_CONTACTS_SCHEDULE, minute=0)
     },
-    "sync-repositories-statistics": {
-        "task": "connect.common.tasks.sync_repositories_statistics",
-        "schedule": schedules.crontab(minute="*/8")
-    },
     "count_contacts": {
         "task": "count_contacts",
         "schedule": schedules.crontab(hour="*/6", minute=0)
@@ -86,7 +71,11 @@ app.conf.beat_schedule = {
     "problem_capture_invoice": {
         "task": "problem_capture_invoice",
         "schedule": schedules.crontab(hour="9,11,14,16,18", minute=0)
-    }
+    },
+    "purge_billing_logs": {
+        "task": "purge_billing_logs",
+        "schedule": schedules.crontab(hour="22", minute=30)
+    },
 }
 
 
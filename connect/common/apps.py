@@ -8,3 +8,4 @@ class CommonConfig(AppConfig):
         from .signals import create_service_status  # noqa: F401
         from .signals import create_service_default_in_all_user  # noqa: F401
         from .signals import org_authorizations  # noqa: F401
+        from .signals import prioritize_opened_project_sync  # noqa: F401
@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from connect.common.models import (
+    Organization,
+    OrganizationAuthorization,
+    ProjectAuthorization,
+)
+
+
+ORGANIZATION_FIELDS = ["uuid", "user_id", "organization_id", "role", "has_2fa"]
+PROJECT_FIELDS = [
+    "uuid",
+    "user_id",
+    "project_id",
+    "organization_authorization_id",
+    "rocket_authorization_id",
+    "chats_authorization_id",
+    "role",
+]
+
+
+def organization_cache_key(user_id) -> str:
+    return f"authorizations:organizations:{user_id}"
+
+
+def project_cache_key(user_id, organization_id) -> str:
+    return f"authorizations:projects:{user_id}:{organization_id}"
+
+
+def invalidate_organization_authorizations(user_id):
+    cache.delete(organization_cache_key(user_id))
+
+
+def invalidate_project_authorizations(user_id, organization_id):
+    cache.delete(project_cache_key(user_id, organization_id))
+
+
+class AuthorizationResolver:
+    """
+    Read-only view of the authorizations of a user, shared by the
+    permissions and filters of a request.
+
+    All the organization authorizations of the user are read in one query,
+    and the project authorizations in one query per organization. Missing
+    authorizations resolve to unsaved ones with no role instead of being
+    created, as `get_user_authorization` does, so permission checks never
+    write. With AUTHORIZATION_CACHE_TIMEOUT set, the rows read are also kept
+    in the cache across requests until a save or delete invalidates them.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.organizations = {}
+        self.organization_authorizations = None
+        self.project_authorizations = {}
+
+    @classmethod
+    def for_request(cls, request) -> "AuthorizationResolver":
+        # stored on the Django request, shared by every DRF request wrapping it
+        http_request = getattr(request, "_request", request)
+        resolver = getattr(http_request, "authorization_resolver", None)
+        if resolver is None or resolver.user != request.user:
+            resolver = cls(request.user)
+            http_request.authorization_resolver = resolver
+        return resolver
+
+    def clear(self):
+        """
+        Forgets the authorizations read so far, so the next checks see the
+        roles written during the request.
+        """
+        self.organization_authorizations = None
+        self.project_authorizations = {}
+
+    def load(self, key: str, queryset, fields: list) -> list:
+        timeout = settings.AUTHORIZATION_CACHE_TIMEOUT
+        rows = cache.get(key) if timeout else None
+        if rows is None:
+            rows = list(queryset.values_list(*fields))
+            if timeout:
+                cache.set(key, rows, timeout)
+        return rows
+
+    def get_organization(self, uuid) -> Organization:
+        """
+        Organization by uuid, read once per request. Raises the same errors
+        as Organization.objects.get.
+        """
+        key = str(uuid)
+        if key not in self.organizations:
+            self.organizations[key] = Organization.objects.get(uuid=uuid)
+        return self.organizations[key]
+
+    def organization(self, organization: Organization) -> OrganizationAuthorization:
+        if self.user.is_anonymous:
+            return OrganizationAuthorization(organization=organization)
+
+        if self.organization_authorizations is None:
+            rows = self.load(
+                organization_cache_key(self.user.pk),
+                OrganizationAuthorization.objects.filter(user=self.user),
+                ORGANIZATION_FIELDS,
+            )
+            self.organization_authorizations = {
+                row[2]: OrganizationAuthorization.from_db("default", ORGANIZATION_FIELDS, row)
+                for row in rows
+            }
+
+        authorization = self.organization_authorizations.get(organization.pk)
+        if authorization is None:
+            authorization = OrganizationAuthorization(user=self.user, organization=organization)
+        authorization.organization = organization
+        return authorization
+
+    def project(self, project) -> ProjectAuthorization:
+        if self.user.is_anonymous:
+            return ProjectAuthorization(project=project)
+
+        authorizations = self.project_authorizations.get(project.organization_id)
+        if authorizations is None:
+            rows = self.load(
+                project_cache_key(self.user.pk, project.organization_id),
+                ProjectAuthorization.objects.filter(
+                    user=self.user, project__organization_id=project.organization_id
+                ),
+                PROJECT_FIELDS,
+            )
+            authorizations = self.project_authorizations[project.organization_id] = {
+                row[2]: ProjectAuthorization.from_db("default", PROJECT_FIELDS, row)
+                for row in rows
+            }
+
+        authorization = authorizations.get(project.pk)
+        if authorization is None:
+            authorization = ProjectAuthorization(user=self.user, project=project)
+        authorization.project = project
+        return authorization
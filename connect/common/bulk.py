@@ -0,0 +1,68 @@
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BulkUpdateBuffer:
+    """
+    Collects new field values for model instances and writes them with
+    `bulk_update` in chunks of `batch_size`.
+
+    New and current values are both normalized with the model field
+    `to_python` and `get_prep_value` before being compared, so rows whose
+    values did not change are counted as unchanged and never reach the
+    database.
+    """
+
+    def __init__(self, model, fields: list, batch_size: int = None):
+        self.model = model
+        self.fields = list(fields)
+        self.batch_size = batch_size or settings.SYNC_BULK_UPDATE_BATCH_SIZE
+        self.changed = 0
+        self.unchanged = 0
+        self._buffer = []
+
+    @staticmethod
+    def prepare(field, value):
+        # in-memory instances may hold raw values (e.g. a str timezone), so
+        # both sides are compared in their database representation
+        return field.get_prep_value(field.to_python(value))
+
+    def add(self, instance, **values):
+        has_changed = False
+        for name, value in values.items():
+            if name not in self.fields:
+                raise ValueError(f"{name} is not one of the buffered fields {self.fields}")
+            field = self.model._meta.get_field(name)
+            value = field.to_python(value)
+            if self.prepare(field, getattr(instance, name)) != self.prepare(field, value):
+                setattr(instance, name, value)
+                has_changed = True
+
+        if not has_changed:
+            self.unchanged += 1
+            return False
+
+        self._buffer.append(instance)
+        self.changed += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        if self._buffer:
+            self.model.objects.bulk_update(self._buffer, self.fields, batch_size=self.batch_size)
+            self._buffer = []
+
+    def summary(self):
+        return {"changed": self.changed, "unchanged": self.unchanged}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        logger.info(f"[{self.model.__name__}] bulk update {self.summary()}")
@@ -0,0 +1,116 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class FanOutResult:
+    """
+    Outcome of a FanOutExecutor run: the successful (item, value) pairs,
+    the items that raised or timed out, and the run throughput.
+    """
+
+    def __init__(self, name: str, total: int):
+        self.name = name
+        self.total = total
+        self.succeeded = []
+        self.failed = []
+        self.timed_out = []
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self):
+        if not self.elapsed:
+            return 0.0
+        return self.total / self.elapsed
+
+    def summary(self):
+        return {
+            "name": self.name,
+            "total": self.total,
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "timed_out": len(self.timed_out),
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 3),
+        }
+
+
+class FanOutExecutor:
+    """
+    Runs one blocking remote call per item on a bounded thread pool.
+
+    Every call is limited to `call_timeout` seconds counted from the moment it
+    starts running; calls that exceed it are reported as timed out and their
+    late result is discarded. Exceptions never abort the run, they are
+    collected in `FanOutResult.failed` next to the item that raised them.
+    """
+
+    def __init__(self, name: str, max_workers: int = None, call_timeout: float = None):
+        self.name = name
+        self.max_workers = max_workers or settings.FANOUT_MAX_WORKERS
+        self.call_timeout = call_timeout or settings.FANOUT_CALL_TIMEOUT
+
+    def _call(self, func, item, started):
+        started[id(item)] = time.monotonic()
+        try:
+            return func(item)
+        finally:
+            connections.close_all()
+
+    def run(self, items, func) -> FanOutResult:
+        items = list(items)
+        result = FanOutResult(self.name, len(items))
+        started = {}
+        start = time.monotonic()
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=self.name
+        )
+        try:
+            pending = {
+                executor.submit(self._call, func, item, started): item
+                for item in items
+            }
+            while pending:
+                done, _ = wait(
+                    pending, timeout=self._next_deadline(pending, started), return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    item = pending.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        result.succeeded.append((item, future.result()))
+                    else:
+                        logger.error(f"[{self.name}] {item}: {error}")
+                        result.failed.append((item, error))
+
+                now = time.monotonic()
+                for future, item in list(pending.items()):
+                    call_started = started.get(id(item))
+                    if call_started is not None and now - call_started >= self.call_timeout:
+                        future.cancel()
+                        pending.pop(future)
+                        logger.error(f"[{self.name}] {item}: timed out after {self.call_timeout}s")
+                        result.timed_out.append(item)
+        finally:
+            executor.shutdown(wait=False)
+
+        result.elapsed = time.monotonic() - start
+        logger.info(f"[{self.name}] {result.summary()}")
+        return result
+
+    def _next_deadline(self, pending, started):
+        now = time.monotonic()
+        remaining = [
+            self.call_timeout - (now - started[id(item)])
+            for item in pending.values()
+            if id(item) in started
+        ]
+        if not remaining:
+            return self.call_timeout
+        return max(min(remaining), 0)
@@ -1,8 +1,9 @@
 import json
-import requests
 from django.conf import settings
 from django.utils.crypto import get_random_string
 
+from connect.common.http import get_session
+
 
 class Rocket:
     def __init__(self, rocket):
@@ -11,6 +12,7 @@ class Rocket:
         self.password = getattr(settings, "ROCKET_PASSWORD")
         self.keycloak_oidc_url = getattr(settings, "OIDC_OP_TOKEN_ENDPOINT")
         self.rocket_base_url = f'{rocket.url}/api/v1'
+        self.session = get_session("rocket")
         self.is_authenticated = self.authenticate()
         self.valid_roles = ['not-set', 'user', 'admin', 'livechat-agent', 'livechat-manager']
 
@@ -20,7 +22,7 @@ class Rocket:
             client_secret=settings.OIDC_RP_CLIENT_SECRET,
             grant_type="client_credentials",
         )
-        r = requests.post(self.keycloak_oidc_url, data)
+        r = self.session.post(self.keycloak_oidc_url, data)
         data = json.loads(r.text)
         if r.status_code == 200:
             return {
@@ -39,7 +41,7 @@ class Rocket:
         }
 
         headers = {"Content-Type": "application/json"}
-        r = requests.post(
+        r = self.session.post(
             self.rocket_base_url + "/login/", headers=headers, data=json.dumps(data)
         )
         response = json.loads(r.text)
@@ -76,7 +78,7 @@ class Rocket:
                 }
                 data = {"roleName": self.valid_roles[role], "username": username}
 
-                r = requests.post(
+                r = self.session.post(
                     self.rocket_base_url + path, headers=headers, data=json.dumps(data)
                 )
                 data = json.loads(r.text)
@@ -94,7 +96,7 @@ class Rocket:
                 "X-User-Id": self.rocket_credentials["X-User-Id"],
             }
             data = {"roleName": role_name, "username": username}
-            r = requests.post(
+            r = self.session.post(
                 self.rocket_base_url + path, headers=headers, data=json.dumps(data)
             )
             data = json.loads(r.text)
@@ -114,7 +116,7 @@ class Rocket:
                 "X-User-Id": self.rocket_credentials["X-User-Id"],
             }
             data = {"name": name, "email": email, "password": password, "username": username}
-            r = requests.post(
+            r = self.session.post(
                 self.rocket_base_url + path, headers=headers, data=json.dumps(data)
             )
             data = json.loads(r.text)
@@ -130,7 +132,7 @@ class Rocket:
                 "X-Auth-Token": self.rocket_credentials["X-Auth-Token"],
                 "X-User-Id": self.rocket_credentials["X-User-Id"],
             }
-            r = requests.get(
+            r = self.session.get(
                 self.rocket_base_url + path, headers=headers
             )
             data = json.loads(r.text)
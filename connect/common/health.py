@@ -0,0 +1,72 @@
+import logging
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from connect.common.fanout import FanOutExecutor
+from connect.common.models import LogService, ServiceHealth
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceProber:
+    """
+    Checks every Service URL at once over a pooled session, so a check cycle
+    lasts as long as its slowest probe instead of the sum of all probes.
+
+    Each probe sends a HEAD request and only falls back to GET when the
+    server does not accept HEAD. A service is up when it answers 200; the
+    latency of the probe is stored in milliseconds next to the status.
+    """
+
+    HEAD_NOT_ALLOWED = (405, 501)
+
+    def __init__(self, timeout: float = None, max_workers: int = None):
+        self.timeout = timeout or settings.SERVICE_PROBE_TIMEOUT
+        self.max_workers = max_workers or settings.SERVICE_PROBE_MAX_WORKERS
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def probe(self, service):
+        started = time.monotonic()
+        try:
+            response = self.session.head(service.url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in self.HEAD_NOT_ALLOWED:
+                response = self.session.get(service.url, timeout=self.timeout, stream=True)
+                response.close()
+            status = response.status_code == 200
+        except requests.RequestException as error:
+            logger.info(f"[status_service] {service.url}: {error}")
+            status = False
+        return status, round((time.monotonic() - started) * 1000, 3)
+
+    def run(self, services) -> dict:
+        services = [service for service in services if not service.maintenance]
+        if not services:
+            return {}
+
+        # HEAD plus the GET fallback may take two timeouts
+        result = FanOutExecutor(
+            "status_service",
+            max_workers=min(len(services), self.max_workers),
+            call_timeout=self.timeout * 2,
+        ).run(services, self.probe)
+        probes = {service.pk: value for service, value in result.succeeded}
+
+        LogService.objects.bulk_create(
+            [
+                LogService(
+                    service=service,
+                    status=probes.get(service.pk, (False, None))[0],
+                    latency=probes.get(service.pk, (False, None))[1],
+                )
+                for service in services
+            ]
+        )
+        for service in services:
+            ServiceHealth.objects.refresh(service)
+        return result.summary()
@@ -0,0 +1,79 @@
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter applying a default timeout to the requests sent without one.
+    """
+
+    def __init__(self, *args, timeout: float = None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def build_session(
+    pool_size: int = None,
+    retries: int = None,
+    backoff_factor: float = None,
+    timeout: float = None,
+) -> requests.Session:
+    """
+    Session keeping up to `pool_size` connections alive per host. Idempotent
+    requests failing to connect or answering 502/503/504 are retried with an
+    exponential backoff; POST and PATCH are never retried. The session is
+    shared by every user and server it talks to, so it rejects the cookies
+    of the responses; cookies passed per request are still sent.
+    """
+    pool_size = pool_size or settings.HTTP_POOL_SIZE
+    retry = Retry(
+        total=settings.HTTP_RETRIES if retries is None else retries,
+        backoff_factor=settings.HTTP_BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+        timeout=timeout or settings.HTTP_TIMEOUT,
+    )
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(name: str) -> requests.Session:
+    """
+    Process-wide pooled session for the upstream `name`. Sessions are rebuilt
+    in forked children (Celery prefork workers) instead of sharing the
+    parent's sockets.
+    """
+    pid = os.getpid()
+    session = _sessions.get((name, pid))
+    if session is None:
+        with _sessions_lock:
+            for key in [key for key in _sessions if key[1] != pid]:
+                del _sessions[key]
+            session = _sessions.get((name, pid))
+            if session is None:
+                session = _sessions[(name, pid)] = build_session()
+    return session
@@ -0,0 +1,29 @@
+# Generated by Django 3.2.15 on 2026-10-18 12:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0065_project_created_by'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSyncState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, verbose_name='sync source')),
+                ('priority', models.CharField(choices=[('active', 'active'), ('idle', 'idle'), ('suspended', 'suspended')], default='active', max_length=20, verbose_name='refresh priority')),
+                ('last_synced_at', models.DateTimeField(null=True, verbose_name='last synced at')),
+                ('next_sync_at', models.DateTimeField(db_index=True, verbose_name='next sync at')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_states', to='common.project')),
+            ],
+            options={
+                'verbose_name': 'project sync state',
+                'unique_together': {('project', 'source')},
+            },
+        ),
+    ]
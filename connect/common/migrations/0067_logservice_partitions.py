@@ -0,0 +1,110 @@
+# Generated by Django 3.2.15 on 2026-10-18 14:20
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# days of partitions created ahead of today, the next ones are created by
+# the delete_status_logs task
+PARTITIONS_AHEAD = 7
+
+
+def noop(apps, schema_editor):  # pragma: no cover
+    pass
+
+
+def day_start(day) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def is_partitioned(schema_editor, table: str) -> bool:
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table])
+        return cursor.fetchone() is not None
+
+
+def create_partitions(schema_editor, table: str, first_day, last_day):
+    """
+    Creates the DEFAULT partition of the new, empty `table` and one
+    `<table>_pYYYYMMDD` partition per UTC day from `first_day` to
+    `last_day`, both included.
+    """
+    quote = schema_editor.quote_name
+    schema_editor.execute(f"CREATE TABLE {quote(table + '_default')} PARTITION OF {quote(table)} DEFAULT")
+    day = first_day
+    while day <= last_day:
+        schema_editor.execute(
+            f"CREATE TABLE {quote(f'{table}_p{day:%Y%m%d}')} PARTITION OF {quote(table)} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [day_start(day), day_start(day + timedelta(days=1))],
+        )
+        day += timedelta(days=1)
+
+
+def partition_log_service(apps, schema_editor):  # pragma: no cover
+    """
+    Rebuilds common_logservice as a table partitioned by day on created_at.
+    Only the rows inside the retention window are copied; PostgreSQL needs
+    the partition key in the primary key, so it becomes (id, created_at).
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    LogService = apps.get_model("common", "LogService")
+    Service = apps.get_model("common", "Service")
+    table = LogService._meta.db_table
+    if is_partitioned(schema_editor, table):
+        return
+
+    quote = schema_editor.quote_name
+    unpartitioned = f"{table}_unpartitioned"
+    today = timezone.now().date()
+    first_day = today - timedelta(days=settings.STATUS_LOG_RETENTION_DAYS + 1)
+    service_column = LogService._meta.get_field("service").column
+
+    schema_editor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(unpartitioned)}")
+    schema_editor.execute(
+        f"CREATE TABLE {quote(table)} (LIKE {quote(unpartitioned)} INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(table + '_id_created_at_pk')} "
+        "PRIMARY KEY (id, created_at)"
+    )
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(table + '_service_id_fk')} "
+        f"FOREIGN KEY ({quote(service_column)}) REFERENCES {quote(Service._meta.db_table)} (id) "
+        "DEFERRABLE INITIALLY DEFERRED"
+    )
+    create_partitions(schema_editor, table, first_day, today + timedelta(days=PARTITIONS_AHEAD))
+    schema_editor.execute(
+        f"INSERT INTO {quote(table)} SELECT * FROM {quote(unpartitioned)} WHERE created_at >= %s",
+        [day_start(first_day)],
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [unpartitioned])
+        sequence = cursor.fetchone()[0]
+    schema_editor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {quote(table)}.id")
+    schema_editor.execute(f"DROP TABLE {quote(unpartitioned)}")
+    schema_editor.execute(
+        f"CREATE INDEX {quote('common_logservice_svc_created')} "
+        f"ON {quote(table)} ({quote(service_column)}, created_at)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0066_projectsyncstate"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="logservice",
+            index=models.Index(fields=["service", "created_at"], name="common_logservice_svc_created"),
+        ),
+        migrations.RunPython(partition_log_service, noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.15 on 2026-10-18 15:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0067_logservice_partitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceHealth',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('online', 'online'), ('intermittent', 'intermittent'), ('offline', 'offline')], max_length=20, verbose_name='health status')),
+                ('intercurrence', models.DateTimeField(null=True, verbose_name='first failure')),
+                ('last_updated', models.DateTimeField(null=True, verbose_name='last check')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('service', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='health', to='common.service')),
+            ],
+            options={
+                'verbose_name': 'service health',
+            },
+        ),
+    ]
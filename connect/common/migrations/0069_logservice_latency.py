@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0068_servicehealth'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logservice',
+            name='latency',
+            field=models.FloatField(null=True, verbose_name='probe latency in milliseconds'),
+        ),
+    ]
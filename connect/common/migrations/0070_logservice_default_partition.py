@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+def noop(apps, schema_editor):  # pragma: no cover
+    pass
+
+
+def create_default_partition(apps, schema_editor):  # pragma: no cover
+    """
+    Adds the DEFAULT partition to common_logservice tables partitioned
+    before 0067 created it.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    table = apps.get_model("common", "LogService")._meta.db_table
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table])
+        if cursor.fetchone() is None:
+            return
+
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        f"CREATE TABLE IF NOT EXISTS {quote(table + '_default')} PARTITION OF {quote(table)} DEFAULT"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0069_logservice_latency'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_partition, noop),
+    ]
@@ -7,7 +7,7 @@ from decimal import Decimal
 from django.conf import settings
 from django.core import mail
 from django.db import models
-from django.db.models import Sum
+from django.db.models import Count, Max, Min, Q, Sum
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
@@ -622,6 +622,36 @@ class OpenedProject(models.Model):
     user = models.ForeignKey(User, models.CASCADE, related_name="user")
 
 
+class ProjectSyncState(models.Model):
+    class Meta:
+        verbose_name = _("project sync state")
+        unique_together = ["project", "source"]
+
+    PRIORITY_ACTIVE = "active"
+    PRIORITY_IDLE = "idle"
+    PRIORITY_SUSPENDED = "suspended"
+
+    PRIORITY_CHOICES = [
+        (PRIORITY_ACTIVE, _("active")),
+        (PRIORITY_IDLE, _("idle")),
+        (PRIORITY_SUSPENDED, _("suspended")),
+    ]
+
+    project = models.ForeignKey(Project, models.CASCADE, related_name="sync_states")
+    source = models.CharField(_("sync source"), max_length=50)
+    priority = models.CharField(
+        _("refresh priority"),
+        max_length=20,
+        choices=PRIORITY_CHOICES,
+        default=PRIORITY_ACTIVE,
+    )
+    last_synced_at = models.DateTimeField(_("last synced at"), null=True)
+    next_sync_at = models.DateTimeField(_("next sync at"), db_index=True)
+
+    def __str__(self):
+        return f"{self.project.name} - {self.source}"  # pragma: no cover
+
+
 class RocketRole(Enum):
     NOT_SETTED, USER, ADMIN, AGENT, SERVICE_MANAGER = list(range(5))
 
@@ -883,15 +913,82 @@ class Service(models.Model):
 
 
 class LogService(models.Model):
+    # On PostgreSQL the table is partitioned by day on created_at (migration
+    # 0067), expired days are dropped by DailyPartitions.
     class Meta:
         verbose_name = _("log service")
         verbose_name_plural = _("log services")
+        indexes = [
+            models.Index(fields=["service", "created_at"], name="common_logservice_svc_created"),
+        ]
 
     service = models.ForeignKey(Service, models.CASCADE, related_name="log_service")
     status = models.BooleanField(_("status service"), default=False)
+    latency = models.FloatField(_("probe latency in milliseconds"), null=True)
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
 
 
+class ServiceHealthManager(models.Manager):
+    def refresh(self, service, now=None):
+        """
+        Summarizes the last LogService checks of `service` with a single
+        aggregate over its last 10 days and stores it in its ServiceHealth.
+        """
+        now = now or timezone.now()
+        recent = Q(created_at__gte=now - timedelta(minutes=30))
+        failed = Q(status=False)
+        summary = service.log_service.filter(
+            created_at__range=[now - timedelta(days=10), now]
+        ).aggregate(
+            total=Count("id", filter=recent),
+            failed=Count("id", filter=recent & failed),
+            recent_intercurrence=Min("created_at", filter=recent & failed),
+            intercurrence=Min("created_at", filter=failed),
+            last_updated=Max("created_at"),
+        )
+        total_success = summary["total"] - summary["failed"]
+
+        if summary["failed"] > 0 and int(summary["total"] * 0.3) <= summary["failed"] and total_success >= 1:
+            status, intercurrence = ServiceHealth.STATUS_INTERMITTENT, summary["recent_intercurrence"]
+        elif summary["total"] <= summary["failed"]:
+            status, intercurrence = ServiceHealth.STATUS_OFFLINE, summary["recent_intercurrence"]
+        else:
+            status, intercurrence = ServiceHealth.STATUS_ONLINE, summary["intercurrence"]
+
+        health, created = self.update_or_create(
+            service=service,
+            defaults=dict(
+                status=status,
+                intercurrence=intercurrence,
+                last_updated=summary["last_updated"],
+            ),
+        )
+        return health
+
+
+class ServiceHealth(models.Model):
+    class Meta:
+        verbose_name = _("service health")
+
+    STATUS_ONLINE = "online"
+    STATUS_INTERMITTENT = "intermittent"
+    STATUS_OFFLINE = "offline"
+
+    STATUS_CHOICES = [
+        (STATUS_ONLINE, _("online")),
+        (STATUS_INTERMITTENT, _("intermittent")),
+        (STATUS_OFFLINE, _("offline")),
+    ]
+
+    service = models.OneToOneField(Service, models.CASCADE, related_name="health")
+    status = models.CharField(_("health status"), max_length=20, choices=STATUS_CHOICES)
+    intercurrence = models.DateTimeField(_("first failure"), null=True)
+    last_updated = models.DateTimeField(_("last check"), null=True)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    objects = ServiceHealthManager()
+
+
 class ServiceStatus(models.Model):
     class Meta:
         verbose_name = _("service status")
@@ -1394,8 +1491,19 @@ class Invoice(models.Model):
 
     @property
     def card_data(self):
-        card_data = StripeGateway().get_payment_method_details(self.stripe_charge)
-        if card_data["status"] == "FAIL":
+        payment_method_details = None
+        if self.stripe_charge:
+            payment_method_details = StripeGateway().get_payment_method_details(self.stripe_charge)
+        return self.format_card_data(payment_method_details)
+
+    def format_card_data(self, payment_method_details: dict = None) -> dict:
+        """
+        Card of the Stripe charge of the invoice, as read by
+        StripeGateway.get_payment_method_details, or the card of the
+        organization billing when there is no charge or it was not found.
+        Only the last two digits of the card number are kept.
+        """
+        if payment_method_details is None or payment_method_details["status"] == "FAIL":
             billing = self.organization.organization_billing
             card_data = {
                 "status": "SUCCESS",
@@ -1404,6 +1512,11 @@ class Invoice(models.Model):
                     "final_card_number": billing.final_card_number,
                 },
             }
+        else:
+            card_data = {
+                "status": payment_method_details["status"],
+                "response": dict(payment_method_details["response"]),
+            }
         if card_data["response"]["final_card_number"]:
             card_data["response"]["final_card_number"] = str(
                 card_data["response"]["final_card_number"]
@@ -0,0 +1,154 @@
+import logging
+from datetime import date, datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class DailyPartitions:
+    """
+    Manages the daily range partitions of a PostgreSQL table partitioned by
+    `column`, one partition named `<table>_pYYYYMMDD` per UTC day plus a
+    `<table>_default` partition for the rows of any other day.
+
+    Retention drops whole partitions instead of deleting rows, and queries
+    filtering on `column` are pruned to the partitions of their range. On
+    other databases, or while the table is not partitioned yet, every method
+    is a no-op and `drop_before` returns None so callers can fall back to
+    deleting rows.
+    """
+
+    def __init__(self, table: str, column: str = "created_at"):
+        self.table = table
+        self.column = column
+
+    def partition_name(self, day: date) -> str:
+        return f"{self.table}_p{day:%Y%m%d}"
+
+    def partition_day(self, name: str):
+        prefix = f"{self.table}_p"
+        if not name.startswith(prefix):
+            return None
+        try:
+            return datetime.strptime(name[len(prefix):], "%Y%m%d").date()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def day_start(day: date) -> datetime:
+        return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+    def is_partitioned(self) -> bool:
+        if connection.vendor != "postgresql":
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+                [self.table],
+            )
+            return cursor.fetchone() is not None
+
+    def partitions(self) -> dict:
+        """
+        Maps the day of every existing partition to its table name.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = to_regclass(%s)
+                """,
+                [self.table],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+        return {
+            self.partition_day(name): name for name in names if self.partition_day(name) is not None
+        }
+
+    @property
+    def default_name(self) -> str:
+        return f"{self.table}_default"
+
+    def create_default(self):
+        """
+        Creates the DEFAULT partition, which takes the rows of the days
+        without their own partition (backdated rows, or every row once
+        `ensure` stops running) instead of failing their inserts.
+        """
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {quote(self.default_name)} PARTITION OF {quote(self.table)} DEFAULT"
+            )
+
+    def create(self, first_day: date, last_day: date) -> list:
+        """
+        Creates the missing partitions from `first_day` to `last_day`, both
+        included, and returns the names of the created partitions. Rows of
+        those days already in the DEFAULT partition are moved to them.
+        """
+        quote = connection.ops.quote_name
+        self.create_default()
+        existing = self.partitions()
+        created = []
+        day = first_day
+        while day <= last_day:
+            if day not in existing:
+                name = self.partition_name(day)
+                bounds = [self.day_start(day), self.day_start(day + timedelta(days=1))]
+                # a partition cannot be created over rows of the DEFAULT one, so
+                # it is filled first and attached once they are moved
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute(
+                        f"CREATE TABLE {quote(name)} (LIKE {quote(self.table)} INCLUDING DEFAULTS)"
+                    )
+                    cursor.execute(
+                        f"WITH moved AS (DELETE FROM {quote(self.default_name)} "
+                        f"WHERE {quote(self.column)} >= %s AND {quote(self.column)} < %s RETURNING *) "
+                        f"INSERT INTO {quote(name)} SELECT * FROM moved",
+                        bounds,
+                    )
+                    cursor.execute(
+                        f"ALTER TABLE {quote(self.table)} ATTACH PARTITION {quote(name)} "
+                        "FOR VALUES FROM (%s) TO (%s)",
+                        bounds,
+                    )
+                created.append(name)
+            day += timedelta(days=1)
+        return created
+
+    def ensure(self, days_ahead: int, today: date = None) -> list:
+        if not self.is_partitioned():
+            return []
+        today = today or timezone.now().date()
+        created = self.create(today, today + timedelta(days=days_ahead))
+        if created:
+            logger.info(f"[partitions] created {created}")
+        return created
+
+    def drop_before(self, day: date):
+        """
+        Drops the partitions holding only rows older than `day`. Returns the
+        dropped partition names, or None when the table is not partitioned.
+        """
+        if not self.is_partitioned():
+            return None
+        self.create_default()
+        dropped = []
+        with connection.cursor() as cursor:
+            for partition_day, name in sorted(self.partitions().items()):
+                if partition_day < day:
+                    cursor.execute(f"DROP TABLE IF EXISTS {connection.ops.quote_name(name)}")
+                    dropped.append(name)
+            # expired rows that landed in the DEFAULT partition
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(self.default_name)} "
+                f"WHERE {connection.ops.quote_name(self.column)} < %s",
+                [self.day_start(day)],
+            )
+        if dropped:
+            logger.info(f"[partitions] dropped {dropped}")
+        return dropped
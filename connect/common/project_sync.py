@@ -0,0 +1,239 @@
+import logging
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from connect import utils
+from connect.api.v1.internal.intelligence.intelligence_rest_client import IntelligenceRESTClient
+from connect.common.bulk import BulkUpdateBuffer
+from connect.common.fanout import FanOutExecutor
+from connect.common.models import Project, ProjectSyncState
+
+logger = logging.getLogger(__name__)
+
+
+SyncSource = namedtuple("SyncSource", ["name", "fields", "cadence"])
+
+
+class ProjectSyncPipeline:
+    """
+    Refreshes the Project fields mirrored from Flows and Intelligence in a
+    single pass over the projects.
+
+    Each source groups the fields derived from the same remote call and has
+    its own cadence in minutes. Every (project, source) pair keeps a
+    ProjectSyncState with the last sync and the next due date; the cadence is
+    stretched for projects nobody opened lately and for suspended
+    organizations, so `run_due` only pays for the projects in active use.
+    """
+
+    SOURCES = (
+        SyncSource("information", ("name", "timezone", "date_format", "flow_id"), 5),
+        SyncSource("statistics", ("flow_count", "total_contact_count"), 6),
+        SyncSource("channels", ("extra_active_integration",), 7),
+        SyncSource("repositories", ("inteligence_count",), 8),
+    )
+
+    def __init__(self, sources: list = None):
+        if sources is None:
+            self.sources = list(self.SOURCES)
+        else:
+            self.sources = [source for source in self.SOURCES if source.name in sources]
+        self.flow_instance = utils.get_grpc_types().get("flow")
+        self.ai_client = IntelligenceRESTClient()
+        self.statistics = {}
+
+    @property
+    def fields(self):
+        return [field for source in self.sources for field in source.fields]
+
+    def get_queryset(self):
+        return Project.objects.select_related("organization").annotate(
+            last_opened_on=Max("opened_project__day")
+        )
+
+    def get_priority(self, project, now):
+        if project.organization.is_suspended:
+            return ProjectSyncState.PRIORITY_SUSPENDED
+        active_since = now - timedelta(days=settings.PROJECT_SYNC_ACTIVE_DAYS)
+        if project.last_opened_on is not None and project.last_opened_on >= active_since:
+            return ProjectSyncState.PRIORITY_ACTIVE
+        return ProjectSyncState.PRIORITY_IDLE
+
+    def get_interval(self, source, priority):
+        factor = {
+            ProjectSyncState.PRIORITY_ACTIVE: 1,
+            ProjectSyncState.PRIORITY_IDLE: settings.PROJECT_SYNC_IDLE_FACTOR,
+            ProjectSyncState.PRIORITY_SUSPENDED: settings.PROJECT_SYNC_SUSPENDED_FACTOR,
+        }.get(priority)
+        return timedelta(minutes=source.cadence * factor)
+
+    def get_due(self, now):
+        """
+        Maps the pk of the stale projects to the sources they are due for,
+        at most PROJECT_SYNC_BATCH_SIZE projects per source. Projects that
+        were never synced come after the stalest ones.
+        """
+        due = defaultdict(list)
+        for source in self.sources:
+            stale = list(
+                ProjectSyncState.objects.filter(source=source.name, next_sync_at__lte=now)
+                .order_by("next_sync_at")
+                .values_list("project_id", flat=True)[: settings.PROJECT_SYNC_BATCH_SIZE]
+            )
+            never_synced = list(
+                Project.objects.exclude(sync_states__source=source.name)
+                .order_by("created_at")
+                .values_list("pk", flat=True)[: settings.PROJECT_SYNC_BATCH_SIZE - len(stale)]
+            )
+            for project_id in stale + never_synced:
+                due[project_id].append(source)
+        return due
+
+    def fetch_information(self, project):
+        flow_result = self.flow_instance.get_project_info(
+            project_uuid=str(project.flow_organization)
+        )
+        if len(flow_result) == 0:
+            return {}
+        return {
+            "name": flow_result.get("name"),
+            "timezone": str(flow_result.get("timezone")),
+            "date_format": str(flow_result.get("date_format")),
+            "flow_id": flow_result.get("id"),
+        }
+
+    def prefetch(self, due: dict):
+        """
+        Reads the statistics of every due project in bulk before the
+        per-project fan-out.
+        """
+        project_uuids = [
+            str(project.flow_organization)
+            for project, sources in due.values()
+            if any(source.name == "statistics" for source in sources)
+        ]
+        if project_uuids:
+            self.statistics = self.flow_instance.get_project_statistics_bulk(project_uuids)
+
+    def fetch_statistics(self, project):
+        statistic_project_result = self.statistics.get(str(project.flow_organization))
+        if statistic_project_result is None:
+            statistic_project_result = self.flow_instance.get_project_statistic(
+                project_uuid=str(project.flow_organization)
+            )
+        if len(statistic_project_result) == 0:
+            return {}
+        return {
+            "flow_count": int(statistic_project_result.get("active_flows")),
+            "total_contact_count": statistic_project_result.get(
+                "active_contacts", project.total_contact_count
+            ),
+        }
+
+    def fetch_channels(self, project):
+        channels = self.flow_instance.list_channel(project_uuid=str(project.flow_organization))
+        return {"extra_active_integration": len(list(channels))}
+
+    def fetch_repositories(self, project):
+        classifiers_project = self.flow_instance.get_classifiers(
+            project_uuid=str(project.flow_organization),
+            classifier_type="bothub",
+            is_active=True,
+        )
+        try:
+            intelligence_count = int(
+                self.ai_client.get_count_intelligences_project(
+                    classifiers=classifiers_project,
+                ).get("repositories_count")
+            )
+        except Exception:
+            intelligence_count = 0
+        return {"inteligence_count": intelligence_count}
+
+    def fetch(self, project, sources):
+        values = {}
+        for source in sources:
+            values.update(getattr(self, f"fetch_{source.name}")(project))
+        return values
+
+    def update_states(self, due, succeeded, now):
+        states = {
+            (state.project_id, state.source): state
+            for state in ProjectSyncState.objects.filter(
+                project_id__in=list(due.keys()),
+                source__in=[source.name for source in self.sources],
+            )
+        }
+        new_states = []
+        with BulkUpdateBuffer(
+            ProjectSyncState, ["priority", "last_synced_at", "next_sync_at"]
+        ) as buffer:
+            for project, sources in due.values():
+                priority = self.get_priority(project, now)
+                for source in sources:
+                    state = states.get((project.pk, source.name))
+                    if project.pk in succeeded:
+                        values = dict(
+                            priority=priority,
+                            last_synced_at=now,
+                            next_sync_at=now + self.get_interval(source, priority),
+                        )
+                    else:
+                        values = dict(
+                            next_sync_at=now + self.get_interval(source, ProjectSyncState.PRIORITY_ACTIVE)
+                        )
+
+                    if state is None:
+                        new_states.append(ProjectSyncState(project=project, source=source.name, **values))
+                    else:
+                        buffer.add(state, **values)
+        ProjectSyncState.objects.bulk_create(
+            new_states, batch_size=settings.SYNC_BULK_UPDATE_BATCH_SIZE
+        )
+
+    def run(self, due: dict = None, now=None):
+        """
+        Syncs the projects in `due`, a map of project pk to the sources to
+        fetch for it. Without it every project is synced for every source.
+        """
+        now = now or timezone.now()
+        projects = self.get_queryset()
+        if due is not None:
+            projects = projects.filter(pk__in=list(due.keys()))
+        due = {
+            project.pk: (project, due[project.pk] if due is not None else self.sources)
+            for project in projects
+        }
+
+        summary = {"sources": [source.name for source in self.sources]}
+        self.prefetch(due)
+        result = FanOutExecutor("sync_projects").run(
+            due.values(), lambda item: self.fetch(*item)
+        )
+        # only the fields fetched for a project are written, so the ones of
+        # sources that were not due keep any concurrent edit
+        fetched = defaultdict(list)
+        for (project, sources), values in result.succeeded:
+            if values:
+                fetched[tuple(sorted(values))].append((project, values))
+        changes = {"changed": 0, "unchanged": 0}
+        for fields, items in fetched.items():
+            with BulkUpdateBuffer(Project, fields) as buffer:
+                for project, values in items:
+                    buffer.add(project, **values)
+            for key, count in buffer.summary().items():
+                changes[key] += count
+
+        self.update_states(due, {project.pk for (project, sources), values in result.succeeded}, now)
+
+        summary.update(result.summary())
+        summary.update(changes)
+        return summary
+
+    def run_due(self, now=None):
+        now = now or timezone.now()
+        return self.run(self.get_due(now), now)
@@ -0,0 +1,82 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Max, Min
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionPolicy:
+    """
+    Purges the rows of an append-only table older than a cutoff in bounded
+    windows, one DELETE per window, pausing between windows so no statement
+    holds its locks for long.
+
+    Tables with an integer primary key are walked in id ranges of
+    `batch_size`; other tables (UUID keys) are walked in time windows of
+    `window` over `date_field`. Each window is a plain QuerySet.delete(), so
+    tables without signals or cascades are removed with a single statement
+    and cascades (e.g. many-to-many links) are still honored.
+    """
+
+    def __init__(
+        self,
+        queryset,
+        date_field: str = "created_at",
+        batch_size: int = None,
+        pause: float = None,
+        window: timedelta = timedelta(hours=1),
+    ):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.date_field = date_field
+        self.batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+        self.pause = settings.RETENTION_PAUSE if pause is None else pause
+        self.window = window
+
+    @property
+    def name(self):
+        return self.model.__name__
+
+    def expired(self, before):
+        return self.queryset.filter(**{f"{self.date_field}__lt": before})
+
+    def windows(self, expired):
+        if isinstance(self.model._meta.pk, (models.AutoField, models.BigAutoField)):
+            bounds = expired.aggregate(low=Min("pk"), high=Max("pk"))
+            if bounds["low"] is None:
+                return
+            for start in range(bounds["low"], bounds["high"] + 1, self.batch_size):
+                yield {"pk__gte": start, "pk__lt": start + self.batch_size}
+        else:
+            bounds = expired.aggregate(low=Min(self.date_field), high=Max(self.date_field))
+            if bounds["low"] is None:
+                return
+            start = bounds["low"]
+            while start <= bounds["high"]:
+                yield {f"{self.date_field}__gte": start, f"{self.date_field}__lt": start + self.window}
+                start += self.window
+
+    def purge(self, before) -> dict:
+        expired = self.expired(before)
+        deleted = 0
+        started = time.monotonic()
+        for window in self.windows(expired):
+            _, per_model = expired.filter(**window).delete()
+            count = per_model.get(self.model._meta.label, 0)
+            deleted += count
+            if count and self.pause:
+                time.sleep(self.pause)
+
+        elapsed = time.monotonic() - started
+        result = {
+            "model": self.name,
+            "deleted": deleted,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(deleted / elapsed, 3) if elapsed else 0.0,
+        }
+        logger.info(f"[retention] {result}")
+        return result
@@ -24,8 +24,13 @@ from connect.common.models import (
     RequestRocketPermission,
     RequestChatsPermission,
     OpenedProject,
+    ProjectSyncState,
 )
 from connect.celery import app as celery_app
+from connect.common.authorizations import (
+    invalidate_organization_authorizations,
+    invalidate_project_authorizations,
+)
 from connect.api.v1.internal.intelligence.intelligence_rest_client import IntelligenceRESTClient
 from connect.api.v1.internal.chats.chats_rest_client import ChatsRESTClient
 
@@ -149,6 +154,18 @@ def delete_authorizations(instance, **kwargs):
     )
 
 
+@receiver([post_save, post_delete], sender=OrganizationAuthorization)
+def invalidate_organization_authorization(sender, instance, **kwargs):
+    if settings.AUTHORIZATION_CACHE_TIMEOUT:
+        invalidate_organization_authorizations(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=ProjectAuthorization)
+def invalidate_project_authorization(sender, instance, **kwargs):
+    if settings.AUTHORIZATION_CACHE_TIMEOUT:
+        invalidate_project_authorizations(instance.user_id, instance.project.organization_id)
+
+
 @receiver(post_save, sender=RequestPermissionOrganization)
 def request_permission_organization(sender, instance, created, **kwargs):
     if created:
@@ -320,3 +337,12 @@ def request_chats_permission(sender, instance, created, **kwargs):
                         )
                 project_auth.save(update_fields=["chats_authorization"])
                 instance.delete()
+
+
+@receiver(post_save, sender=OpenedProject)
+def prioritize_opened_project_sync(sender, instance, **kwargs):
+    now = timezone.now()
+    if instance.day >= now - timezone.timedelta(days=settings.PROJECT_SYNC_ACTIVE_DAYS):
+        ProjectSyncState.objects.filter(project=instance.project).exclude(
+            priority=ProjectSyncState.PRIORITY_ACTIVE
+        ).update(next_sync_at=now)
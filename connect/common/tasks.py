@@ -1,13 +1,11 @@
 import json
 import pendulum
 from datetime import timedelta
-import requests
 import grpc
 from grpc._channel import _InactiveRpcError
 
 from django.utils import timezone
 from django.conf import settings
-from django.db import transaction
 
 from connect import utils, billing
 from connect.authentication.models import User
@@ -21,6 +19,12 @@ from connect.common.models import (
     Invoice,
     GenericBillingData,
 )
+from connect.common.bulk import BulkUpdateBuffer
+from connect.common.fanout import FanOutExecutor
+from connect.common.health import ServiceProber
+from connect.common.project_sync import ProjectSyncPipeline
+from connect.common.partitions import DailyPartitions
+from connect.common.retention import RetentionPolicy
 
 from connect.api.v1.internal.chats.chats_rest_client import ChatsRESTClient
 from connect.api.v1.internal.flows.flows_rest_client import FlowsRESTClient
@@ -29,28 +33,8 @@ from connect.api.v1.internal.intelligence.intelligence_rest_client import Intell
 
 
 @app.task()
-def status_service() -> None:
-    def is_page_available(url: str, method_request: requests, **kwargs) -> bool:
-        """This function retreives the status code of a website by requesting
-        HEAD data from the host. This means that it only requests the headers.
-        If the host cannot be reached or something else goes wrong, it returns
-        False.
-        """
-        try:
-            response = method_request(url=url, **kwargs)
-            if int(response.status_code) == 200:
-                return True
-            return False
-        except Exception:
-            return False
-
-    for service in Service.objects.all():
-        if not service.maintenance:
-            service.log_service.create(
-                status=is_page_available(
-                    url=service.url, method_request=requests.get, timeout=10
-                )
-            )
+def status_service():
+    return ServiceProber().run(Service.objects.all())
 
 
 @app.task(name="delete_organization")
@@ -148,17 +132,20 @@ def migrate_organization(user_email: str):
 
     organizations = ai_client.list_organizations(user_email=user_email)
 
-    for organization in organizations:
+    # runs on the login request, so the role of every organization is read concurrently
+    roles = FanOutExecutor("migrate_organization").run(
+        organizations,
+        lambda organization: ai_client.get_user_organization_permission_role(
+            user_email=user_email,
+            organization_id=organization.get("id")
+        ),
+    )
+
+    for organization, role in roles.succeeded:
         org, created = Organization.objects.get_or_create(
             inteligence_organization=organization.get("id"),
             defaults={"name": organization.get("name"), "description": ""},
         )
-
-        role = ai_client.get_user_organization_permission_role(
-            user_email=user_email,
-            organization_id=organization.get("id")
-        )
-
         org.authorizations.create(user=user, role=role)
 
 
@@ -268,21 +255,28 @@ def search_project(organization_id: int, project_uuid: str, text: str):
 def check_organization_free_plan():
     limits = GenericBillingData.get_generic_billing_data_instance()
     flow_instance = utils.get_grpc_types().get("flow")
-    for organization in Organization.objects.filter(
+    organizations = Organization.objects.filter(
         organization_billing__plan="free", is_suspended=False
-    ):
+    ).prefetch_related("project")
+
+    periods = {}
+    for organization in organizations:
         for project in organization.project.all():
-            project_timezone = project.timezone
-            now = pendulum.now(project_timezone)
+            now = pendulum.now(project.timezone)
             before = now.strftime("%Y-%m-%d %H:%M")
             # first day of month
             after = now.start_of('month').strftime("%Y-%m-%d %H:%M")
+            periods[str(project.flow_organization)] = (before, after)
+    totals = flow_instance.get_billing_total_statistics_bulk(periods)
+
+    with BulkUpdateBuffer(Project, ["contact_count"]) as buffer:
+        for organization in organizations:
+            for project in organization.project.all():
+                total = totals.get(str(project.flow_organization))
+                if total is not None:
+                    buffer.add(project, contact_count=int(total.get("active_contacts")))
 
-            contact_count = flow_instance.get_billing_total_statistics(
-                project_uuid=str(project.flow_organization), before=before, after=after
-            ).get("active_contacts")
-            project.contact_count = int(contact_count)
-            project.save(update_fields=["contact_count"])
+    for organization in organizations:
         current_active_contacts = organization.active_contacts
         if current_active_contacts > limits.free_active_contacts_limit:
             organization.is_suspended = True
@@ -301,91 +295,48 @@ def check_organization_free_plan():
 
 @app.task()
 def sync_active_contacts():
-    for project in Project.objects.all():
-        last_invoice_date = project.organization.organization_billing.last_invoice_date
-        next_due_date = project.organization.organization_billing.next_due_date
-        created_at = project.organization.created_at
-        before = timezone.now() if next_due_date is None else next_due_date
-        after = created_at if last_invoice_date is None else last_invoice_date
-        contact_count = utils.count_contacts(project=project, after=str(after), before=str(before))
-        project.contact_count = int(contact_count)
-        project.save(update_fields=["contact_count"])
+    projects = Project.objects.select_related("organization__organization_billing")
+    with BulkUpdateBuffer(Project, ["contact_count"]) as buffer:
+        for project in projects:
+            last_invoice_date = project.organization.organization_billing.last_invoice_date
+            next_due_date = project.organization.organization_billing.next_due_date
+            created_at = project.organization.created_at
+            before = timezone.now() if next_due_date is None else next_due_date
+            after = created_at if last_invoice_date is None else last_invoice_date
+            # feeds the billing estimate, so the count must be exact
+            contact_count = utils.count_contacts(project=project, after=str(after), before=str(before))
+            buffer.add(project, contact_count=int(contact_count))
     return True
 
 
+@app.task(name="sync_projects")
+def sync_projects(sources: list = None):
+    return ProjectSyncPipeline(sources).run_due()
+
+
 @app.task()
 def sync_total_contact_count():
-    flow_instance = utils.get_grpc_types().get("flow")
-    for project in Project.objects.all():
-        response = flow_instance.get_project_statistic(project_uuid=str(project.flow_organization))
-        contacts = response.get("active_contacts", project.total_contact_count)
-        project.total_contact_count = contacts
-        project.save(update_fields=["total_contact_count"])
-    return True
+    return ProjectSyncPipeline(["statistics"]).run()
 
 
 @app.task()
 def sync_project_information():
-    flow_instance = utils.get_grpc_types().get("flow")
-    for project in Project.objects.all():
-        flow_result = flow_instance.get_project_info(
-            project_uuid=str(project.flow_organization)
-        )
-        if len(flow_result) > 0:
-            project.name = flow_result.get("name")
-            project.timezone = str(flow_result.get("timezone"))
-            project.date_format = str(flow_result.get("date_format"))
-            project.flow_id = flow_result.get("id")
-            project.save(update_fields=["name", "timezone", "date_format", "flow_id"])
+    return ProjectSyncPipeline(["information"]).run()
 
 
 @app.task(name="sync_project_statistics")
 def sync_project_statistics():
-    flow_instance = utils.get_grpc_types().get("flow")
-    for project in Project.objects.all():
-        statistic_project_result = flow_instance.get_project_statistic(
-            project_uuid=str(project.flow_organization),
-        )
-
-        if len(statistic_project_result) > 0:
-            project.flow_count = int(statistic_project_result.get("active_flows"))
-            project.save(update_fields=["flow_count"])
+    return ProjectSyncPipeline(["statistics"]).run()
 
 
 @app.task()
 def sync_repositories_statistics():
-    flow_instance = utils.get_grpc_types().get("flow")
-    ai_client = IntelligenceRESTClient()
-
-    for project in Project.objects.all():
-        classifiers_project = flow_instance.get_classifiers(
-            project_uuid=str(project.flow_organization),
-            classifier_type="bothub",
-            is_active=True,
-        )
-        try:
-            intelligence_count = int(
-                ai_client.get_count_intelligences_project(
-                    classifiers=classifiers_project,
-                ).get("repositories_count")
-            )
-        except Exception:
-            intelligence_count = 0
-
-        project.inteligence_count = intelligence_count
-        project.save(update_fields=["inteligence_count"])
+    return ProjectSyncPipeline(["repositories"]).run()
 
 
 @app.task(name="sync_channels_statistics")
 def sync_channels_statistics():
-    flow_instance = utils.get_grpc_types().get("flow")
-    for project in Project.objects.all():
-        project.extra_active_integration = len(
-            list(
-                flow_instance.list_channel(project_uuid=str(project.flow_organization))
-            )
-        )
-        project.save(update_fields=["extra_active_integration"])
+    return ProjectSyncPipeline(["channels"]).run()
 
 
 @app.task()
@@ -457,27 +408,19 @@ def capture_invoice():
 
 @app.task()
 def delete_status_logs():
-    BATCH_SIZE = 5000
-    logs = LogService.objects.filter(
-        created_at__lt=timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        - timezone.timedelta(days=10)
+    """
+    Drops the expired daily LogService partitions and creates the ones for the
+    coming days. Falls back to deleting rows when the table is not partitioned.
+    """
+    before = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0) - timezone.timedelta(
+        days=settings.STATUS_LOG_RETENTION_DAYS
     )
-
-    num_updated = 0
-    max_id = -1
-    while True:
-        batch = list(logs.filter(id__gt=max_id).order_by("id")[:BATCH_SIZE])
-
-        if not batch:
-            break
-
-        max_id = batch[-1].id
-        with transaction.atomic():
-            for log in batch:
-                log.delete()
-
-        num_updated += len(batch)
-        print(f" > deleted {num_updated} status logs")
+    partitions = DailyPartitions(LogService._meta.db_table)
+    partitions.ensure(days_ahead=settings.STATUS_LOG_PARTITIONS_AHEAD)
+    dropped = partitions.drop_before(before.date())
+    if dropped is None:
+        return RetentionPolicy(LogService.objects.all()).purge(before)
+    return {"model": LogService.__name__, "dropped_partitions": dropped}
 
 
 @app.task(
@@ -568,11 +511,14 @@ def delete_user_permission_project(project_uuid: str, user_email: str, permissio
 def list_channels(channel_type):
     grpc_instance = utils.get_grpc_types().get("flow")
     response = list(grpc_instance.list_channel(channel_type=channel_type))
+    projects = {
+        str(project.flow_organization): project
+        for project in Project.objects.filter(flow_organization__in={channel.org for channel in response})
+    }
     channels = []
     for channel in response:
-        project = Project.objects.filter(flow_organization=channel.org)
+        project = projects.get(str(channel.org))
         if project:
-            project = project.first()
             channels.append(
                 {
                     "uuid": str(channel.uuid),
@@ -1,6 +1,14 @@
+import time
 import uuid as uuid4
+from concurrent.futures import Future
+from http.client import HTTPMessage
+import grpc
+import requests
+from requests.cookies import MockRequest, MockResponse
 from unittest import skipIf
-from django.test import TestCase
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
 
 from connect.authentication.models import User
 from connect.common.models import (
@@ -8,10 +16,16 @@ from connect.common.models import (
     ProjectRole,
     Service,
     Organization,
+    OrganizationAuthorization,
     ServiceStatus,
+    ServiceHealth,
     NewsletterLanguage,
     BillingPlan,
     GenericBillingData,
+    LogService,
+    OpenedProject,
+    Project,
+    ProjectSyncState,
     RequestPermissionProject,
     OrganizationRole,
     OrganizationLevelRole,
@@ -24,6 +38,18 @@ from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 from connect.common.gateways.rocket_gateway import Rocket
+from connect.common.authorizations import AuthorizationResolver
+from connect.common.bulk import BulkUpdateBuffer
+from connect.common.fanout import FanOutExecutor
+from connect.common.health import ServiceProber
+from connect.common.http import build_session, get_session
+from connect.grpc.channels import ChannelManager
+from connect.grpc.types.flow import FlowType
+from connect.grpc.policies import RETRYABLE_CODES, PolicyStub, RpcPolicy
+from connect.common.project_sync import ProjectSyncPipeline
+from connect.common.partitions import DailyPartitions
+from connect.common.retention import RetentionPolicy
+from connect.billing.models import FailMessageLog, SyncManagerTask
 
 
 class NewsletterTestCase(TestCase):
@@ -795,3 +821,632 @@ class TestRocket(TestCase):
         response = self.rocket.get_keycloak_authorization_token()
         self.assertEquals(response['status'], 'FAILED')
         self.assertEquals(response['message']['error_description'], 'Invalid user credentials')
+
+
+class FanOutExecutorTestCase(TestCase):
+    def test_collects_results_and_failures(self):
+        def call(item):
+            if item == 3:
+                raise ValueError("remote error")
+            return item * 2
+
+        result = FanOutExecutor("test", max_workers=4, call_timeout=5).run(range(5), call)
+
+        self.assertEqual(sorted(result.succeeded), [(0, 0), (1, 2), (2, 4), (4, 8)])
+        self.assertEqual(len(result.failed), 1)
+        self.assertEqual(result.failed[0][0], 3)
+        self.assertIsInstance(result.failed[0][1], ValueError)
+        self.assertEqual(result.summary()["total"], 5)
+        self.assertEqual(result.summary()["failed"], 1)
+
+    def test_runs_calls_concurrently(self):
+        start = time.monotonic()
+        result = FanOutExecutor("test", max_workers=10, call_timeout=5).run(
+            range(10), lambda item: time.sleep(0.2)
+        )
+        self.assertEqual(len(result.succeeded), 10)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertGreater(result.throughput, 0)
+
+    def test_call_timeout(self):
+        result = FanOutExecutor("test", max_workers=2, call_timeout=0.2).run(
+            [0.0, 2.0], lambda item: time.sleep(item)
+        )
+        self.assertEqual(len(result.succeeded), 1)
+        self.assertEqual(result.timed_out, [2.0])
+
+
+class BulkUpdateBufferTestCase(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="Test",
+            inteligence_organization=0,
+            organization_billing__cycle=BillingPlan.BILLING_CYCLE_MONTHLY,
+            organization_billing__plan="free",
+        )
+        self.projects = [
+            self.organization.project.create(
+                name=f"project {index}",
+                timezone="America/Sao_Paulo",
+                flow_organization=uuid4.uuid4(),
+            )
+            for index in range(5)
+        ]
+
+    def test_skips_unchanged_rows(self):
+        with BulkUpdateBuffer(Project, ["flow_count", "timezone"], batch_size=2) as buffer:
+            for index, project in enumerate(self.projects):
+                buffer.add(project, flow_count=index, timezone="America/Sao_Paulo")
+
+        self.assertEqual(buffer.summary(), {"changed": 4, "unchanged": 1})
+        self.assertEqual(
+            list(Project.objects.order_by("name").values_list("flow_count", flat=True)),
+            [0, 1, 2, 3, 4],
+        )
+
+    def test_batches_writes(self):
+        buffer = BulkUpdateBuffer(Project, ["flow_count"], batch_size=2)
+        with self.assertNumQueries(2):
+            for project in self.projects:
+                buffer.add(project, flow_count=10)
+        with self.assertNumQueries(1):
+            buffer.flush()
+        self.assertEqual(Project.objects.filter(flow_count=10).count(), 5)
+
+    def test_rejects_unknown_field(self):
+        with self.assertRaises(ValueError):
+            BulkUpdateBuffer(Project, ["flow_count"]).add(self.projects[0], name="new name")
+
+
+class ProjectSyncPipelineTestCase(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner@user.com", "owner")
+        self.organization = Organization.objects.create(
+            name="Test",
+            inteligence_organization=0,
+            organization_billing__cycle=BillingPlan.BILLING_CYCLE_MONTHLY,
+            organization_billing__plan="free",
+        )
+        self.project = self.organization.project.create(
+            name="project test",
+            timezone="America/Sao_Paulo",
+            flow_organization=uuid4.uuid4(),
+        )
+        self.flow_instance = MagicMock()
+        self.flow_instance.get_project_info.return_value = []
+        self.flow_instance.get_project_statistic.return_value = {
+            "active_flows": 3,
+            "active_classifiers": 1,
+            "active_contacts": 42,
+        }
+        self.flow_instance.list_channel.return_value = []
+        self.flow_instance.get_classifiers.return_value = []
+        self.flow_instance.get_project_statistics_bulk.return_value = {}
+
+    def pipeline(self, *args, **kwargs):
+        with patch("connect.common.project_sync.utils.get_grpc_types") as get_grpc_types:
+            get_grpc_types.return_value = {"flow": self.flow_instance}
+            return ProjectSyncPipeline(*args, **kwargs)
+
+    def test_statistics_fill_flow_and_contact_count(self):
+        summary = self.pipeline(["statistics"]).run()
+
+        self.flow_instance.get_project_statistic.assert_called_once_with(
+            project_uuid=str(self.project.flow_organization)
+        )
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.flow_count, 3)
+        self.assertEqual(self.project.total_contact_count, 42)
+        self.assertEqual(summary["changed"], 1)
+
+    def test_statistics_are_read_in_bulk(self):
+        self.flow_instance.get_project_statistics_bulk.return_value = {
+            str(self.project.flow_organization): {"active_flows": 5, "active_contacts": 7}
+        }
+        self.pipeline(["statistics"]).run()
+
+        self.flow_instance.get_project_statistics_bulk.assert_called_once_with(
+            [str(self.project.flow_organization)]
+        )
+        self.flow_instance.get_project_statistic.assert_not_called()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.flow_count, 5)
+        self.assertEqual(self.project.total_contact_count, 7)
+
+    def test_only_fetched_fields_are_written(self):
+        def rename(project_uuids):
+            # edited while the statistics were being read
+            Project.objects.filter(pk=self.project.pk).update(name="renamed")
+            return {project_uuids[0]: {"active_flows": 5, "active_contacts": 7}}
+
+        self.flow_instance.get_project_statistics_bulk.side_effect = rename
+        statistics = [source for source in ProjectSyncPipeline.SOURCES if source.name == "statistics"]
+        self.pipeline().run({self.project.pk: statistics})
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.name, "renamed")
+        self.assertEqual(self.project.flow_count, 5)
+
+    @override_settings(PROJECT_SYNC_BATCH_SIZE=1)
+    def test_due_projects_are_capped_per_source(self):
+        self.organization.project.create(
+            name="another project",
+            timezone="America/Sao_Paulo",
+            flow_organization=uuid4.uuid4(),
+        )
+        self.assertEqual(len(self.pipeline().get_due(timezone.now())), 1)
+
+    def test_run_due_only_syncs_stale_projects(self):
+        now = timezone.now()
+        pipeline = self.pipeline()
+        self.assertEqual(len(pipeline.get_due(now)[self.project.pk]), len(ProjectSyncPipeline.SOURCES))
+
+        pipeline.run_due(now)
+
+        state = self.project.sync_states.get(source="statistics")
+        self.assertEqual(state.priority, ProjectSyncState.PRIORITY_IDLE)
+        self.assertEqual(state.last_synced_at, now)
+        self.assertEqual(
+            state.next_sync_at, now + timedelta(minutes=6 * settings.PROJECT_SYNC_IDLE_FACTOR)
+        )
+        self.assertEqual(pipeline.get_due(now + timedelta(minutes=10)), {})
+        self.assertEqual(pipeline.run_due(now + timedelta(minutes=10))["total"], 0)
+
+    def test_opened_project_is_prioritized(self):
+        now = timezone.now()
+        pipeline = self.pipeline()
+        pipeline.run_due(now)
+
+        OpenedProject.objects.create(project=self.project, user=self.owner, day=timezone.now())
+        self.assertEqual(len(pipeline.get_due(timezone.now())[self.project.pk]), len(ProjectSyncPipeline.SOURCES))
+
+        pipeline.run_due(timezone.now())
+        self.assertEqual(
+            self.project.sync_states.get(source="statistics").priority,
+            ProjectSyncState.PRIORITY_ACTIVE,
+        )
+
+
+class RetentionPolicyTestCase(TestCase):
+    def setUp(self):
+        self.service = Service.objects.create(url="http://test.com", default=False)
+        self.now = timezone.now()
+
+    def test_purge_by_id_range(self):
+        LogService.objects.bulk_create([LogService(service=self.service) for _ in range(7)])
+        recent = LogService.objects.create(service=self.service)
+        LogService.objects.exclude(pk=recent.pk).update(created_at=self.now - timedelta(days=20))
+
+        result = RetentionPolicy(LogService.objects.all(), batch_size=3, pause=0).purge(
+            self.now - timedelta(days=10)
+        )
+
+        self.assertEqual(result["deleted"], 7)
+        self.assertEqual(list(LogService.objects.values_list("pk", flat=True)), [recent.pk])
+
+    def test_purge_by_time_window_keeps_many_to_many_consistent(self):
+        def create_task(started_at):
+            return SyncManagerTask.objects.create(
+                task_type="sync_contacts", started_at=started_at, before=started_at, after=started_at
+            )
+
+        old_tasks = [create_task(self.now - timedelta(days=100, hours=hours)) for hours in range(5)]
+        recent_task = create_task(self.now)
+        old_tasks[0].fail_message.create(message="error")
+
+        result = RetentionPolicy(SyncManagerTask.objects.all(), date_field="started_at", pause=0).purge(
+            self.now - timedelta(days=90)
+        )
+
+        self.assertEqual(result["deleted"], 5)
+        self.assertEqual(list(SyncManagerTask.objects.all()), [recent_task])
+        self.assertEqual(SyncManagerTask.fail_message.through.objects.count(), 0)
+        self.assertEqual(FailMessageLog.objects.count(), 1)
+
+    def test_purge_without_expired_rows(self):
+        LogService.objects.create(service=self.service)
+        result = RetentionPolicy(LogService.objects.all(), pause=0).purge(self.now - timedelta(days=10))
+        self.assertEqual(result["deleted"], 0)
+        self.assertEqual(LogService.objects.count(), 1)
+
+
+class DailyPartitionsTestCase(TestCase):
+    def setUp(self):
+        self.partitions = DailyPartitions(LogService._meta.db_table)
+
+    def test_partition_name_round_trip(self):
+        day = timezone.now().date()
+        name = self.partitions.partition_name(day)
+        self.assertEqual(name, f"common_logservice_p{day:%Y%m%d}")
+        self.assertEqual(self.partitions.partition_day(name), day)
+        self.assertIsNone(self.partitions.partition_day("common_logservice_pkey"))
+        self.assertIsNone(self.partitions.partition_day("common_service_p20200101"))
+
+    @skipIf(not settings.DATABASES["default"]["ENGINE"].endswith("postgresql"), "Needs PostgreSQL")
+    def test_rows_outside_the_daily_partitions_go_to_the_default_one(self):
+        service = Service.objects.create(url="http://test.com", default=False)
+        backdated = LogService.objects.create(service=service)
+        old_day = timezone.now() - timedelta(days=settings.STATUS_LOG_RETENTION_DAYS * 3)
+        LogService.objects.filter(pk=backdated.pk).update(created_at=old_day)
+        self.assertEqual(LogService.objects.get(pk=backdated.pk).created_at, old_day)
+
+        # a partition created over rows of the DEFAULT one takes them over
+        self.assertEqual(
+            self.partitions.create(old_day.date(), old_day.date()),
+            [self.partitions.partition_name(old_day.date())],
+        )
+        self.assertTrue(LogService.objects.filter(pk=backdated.pk).exists())
+
+        self.partitions.drop_before(timezone.now().date() - timedelta(days=settings.STATUS_LOG_RETENTION_DAYS))
+        self.assertFalse(LogService.objects.filter(pk=backdated.pk).exists())
+
+    @skipIf(settings.DATABASES["default"]["ENGINE"].endswith("postgresql"), "Partitioned on PostgreSQL")
+    def test_delete_status_logs_falls_back_to_row_deletes(self):
+        service = Service.objects.create(url="http://test.com", default=False)
+        expired = LogService.objects.create(service=service)
+        LogService.objects.filter(pk=expired.pk).update(
+            created_at=timezone.now() - timedelta(days=settings.STATUS_LOG_RETENTION_DAYS + 2)
+        )
+        recent = LogService.objects.create(service=service)
+
+        from connect.common.tasks import delete_status_logs
+
+        self.assertIsNone(self.partitions.drop_before(timezone.now().date()))
+        result = delete_status_logs()
+
+        self.assertEqual(result["deleted"], 1)
+        self.assertEqual(list(LogService.objects.all()), [recent])
+
+
+class ServiceHealthTestCase(TestCase):
+    def setUp(self):
+        self.service = Service.objects.create(url="http://test.com", default=False)
+
+    def create_logs(self, *statuses):
+        for status in statuses:
+            self.service.log_service.create(status=status)
+
+    def test_online(self):
+        self.create_logs(True, True, True, True)
+        health = ServiceHealth.objects.refresh(self.service)
+        self.assertEqual(health.status, ServiceHealth.STATUS_ONLINE)
+        self.assertIsNone(health.intercurrence)
+        self.assertEqual(health.last_updated, self.service.log_service.latest("created_at").created_at)
+
+    def test_few_checks_without_failures_are_online(self):
+        for checks in range(1, 4):
+            self.create_logs(True)
+            self.assertEqual(ServiceHealth.objects.refresh(self.service).status, ServiceHealth.STATUS_ONLINE, checks)
+
+    def test_intermittent(self):
+        self.create_logs(True, False, True)
+        health = ServiceHealth.objects.refresh(self.service)
+        self.assertEqual(health.status, ServiceHealth.STATUS_INTERMITTENT)
+        self.assertEqual(health.intercurrence, self.service.log_service.get(status=False).created_at)
+
+    def test_offline_and_refresh_updates_the_summary(self):
+        self.create_logs(False, False)
+        self.assertEqual(ServiceHealth.objects.refresh(self.service).status, ServiceHealth.STATUS_OFFLINE)
+
+        self.create_logs(*[True] * 10)
+        health = ServiceHealth.objects.refresh(self.service)
+        self.assertEqual(health.status, ServiceHealth.STATUS_ONLINE)
+        self.assertEqual(ServiceHealth.objects.filter(service=self.service).count(), 1)
+
+
+class ServiceProberTestCase(TestCase):
+    def setUp(self):
+        self.online = Service.objects.create(url="http://online.com", default=False)
+        self.no_head = Service.objects.create(url="http://no-head.com", default=False)
+        self.offline = Service.objects.create(url="http://offline.com", default=False)
+        self.maintenance = Service.objects.create(url="http://maintenance.com", default=False, maintenance=True)
+        self.prober = ServiceProber(timeout=1)
+
+    def head(self, url, **kwargs):
+        time.sleep(0.2)
+        if url == self.offline.url:
+            raise requests.ConnectionError("connection refused")
+        return MagicMock(status_code=405 if url == self.no_head.url else 200)
+
+    def test_run_probes_services_concurrently(self):
+        with patch.object(self.prober.session, "head", side_effect=self.head), patch.object(
+            self.prober.session, "get", return_value=MagicMock(status_code=200)
+        ) as get:
+            started = time.monotonic()
+            summary = self.prober.run(Service.objects.all())
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(summary["total"], 3)
+        get.assert_called_once_with(self.no_head.url, timeout=1, stream=True)
+        self.assertTrue(self.online.log_service.get().status)
+        self.assertTrue(self.no_head.log_service.get().status)
+        self.assertFalse(self.offline.log_service.get().status)
+        self.assertGreaterEqual(self.online.log_service.get().latency, 200)
+        self.assertFalse(self.maintenance.log_service.exists())
+        self.assertEqual(ServiceHealth.objects.get(service=self.online).status, ServiceHealth.STATUS_ONLINE)
+        self.assertEqual(ServiceHealth.objects.get(service=self.no_head).status, ServiceHealth.STATUS_ONLINE)
+        self.assertEqual(ServiceHealth.objects.get(service=self.offline).status, ServiceHealth.STATUS_OFFLINE)
+        self.assertFalse(ServiceHealth.objects.filter(service=self.maintenance).exists())
+
+
+class HTTPSessionTestCase(TestCase):
+    def test_sessions_are_shared_per_name_and_process(self):
+        self.assertIs(get_session("flows"), get_session("flows"))
+        self.assertIsNot(get_session("flows"), get_session("chats"))
+
+        session = get_session("flows")
+        with patch("connect.common.http.os.getpid", return_value=-1):
+            self.assertIsNot(get_session("flows"), session)
+
+    def test_adapter_retries_idempotent_requests_with_default_timeout(self):
+        session = build_session(pool_size=4, retries=2, backoff_factor=0.1, timeout=5)
+        adapter = session.get_adapter("https://flows.weni.ai")
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+
+        response = requests.Response()
+        response.status_code = 200
+        with patch("requests.adapters.HTTPAdapter.send", return_value=response) as send:
+            session.get("https://flows.weni.ai")
+            session.get("https://flows.weni.ai", timeout=1)
+        self.assertEqual(send.call_args_list[0][1]["timeout"], 5)
+        self.assertEqual(send.call_args_list[1][1]["timeout"], 1)
+
+    def test_shared_sessions_do_not_keep_cookies(self):
+        session = get_session("rocket")
+        headers = HTTPMessage()
+        headers["Set-Cookie"] = "rc_token=secret; Path=/"
+        request = requests.Request("POST", "https://rocket.weni.ai/api/v1/login").prepare()
+
+        session.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+
+        self.assertEqual(len(session.cookies), 0)
+
+
+class ChannelManagerTestCase(TestCase):
+    def setUp(self):
+        self.manager = ChannelManager()
+        self.factory = MagicMock(side_effect=lambda: MagicMock())
+
+    def test_channels_are_lazy_and_shared(self):
+        self.assertEqual(self.factory.call_count, 0)
+        channel = self.manager.get_channel("flow", self.factory)
+        self.assertIs(self.manager.get_channel("flow", self.factory), channel)
+        self.assertEqual(self.factory.call_count, 1)
+        self.assertEqual(self.manager.connectivity(), {"flow": "IDLE"})
+
+        state_callback = channel.subscribe.call_args[0][0]
+        state_callback(grpc.ChannelConnectivity.TRANSIENT_FAILURE)
+        self.assertEqual(self.manager.connectivity(), {"flow": "TRANSIENT_FAILURE"})
+
+    def test_forked_process_opens_its_own_channel(self):
+        channel = self.manager.get_channel("flow", self.factory)
+        with patch("connect.grpc.channels.os.getpid", return_value=-1):
+            self.assertIsNot(self.manager.get_channel("flow", self.factory), channel)
+        channel.close.assert_not_called()
+
+    def test_stubs_are_cached_and_wrapped_in_policies(self):
+        stub_class = MagicMock()
+        stub = self.manager.get_stub("flow", stub_class, self.factory)
+        self.assertIs(self.manager.get_stub("flow", stub_class, self.factory), stub)
+        self.assertIsInstance(stub, PolicyStub)
+        stub_class.assert_called_once_with(self.manager.get_channel("flow", self.factory))
+
+        stub.Retrieve("request")
+        stub.Retrieve("request", timeout=1)
+        self.assertEqual(stub_class.return_value.Retrieve.call_args_list[0][1], {"timeout": settings.GRPC_DEFAULT_TIMEOUT})
+        self.assertEqual(stub_class.return_value.Retrieve.call_args_list[1][1], {"timeout": 1})
+
+
+class FakeRpcError(grpc.RpcError):
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+class OrgControllerStub:
+    def __init__(self):
+        self.Retrieve = MagicMock(spec=grpc.UnaryUnaryMultiCallable)
+        self.List = MagicMock(spec=grpc.UnaryStreamMultiCallable)
+
+
+class PolicyStubTestCase(TestCase):
+    def setUp(self):
+        self.stub = OrgControllerStub()
+
+    def policy_stub(self, policy):
+        return PolicyStub(self.stub, {"OrgController.Retrieve": policy, "OrgController.List": policy})
+
+    def test_retries_retryable_codes_within_the_deadline(self):
+        self.stub.Retrieve.side_effect = [FakeRpcError(grpc.StatusCode.UNAVAILABLE), "response"]
+        stub = self.policy_stub(
+            RpcPolicy(timeout=5, retry_codes=RETRYABLE_CODES, max_attempts=3, initial_backoff=0.01)
+        )
+
+        self.assertEqual(stub.Retrieve("request"), "response")
+        self.assertEqual(self.stub.Retrieve.call_count, 2)
+        self.assertLessEqual(self.stub.Retrieve.call_args[1]["timeout"], 5)
+
+    def test_other_codes_and_exhausted_attempts_are_raised(self):
+        stub = self.policy_stub(RpcPolicy(retry_codes=RETRYABLE_CODES, max_attempts=2, initial_backoff=0.01))
+
+        self.stub.Retrieve.side_effect = FakeRpcError(grpc.StatusCode.NOT_FOUND)
+        with self.assertRaises(grpc.RpcError):
+            stub.Retrieve("request")
+        self.assertEqual(self.stub.Retrieve.call_count, 1)
+
+        self.stub.Retrieve.reset_mock()
+        self.stub.Retrieve.side_effect = FakeRpcError(grpc.StatusCode.UNAVAILABLE)
+        with self.assertRaises(grpc.RpcError):
+            stub.Retrieve("request")
+        self.assertEqual(self.stub.Retrieve.call_count, 2)
+
+    def test_hedged_call_returns_the_first_answer(self):
+        slow, fast = Future(), Future()
+        self.stub.Retrieve.future.side_effect = [slow, fast]
+        fast.set_result("hedged response")
+        stub = self.policy_stub(
+            RpcPolicy(timeout=5, retry_codes=RETRYABLE_CODES, max_attempts=2, hedging_delay=0.05)
+        )
+
+        self.assertEqual(stub.Retrieve("request"), "hedged response")
+        self.assertEqual(self.stub.Retrieve.future.call_count, 2)
+        self.assertTrue(slow.cancelled())
+
+    def test_streams_only_get_the_deadline(self):
+        self.stub.List.side_effect = FakeRpcError(grpc.StatusCode.UNAVAILABLE)
+        stub = self.policy_stub(RpcPolicy(timeout=3, retry_codes=RETRYABLE_CODES, max_attempts=3))
+
+        with self.assertRaises(grpc.RpcError):
+            stub.List("request")
+        self.stub.List.assert_called_once_with("request", timeout=3)
+
+
+class FlowTypeBulkTestCase(TestCase):
+    def test_bulk_reads_skip_failed_projects(self):
+        def get_project_statistic(project_uuid):
+            if project_uuid == "failing":
+                raise FakeRpcError(grpc.StatusCode.UNAVAILABLE)
+            return {"active_flows": 1, "active_classifiers": 0, "active_contacts": len(project_uuid)}
+
+        flow_type = FlowType()
+        with patch.object(flow_type, "get_project_statistic", side_effect=get_project_statistic), self.settings(
+            FLOW_BULK_CHUNK_SIZE=2
+        ):
+            result = flow_type.get_project_statistics_bulk(["a", "bb", "failing", "cccc"])
+
+        self.assertEqual({uuid: stats["active_contacts"] for uuid, stats in result.items()}, {"a": 1, "bb": 2, "cccc": 4})
+
+    def test_billing_totals_use_each_project_period(self):
+        flow_type = FlowType()
+        with patch.object(flow_type, "get_billing_total_statistics", return_value={"active_contacts": 3}) as total:
+            result = flow_type.get_billing_total_statistics_bulk({"project": ("2022-10-18 10:00", "2022-10-01 00:00")})
+
+        total.assert_called_once_with(project_uuid="project", before="2022-10-18 10:00", after="2022-10-01 00:00")
+        self.assertEqual(result, {"project": {"active_contacts": 3}})
+
+
+class AuthorizationResolverTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="resolver@user.com", username="resolver")
+        self.organizations = [
+            Organization.objects.create(
+                name=f"organization {i}",
+                description="",
+                inteligence_organization=i,
+                organization_billing__cycle=BillingPlan.BILLING_CYCLE_MONTHLY,
+                organization_billing__plan=BillingPlan.PLAN_FREE,
+            )
+            for i in range(3)
+        ]
+        self.organizations[0].authorizations.create(user=self.user, role=OrganizationRole.ADMIN.value)
+        self.organizations[1].authorizations.create(user=self.user, role=OrganizationRole.VIEWER.value)
+        self.project = self.organizations[0].project.create(
+            name="project", timezone="America/Sao_Paulo", flow_organization=uuid4.uuid4()
+        )
+
+    def test_reads_organization_authorizations_once(self):
+        resolver = AuthorizationResolver(self.user)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(resolver.organization(self.organizations[0]).is_admin)
+            self.assertTrue(resolver.organization(self.organizations[1]).can_read)
+            self.assertFalse(resolver.organization(self.organizations[1]).can_write)
+
+    def test_missing_authorization_is_not_created(self):
+        authorization = AuthorizationResolver(self.user).organization(self.organizations[2])
+
+        self.assertFalse(authorization.can_read)
+        self.assertFalse(OrganizationAuthorization.objects.filter(organization=self.organizations[2]).exists())
+
+    def test_project_authorization(self):
+        resolver = AuthorizationResolver(self.user)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(resolver.project(self.project).is_moderator)
+            self.assertTrue(resolver.project(self.project).can_read)
+
+    def test_shared_by_the_request(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+
+        resolver = AuthorizationResolver.for_request(request)
+
+        self.assertIs(AuthorizationResolver.for_request(request), resolver)
+        with self.assertNumQueries(1):
+            resolver.get_organization(self.organizations[0].uuid)
+            resolver.get_organization(str(self.organizations[0].uuid))
+
+    @override_settings(AUTHORIZATION_CACHE_TIMEOUT=60)
+    def test_cached_until_saved(self):
+        AuthorizationResolver(self.user).organization(self.organizations[0])
+
+        with self.assertNumQueries(0):
+            self.assertTrue(AuthorizationResolver(self.user).organization(self.organizations[0]).is_admin)
+
+        authorization = self.organizations[0].authorizations.get(user=self.user)
+        authorization.role = OrganizationRole.VIEWER.value
+        authorization.save(update_fields=["role"])
+
+        self.assertFalse(AuthorizationResolver(self.user).organization(self.organizations[0]).is_admin)
+
+
+class InlineTasksTestCase(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="inline organization",
+            description="",
+            inteligence_organization=1,
+            organization_billing__cycle=BillingPlan.BILLING_CYCLE_MONTHLY,
+            organization_billing__plan=BillingPlan.PLAN_FREE,
+        )
+        self.projects = [
+            self.organization.project.create(
+                name=f"project {i}", timezone="America/Sao_Paulo", flow_organization=uuid4.uuid4()
+            )
+            for i in range(3)
+        ]
+
+    def test_list_channels_reads_projects_once(self):
+        from connect.common.tasks import list_channels
+
+        channels = [
+            MagicMock(uuid=uuid4.uuid4(), org=str(project.flow_organization), config="{}", address="", is_active=True)
+            for project in self.projects
+        ] + [MagicMock(org=str(uuid4.uuid4()))]
+        flow_instance = MagicMock()
+        flow_instance.list_channel.return_value = channels
+
+        with patch("connect.common.tasks.utils.get_grpc_types") as get_grpc_types:
+            get_grpc_types.return_value = {"flow": flow_instance}
+            with self.assertNumQueries(1):
+                result = list_channels("WA")
+
+        self.assertEqual(
+            [channel["project_uuid"] for channel in result],
+            [str(project.uuid) for project in self.projects],
+        )
+
+    @patch("connect.common.tasks.IntelligenceRESTClient")
+    def test_migrate_organization_reads_roles_concurrently(self, ai_client):
+        from connect.common.tasks import migrate_organization
+
+        user = User.objects.create(email="migrate@user.com", username="migrate")
+        ai_client.return_value.list_organizations.return_value = [
+            {"id": 1, "name": "inline organization"},
+            {"id": 2, "name": "new organization"},
+        ]
+        ai_client.return_value.get_user_organization_permission_role.return_value = OrganizationRole.ADMIN.value
+
+        migrate_organization(user.email)
+
+        self.assertEqual(
+            set(user.authorizations_user.values_list("organization__inteligence_organization", "role")),
+            {(1, OrganizationRole.ADMIN.value), (2, OrganizationRole.ADMIN.value)},
+        )
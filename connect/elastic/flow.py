@@ -5,6 +5,9 @@ from connect.utils import es_convert_datetime
 from django.conf import settings
 
 
+CONTACT_FIELDS = ["uuid", "name", "last_seen_on"]
+
+
 class ElasticFlow(ElasticHandler):
     base_url = settings.FLOWS_ELASTIC_URL
     client = Elasticsearch(f"{base_url}")
@@ -28,6 +31,61 @@ class ElasticFlow(ElasticHandler):
         response = contacts.scan()
         return response
 
+    def contacts_query(self, flow_id, before, after) -> dict:
+        return {
+            "bool": {
+                "must": [
+                    {"match": {"org_id": f"{flow_id}"}},
+                    {"match": {"is_active": "true"}},
+                    {"range": {"last_seen_on": {"gte": str(after), "lte": str(before)}}},
+                ]
+            }
+        }
+
+    def contact_slices(self, flow_id: int, before: str, after: str) -> int:
+        """
+        Number of slices to scroll the active contacts of `flow_id` with: one
+        per SCROLL_SLICE_SIZE contacts, up to SCROLL_MAX_SLICES.
+        """
+        before, after = es_convert_datetime(before, after)
+        total = self.client.count(index="contacts", body={"query": self.contacts_query(flow_id, before, after)})
+        slices = -(-total["count"] // settings.SCROLL_SLICE_SIZE)
+        return max(1, min(slices, settings.SCROLL_MAX_SLICES))
+
+    def scroll_contacts(
+        self,
+        flow_id: int,
+        before: str,
+        after: str,
+        fields: list = CONTACT_FIELDS,
+        slice_id: int = None,
+        slices: int = None,
+    ):
+        """
+        Yields the pages of active contacts of `flow_id` seen between `after`
+        and `before`, with only `fields` in each `_source`. With `slices`
+        above 1 only the `slice_id` slice is scrolled, so the slices can be
+        read in parallel. The scroll is cleared once the pages are consumed
+        or the caller stops early.
+        """
+        before, after = es_convert_datetime(before, after)
+        body = {"query": self.contacts_query(flow_id, before, after), "_source": fields, "sort": ["_doc"]}
+        if slices and slices > 1:
+            body["slice"] = {"id": slice_id, "max": slices}
+
+        page = self.client.search(
+            index="contacts", body=body, scroll=settings.SCROLL_KEEP_ALIVE, size=settings.SCROLL_SIZE
+        )
+        scroll_id = page.get("_scroll_id")
+        try:
+            while page["hits"]["hits"]:
+                yield page["hits"]["hits"]
+                page = self.client.scroll(scroll_id=scroll_id, scroll=settings.SCROLL_KEEP_ALIVE)
+                scroll_id = page.get("_scroll_id", scroll_id)
+        finally:
+            if scroll_id:
+                self.clear_scroll(scroll_id)
+
     def get_paginated_contacts(self, flow_id: int, before: str, after: str, scroll_id: str = None):
         before, after = es_convert_datetime(before, after)
 
@@ -35,32 +93,7 @@ class ElasticFlow(ElasticHandler):
             page = self.client.scroll(scroll_id=scroll_id, scroll='1m')
             return page['hits']['hits']
 
-        query = {
-            "query": {
-                "bool": {
-                    "must": [
-                        {
-                            "match": {
-                                "org_id": f"{flow_id}"
-                            },
-                        },
-                        {
-                            "match": {
-                                "is_active": "true",
-                            }
-                        },
-                        {
-                            "range": {
-                                "last_seen_on": {
-                                    "gte": str(after),
-                                    "lte": str(before)
-                                }
-                            }
-                        }
-                    ]
-                }
-            }
-        }
+        query = {"query": self.contacts_query(flow_id, before, after)}
 
         page = self.client.search(index="contacts", body=query, scroll=settings.SCROLL_KEEP_ALIVE, size=settings.SCROLL_SIZE)
         scroll_id = page["_scroll_id"]
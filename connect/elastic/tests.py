@@ -2,11 +2,12 @@ import pytz
 import pendulum
 import uuid as uuid4
 from unittest import skipIf
+from unittest.mock import patch
 from django.test import TestCase
 from django.conf import settings
 from datetime import datetime
 from connect.common.models import Organization, BillingPlan
-from connect.elastic.flow import ElasticFlow
+from connect.elastic.flow import CONTACT_FIELDS, ElasticFlow
 
 
 @skipIf(not settings.FLOWS_ELASTIC_URL, "Elastic search not configured")
@@ -41,3 +42,34 @@ class ElasticSearchTestCase(TestCase):
         self.assertTrue(hit.is_active)
         self.assertLess(last_seen_on, before)
         self.assertGreaterEqual(last_seen_on, after)
+
+
+class ScrollContactsTestCase(TestCase):
+    @patch.object(ElasticFlow, "client")
+    def test_scroll_pages(self, client):
+        hits = [{"_source": {"uuid": str(uuid4.uuid4()), "name": "contact", "last_seen_on": "2022-04-08T10:00:00Z"}}]
+        client.search.return_value = {"_scroll_id": "scroll", "hits": {"hits": hits}}
+        client.scroll.return_value = {"_scroll_id": "scroll", "hits": {"hits": []}}
+
+        pages = list(ElasticFlow().scroll_contacts(11, "2022-04-08T23:59:59Z", "2022-04-08T00:00:00Z"))
+
+        self.assertEquals(pages, [hits])
+        self.assertEquals(client.search.call_args[1]["body"]["_source"], CONTACT_FIELDS)
+        client.clear_scroll.assert_called_once_with(scroll_id="scroll")
+
+    @patch.object(ElasticFlow, "client")
+    def test_scroll_slice(self, client):
+        client.search.return_value = {"_scroll_id": "scroll", "hits": {"hits": []}}
+
+        list(ElasticFlow().scroll_contacts(11, "2022-04-08T23:59:59Z", "2022-04-08T00:00:00Z", slice_id=1, slices=4))
+
+        self.assertEquals(client.search.call_args[1]["body"]["slice"], {"id": 1, "max": 4})
+
+    @patch.object(ElasticFlow, "client")
+    def test_contact_slices(self, client):
+        for count, slices in [(0, 1), (settings.SCROLL_SLICE_SIZE + 1, 2), (10 ** 9, settings.SCROLL_MAX_SLICES)]:
+            client.count.return_value = {"count": count}
+            self.assertEquals(
+                ElasticFlow().contact_slices(11, "2022-04-08T23:59:59Z", "2022-04-08T00:00:00Z"),
+                min(slices, settings.SCROLL_MAX_SLICES),
+            )
@@ -0,0 +1,95 @@
+import logging
+import os
+import threading
+
+import grpc
+from django.conf import settings
+
+from connect.grpc.policies import PolicyStub
+
+logger = logging.getLogger(__name__)
+
+
+def build_channel(endpoint: str, certificate: str = None) -> grpc.Channel:
+    """
+    Opens a channel to `endpoint` with keepalive pings while calls are in
+    flight, so connections silently dropped by the network are detected
+    instead of hanging calls. Idle channels are not pinged, which servers
+    with the default ping policy would answer with GOAWAY too_many_pings.
+    """
+    options = [
+        ("grpc.keepalive_time_ms", settings.GRPC_KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", settings.GRPC_KEEPALIVE_TIMEOUT_MS),
+    ]
+    if certificate:
+        with open(certificate, "rb") as f:
+            credentials = grpc.ssl_channel_credentials(f.read())
+        return grpc.secure_channel(endpoint, credentials, options=options)
+    return grpc.insecure_channel(endpoint, options=options)
+
+
+class ChannelManager:
+    """
+    Process-wide registry of the gRPC channels and stubs of each service.
+
+    Channels are opened on first use and belong to the process that opened
+    them: a forked Celery or gunicorn worker opens its own channels instead
+    of reusing the parent's. Stubs are built once per channel and wrapped in
+    the RPC policies of their type (see PolicyStub), and the connectivity
+    state reported by each channel is kept for `connectivity`.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pid = None
+        self.channels = {}
+        self.stubs = {}
+        self.states = {}
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.channels = {}
+        self.stubs = {}
+        self.states = {}
+
+    def get_channel(self, name: str, factory) -> grpc.Channel:
+        if self.pid != os.getpid() or name not in self.channels:
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.reset()
+                if name not in self.channels:
+                    channel = factory()
+                    self.states[name] = None
+                    channel.subscribe(lambda state: self.on_state(name, state), try_to_connect=False)
+                    self.channels[name] = channel
+        return self.channels[name]
+
+    def get_stub(self, name: str, stub_class, factory, policies: dict = None):
+        channel = self.get_channel(name, factory)
+        key = (name, stub_class)
+        stub = self.stubs.get(key)
+        if stub is None:
+            stub = self.stubs[key] = PolicyStub(stub_class(channel), policies)
+        return stub
+
+    def on_state(self, name: str, state: grpc.ChannelConnectivity):
+        if self.states.get(name) != state:
+            logger.info(f"[grpc] {name} channel is {state.name}")
+        self.states[name] = state
+
+    def connectivity(self) -> dict:
+        return {
+            name: state.name if state is not None else "IDLE"
+            for name, state in self.states.items()
+            if self.pid == os.getpid()
+        }
+
+    def close(self):
+        with self.lock:
+            if self.pid == os.getpid():
+                for channel in self.channels.values():
+                    channel.close()
+            self.reset()
+
+
+channel_manager = ChannelManager()
@@ -2,6 +2,8 @@ import logging
 from abc import ABCMeta
 from typing import Any
 
+from connect.grpc.channels import channel_manager
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,9 +13,23 @@ class GRPCType(metaclass=ABCMeta):
     a way to connect to connect with your service to return information remotely
     """
 
+    # "<Service>.<Method>": RpcPolicy, RPCs without one only get the default deadline
+    rpc_policies = {}
+
     def get_channel(self):
+        """
+        Opens a new channel to the service; callers use `channel` and
+        `get_stub`, which share one lazily opened channel per process.
+        """
         raise NotImplementedError()
 
+    @property
+    def channel(self):
+        return channel_manager.get_channel(self.slug, self.get_channel)
+
+    def get_stub(self, stub_class):
+        return channel_manager.get_stub(self.slug, stub_class, self.get_channel, self.rpc_policies)
+
     def list_organizations(self, user_email: str):
         raise NotImplementedError()
 
@@ -91,6 +107,9 @@ class GRPCType(metaclass=ABCMeta):
     def get_project_statistic(self, project_uuid: str):
         raise NotImplementedError()
 
+    def get_project_statistics_bulk(self, project_uuids: list):
+        raise NotImplementedError()
+
     def get_organization_statistic(self, organization_id: int):
         raise NotImplementedError()
 
@@ -100,6 +119,9 @@ class GRPCType(metaclass=ABCMeta):
     def get_billing_total_statistics(self, project_uuid: str, before: str, after: str):
         raise NotImplementedError()
 
+    def get_billing_total_statistics_bulk(self, periods: dict):
+        raise NotImplementedError()
+
     def suspend_or_unsuspend_project(self, project_uuid: str, is_suspended: bool):
         raise NotImplementedError()
 
@@ -0,0 +1,137 @@
+import logging
+import queue
+import random
+import time
+
+import grpc
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+RETRYABLE_CODES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+
+
+class RpcPolicy:
+    """
+    Declarative deadline and retry policy of an RPC.
+
+    `timeout` is the overall deadline in seconds, shared by every attempt.
+    Failures with a status in `retry_codes` are retried up to `max_attempts`
+    attempts, sleeping a full-jitter exponential backoff between them.
+    With `hedging_delay` set, a new attempt is sent whenever the previous
+    ones did not answer within the delay and the first answer wins; only use
+    it for idempotent reads.
+    """
+
+    def __init__(
+        self,
+        timeout: float = None,
+        retry_codes: tuple = (),
+        max_attempts: int = 1,
+        initial_backoff: float = 0.1,
+        max_backoff: float = 2.0,
+        backoff_multiplier: float = 2.0,
+        hedging_delay: float = None,
+    ):
+        self.timeout = timeout
+        self.retry_codes = retry_codes
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff_multiplier = backoff_multiplier
+        self.hedging_delay = hedging_delay
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self.max_backoff, self.initial_backoff * self.backoff_multiplier ** attempt)
+        )
+
+
+DEFAULT_POLICY = RpcPolicy()
+
+
+class PolicyStub:
+    """
+    Wraps a generated stub so every call goes through the policy of its RPC,
+    looked up as "<Service>.<Method>" in `policies` (e.g.
+    "OrgController.Retrieve"). A `timeout` passed by the caller replaces the
+    policy deadline. Streaming RPCs only get the deadline, as their failures
+    surface while iterating the response.
+    """
+
+    def __init__(self, stub, policies: dict = None):
+        self.stub = stub
+        self.service = type(stub).__name__[: -len("Stub")]
+        self.policies = policies or {}
+
+    def get_policy(self, name: str) -> RpcPolicy:
+        return self.policies.get(f"{self.service}.{name}", DEFAULT_POLICY)
+
+    def __getattr__(self, name):
+        method = getattr(self.stub, name)
+        policy = self.get_policy(name)
+
+        def call(request, timeout: float = None, **kwargs):
+            timeout = timeout or policy.timeout or settings.GRPC_DEFAULT_TIMEOUT
+            if not isinstance(method, grpc.UnaryUnaryMultiCallable):
+                return method(request, timeout=timeout, **kwargs)
+            deadline = time.monotonic() + timeout
+            if policy.hedging_delay is not None:
+                return self.hedge(method, policy, request, deadline, kwargs)
+            return self.retry(method, policy, request, deadline, kwargs)
+
+        return call
+
+    def retry(self, method, policy: RpcPolicy, request, deadline: float, kwargs: dict):
+        attempt = 0
+        while True:
+            try:
+                return method(request, timeout=max(deadline - time.monotonic(), 0), **kwargs)
+            except grpc.RpcError as error:
+                attempt += 1
+                if error.code() not in policy.retry_codes or attempt >= policy.max_attempts:
+                    raise
+                pause = policy.backoff(attempt - 1)
+                if time.monotonic() + pause >= deadline:
+                    raise
+                logger.info(f"[grpc] {self.service} retrying after {error.code()}, attempt {attempt + 1}")
+                time.sleep(pause)
+
+    def hedge(self, method, policy: RpcPolicy, request, deadline: float, kwargs: dict):
+        finished = queue.Queue()
+        calls = []
+
+        def start():
+            call = method.future(request, timeout=max(deadline - time.monotonic(), 0), **kwargs)
+            call.add_done_callback(finished.put)
+            calls.append(call)
+
+        start()
+        pending = 1
+        try:
+            while True:
+                can_hedge = len(calls) < policy.max_attempts
+                try:
+                    # every attempt has the deadline, so a blocking get always returns
+                    call = finished.get(timeout=policy.hedging_delay if can_hedge else None)
+                except queue.Empty:
+                    if time.monotonic() < deadline:
+                        start()
+                        pending += 1
+                    continue
+
+                pending -= 1
+                error = call.exception()
+                if error is None:
+                    return call.result()
+                if error.code() not in policy.retry_codes:
+                    raise error
+                if pending == 0:
+                    if len(calls) >= policy.max_attempts or time.monotonic() >= deadline:
+                        raise error
+                    start()
+                    pending += 1
+        finally:
+            for call in calls:
+                call.cancel()
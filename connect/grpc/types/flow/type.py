@@ -1,7 +1,10 @@
 import grpc
 from django.conf import settings
 
+from connect.common.fanout import FanOutExecutor
+from connect.grpc.channels import build_channel
 from connect.grpc.grpc import GRPCType
+from connect.grpc.policies import RETRYABLE_CODES, RpcPolicy
 from weni.protobuf.flows import billing_pb2_grpc, billing_pb2
 from weni.protobuf.flows import channel_pb2_grpc, channel_pb2
 from weni.protobuf.flows import flow_pb2_grpc, flow_pb2
@@ -15,15 +18,23 @@ class FlowType(GRPCType):
     slug = "flow"
     permissions = {1: "viewer", 2: "editor", 3: "administrator", 4: "administrator"}
 
-    def __init__(self):
-        self.channel = self.get_channel()
+    # Idempotent reads are retried, the project info and statistics read by
+    # the sync tasks are also hedged. Writes and streams get the default deadline.
+    read_policy = RpcPolicy(timeout=20, retry_codes=RETRYABLE_CODES, max_attempts=3)
+    hedged_read_policy = RpcPolicy(
+        timeout=10, retry_codes=RETRYABLE_CODES, max_attempts=3, hedging_delay=1.5
+    )
+    rpc_policies = {
+        "OrgController.Retrieve": hedged_read_policy,
+        "OrgStatisticController.Retrieve": hedged_read_policy,
+        "ClassifierController.Retrieve": read_policy,
+        "BillingController.Total": read_policy,
+        "BillingController.Detailed": read_policy,
+        "BillingController.MessageDetail": read_policy,
+    }
 
     def get_channel(self):
-        if settings.FLOW_CERTIFICATE_GRPC_CRT:
-            with open(settings.FLOW_CERTIFICATE_GRPC_CRT, "rb") as f:
-                credentials = grpc.ssl_channel_credentials(f.read())
-            return grpc.secure_channel(settings.FLOW_GRPC_ENDPOINT, credentials)
-        return grpc.insecure_channel(settings.FLOW_GRPC_ENDPOINT)
+        return build_channel(settings.FLOW_GRPC_ENDPOINT, settings.FLOW_CERTIFICATE_GRPC_CRT)
 
     def create_project(
         self,
@@ -32,7 +43,7 @@ class FlowType(GRPCType):
         project_timezone: str,
     ):
         # Create Organization
-        stub = org_pb2_grpc.OrgControllerStub(self.channel)
+        stub = self.get_stub(org_pb2_grpc.OrgControllerStub)
         response = stub.Create(
             org_pb2.OrgCreateRequest(
                 name=project_name,
@@ -43,14 +54,14 @@ class FlowType(GRPCType):
         return response
 
     def update_project(self, organization_uuid: int, organization_name: str):
-        stub = org_pb2_grpc.OrgControllerStub(self.channel)
+        stub = self.get_stub(org_pb2_grpc.OrgControllerStub)
         response = stub.Update(
             org_pb2.OrgUpdateRequest(uuid=organization_uuid, name=organization_name)
         )
         return response
 
     def delete_project(self, project_uuid: int, user_email: str):
-        stub = org_pb2_grpc.OrgControllerStub(self.channel)
+        stub = self.get_stub(org_pb2_grpc.OrgControllerStub)
         stub.Destroy(
             org_pb2.OrgDestroyRequest(uuid=project_uuid, user_email=user_email)
         )
@@ -60,7 +71,7 @@ class FlowType(GRPCType):
     ):
         permissions = {1: "viewer", 2: "editor", 3: "administrator", 4: "administrator"}
 
-        stub = user_pb2_grpc.UserPermissionControllerStub(self.channel)
+        stub = self.get_stub(user_pb2_grpc.UserPermissionControllerStub)
         response = stub.Update(
             user_pb2.UserPermissionUpdateRequest(
                 org_uuid=organization_uuid,
@@ -73,7 +84,7 @@ class FlowType(GRPCType):
     def get_classifiers(self, project_uuid: str, classifier_type: str, is_active: bool):
         result = []
         try:
-            stub = classifier_pb2_grpc.ClassifierControllerStub(self.channel)
+            stub = self.get_stub(classifier_pb2_grpc.ClassifierControllerStub)
             for classifier in stub.List(
                 classifier_pb2.ClassifierListRequest(
                     org_uuid=project_uuid,
@@ -104,7 +115,7 @@ class FlowType(GRPCType):
         access_token: str,
     ):
         # Create Classifier
-        stub = classifier_pb2_grpc.ClassifierControllerStub(self.channel)
+        stub = self.get_stub(classifier_pb2_grpc.ClassifierControllerStub)
         response = stub.Create(
             classifier_pb2.ClassifierCreateRequest(
                 org=project_uuid,
@@ -117,11 +128,11 @@ class FlowType(GRPCType):
         return response
 
     def delete_classifier(self, classifier_uuid: str, user_email: str):
-        stub = classifier_pb2_grpc.ClassifierControllerStub(self.channel)
+        stub = self.get_stub(classifier_pb2_grpc.ClassifierControllerStub)
         stub.Destroy(classifier_pb2.ClassifierDestroyRequest(uuid=classifier_uuid, user_email=user_email))
 
     def get_classifier(self, classifier_uuid: str):
-        stub = classifier_pb2_grpc.ClassifierControllerStub(self.channel)
+        stub = self.get_stub(classifier_pb2_grpc.ClassifierControllerStub)
         response = stub.Retrieve(
             classifier_pb2.ClassifierRetrieveRequest(uuid=classifier_uuid)
         )
@@ -134,7 +145,7 @@ class FlowType(GRPCType):
         }
 
     def update_language(self, user_email: str, language: str):
-        stub = user_pb2_grpc.UserControllerStub(self.channel)
+        stub = self.get_stub(user_pb2_grpc.UserControllerStub)
         response = stub.Update(
             user_pb2.UpdateUserLang(email=user_email, language=language)
         )
@@ -143,7 +154,7 @@ class FlowType(GRPCType):
     def get_project_flows(self, project_uuid: str, flow_name: str):
         result = []
         try:
-            stub = flow_pb2_grpc.FlowControllerStub(self.channel)
+            stub = self.get_stub(flow_pb2_grpc.FlowControllerStub)
             for flow in stub.List(
                 flow_pb2.FlowListRequest(flow_name=flow_name, org_uuid=project_uuid)
             ):
@@ -161,7 +172,7 @@ class FlowType(GRPCType):
     def get_project_info(self, project_uuid: str):
         result = []
         try:
-            stub = org_pb2_grpc.OrgControllerStub(self.channel)
+            stub = self.get_stub(org_pb2_grpc.OrgControllerStub)
             response = stub.Retrieve(org_pb2.OrgRetrieveRequest(uuid=project_uuid))
             return {
                 "id": response.id,
@@ -178,7 +189,7 @@ class FlowType(GRPCType):
     def get_project_statistic(self, project_uuid: str):
         result = []
         try:
-            stub = statistic_pb2_grpc.OrgStatisticControllerStub(self.channel)
+            stub = self.get_stub(statistic_pb2_grpc.OrgStatisticControllerStub)
             response = stub.Retrieve(
                 statistic_pb2.OrgStatisticRetrieveRequest(org_uuid=project_uuid)
             )
@@ -192,8 +203,45 @@ class FlowType(GRPCType):
                 raise e
         return result
 
+    def run_bulk(self, name: str, method, calls: dict) -> dict:
+        """
+        Flows has no bulk RPC for these reads: runs `method(**kwargs)` for
+        every key of `calls` concurrently over the shared channel, in chunks
+        of FLOW_BULK_CHUNK_SIZE, and maps each key to its result. Keys whose
+        call failed are left out.
+        """
+        keys = list(calls.keys())
+        results = {}
+        for start in range(0, len(keys), settings.FLOW_BULK_CHUNK_SIZE):
+            result = FanOutExecutor(name).run(
+                keys[start:start + settings.FLOW_BULK_CHUNK_SIZE],
+                lambda key: method(**calls[key]),
+            )
+            results.update(result.succeeded)
+        return results
+
+    def get_project_statistics_bulk(self, project_uuids: list) -> dict:
+        return self.run_bulk(
+            "get_project_statistics_bulk",
+            self.get_project_statistic,
+            {project_uuid: dict(project_uuid=project_uuid) for project_uuid in project_uuids},
+        )
+
+    def get_billing_total_statistics_bulk(self, periods: dict) -> dict:
+        """
+        `periods` maps each project uuid to its (before, after) range.
+        """
+        return self.run_bulk(
+            "get_billing_total_statistics_bulk",
+            self.get_billing_total_statistics,
+            {
+                project_uuid: dict(project_uuid=project_uuid, before=before, after=after)
+                for project_uuid, (before, after) in periods.items()
+            },
+        )
+
     def get_billing_total_statistics(self, project_uuid: str, before: str, after: str):
-        stub = billing_pb2_grpc.BillingControllerStub(self.channel)
+        stub = self.get_stub(billing_pb2_grpc.BillingControllerStub)
         response = stub.Total(
             billing_pb2.BillingRequest(
                 org=project_uuid, before=before, after=after
@@ -202,7 +250,7 @@ class FlowType(GRPCType):
         return {"active_contacts": response.active_contacts}
 
     def suspend_or_unsuspend_project(self, project_uuid: str, is_suspended: bool):
-        stub = org_pb2_grpc.OrgControllerStub(self.channel)
+        stub = self.get_stub(org_pb2_grpc.OrgControllerStub)
         response = stub.Update(
             org_pb2.OrgUpdateRequest(
                 uuid=project_uuid,
@@ -215,7 +263,7 @@ class FlowType(GRPCType):
         self, user: str, project_uuid: str, data: str, channeltype_code: str
     ):
         # Create Channel
-        stub = channel_pb2_grpc.ChannelControllerStub(self.channel)
+        stub = self.get_stub(channel_pb2_grpc.ChannelControllerStub)
         response = stub.Create(
             channel_pb2.ChannelCreateRequest(
                 user=user,
@@ -227,7 +275,7 @@ class FlowType(GRPCType):
         return response
 
     def create_wac_channel(self, user: str, flow_organization: str, config: str, phone_number_id: str):
-        stub = channel_pb2_grpc.ChannelControllerStub(self.channel)
+        stub = self.get_stub(channel_pb2_grpc.ChannelControllerStub)
         response = stub.CreateWAC(
             channel_pb2.ChannelWACCreateRequest(
                 user=user,
@@ -239,7 +287,7 @@ class FlowType(GRPCType):
         return response
 
     def release_channel(self, channel_uuid: str, user: str):
-        stub = channel_pb2_grpc.ChannelControllerStub(self.channel)
+        stub = self.get_stub(channel_pb2_grpc.ChannelControllerStub)
         response = stub.Destroy(
             channel_pb2.ChannelDestroyRequest(
                 user=user,
@@ -249,7 +297,7 @@ class FlowType(GRPCType):
         return response
 
     def list_channel(self, is_active: str = "True", channel_type: str = "WA", project_uuid: str = None):
-        stub = channel_pb2_grpc.ChannelControllerStub(self.channel)
+        stub = self.get_stub(channel_pb2_grpc.ChannelControllerStub)
         grpc_response = None
         if project_uuid:
             grpc_response = channel_pb2.ChannelListRequest(
@@ -266,7 +314,7 @@ class FlowType(GRPCType):
         return stub.List(grpc_response)
 
     def get_active_contacts(self, project_uuid, before, after):
-        stub = billing_pb2_grpc.BillingControllerStub(self.channel)
+        stub = self.get_stub(billing_pb2_grpc.BillingControllerStub)
         response = stub.Detailed(
             billing_pb2.BillingRequest(
                 org=project_uuid, before=before, after=after
@@ -275,7 +323,7 @@ class FlowType(GRPCType):
         return response
 
     def delete_user_permission_project(self, project_uuid: str, user_email: str, permission: int):
-        stub = user_pb2_grpc.UserPermissionControllerStub(self.channel)
+        stub = self.get_stub(user_pb2_grpc.UserPermissionControllerStub)
         request = user_pb2.UserPermissionUpdateRequest(
             org_uuid=project_uuid,
             user_email=user_email,
@@ -286,7 +334,7 @@ class FlowType(GRPCType):
         return response
 
     def get_message(self, org_uuid: str, contact_uuid: str, before: str, after: str):
-        stub = billing_pb2_grpc.BillingControllerStub(self.channel)
+        stub = self.get_stub(billing_pb2_grpc.BillingControllerStub)
         request = billing_pb2.MessageDetailRequest(
             org_uuid=org_uuid,
             contact_uuid=contact_uuid,
@@ -7,7 +7,7 @@ from mozilla_django_oidc.contrib.drf import OIDCAuthentication
 from rest_framework import HTTP_HEADER_ENCODING, exceptions
 from rest_framework.authentication import BaseAuthentication, get_authorization_header
 
-from connect.celery import app as celery_app
+from connect.common import tasks
 
 from connect.utils import check_module_permission
 
@@ -60,11 +60,7 @@ class WeniOIDCAuthenticationBackend(OIDCAuthenticationBackend):
         check_module_permission(claims, user)
 
         if settings.SYNC_ORGANIZATION_INTELIGENCE:
-            task = celery_app.send_task(  # pragma: no cover
-                name="migrate_organization",
-                args=[str(user.email)],
-            )
-            task.wait()  # pragma: no cover
+            tasks.migrate_organization(str(user.email))  # pragma: no cover
 
         return user
 
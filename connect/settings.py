@@ -67,6 +67,10 @@ env = environ.Env(
     INTELIGENCE_CERTIFICATE_GRPC_CRT=(str, None),
     FLOW_CERTIFICATE_GRPC_CRT=(str, None),
     INTEGRATIONS_CERTIFICATE_GRPC_CRT=(str, None),
+    GRPC_DEFAULT_TIMEOUT=(float, 30),
+    GRPC_KEEPALIVE_TIME_MS=(int, 300000),
+    GRPC_KEEPALIVE_TIMEOUT_MS=(int, 10000),
+    FLOW_BULK_CHUNK_SIZE=(int, 200),
     CHATS_REST_ENDPOINT=(str, "https://chats-engine.dev.cloud.weni.ai"),
     INTEGRATIONS_REST_ENDPOINT=(str, "https://integrations-engine.dev.cloud.weni.ai"),
     INTELLIGENCE_REST_ENDPOINT=(str, "https://engine-ai.dev.cloud.weni.ai/"),
@@ -84,6 +88,30 @@ env = environ.Env(
     SYNC_CONTACTS_SCHEDULE=(str, "*/1"),
     SCROLL_SIZE=(int, 500),
     SCROLL_KEEP_ALIVE=(str, "1m"),
+    SCROLL_MAX_SLICES=(int, 4),
+    SCROLL_SLICE_SIZE=(int, 50000),
+    SYNC_CONTACTS_WORKERS=(int, 4),
+    SYNC_CONTACTS_TIMEOUT=(float, 1800),
+    FANOUT_MAX_WORKERS=(int, 16),
+    FANOUT_CALL_TIMEOUT=(float, 30),
+    SYNC_BULK_UPDATE_BATCH_SIZE=(int, 500),
+    PROJECT_SYNC_BATCH_SIZE=(int, 1000),
+    PROJECT_SYNC_ACTIVE_DAYS=(int, 7),
+    PROJECT_SYNC_IDLE_FACTOR=(int, 12),
+    PROJECT_SYNC_SUSPENDED_FACTOR=(int, 48),
+    RETENTION_BATCH_SIZE=(int, 5000),
+    RETENTION_PAUSE=(float, 0.1),
+    STATUS_LOG_RETENTION_DAYS=(int, 10),
+    STATUS_LOG_PARTITIONS_AHEAD=(int, 7),
+    SERVICE_PROBE_TIMEOUT=(float, 10),
+    SERVICE_PROBE_MAX_WORKERS=(int, 32),
+    INTERNAL_TOKEN_REFRESH_MARGIN=(float, 30),
+    AUTHORIZATION_CACHE_TIMEOUT=(int, 0),
+    HTTP_POOL_SIZE=(int, 20),
+    HTTP_RETRIES=(int, 3),
+    HTTP_BACKOFF_FACTOR=(float, 0.3),
+    HTTP_TIMEOUT=(float, 30),
+    BILLING_LOG_RETENTION_DAYS=(int, 90),
 )
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
@@ -380,6 +408,49 @@ CELERY_TASK_SERIALIZER = "json"
 
 SYNC_CONTACTS_SCHEDULE = env.str("SYNC_CONTACTS_SCHEDULE")
 
+# Project sync fan-out
+
+FANOUT_MAX_WORKERS = env.int("FANOUT_MAX_WORKERS")
+FANOUT_CALL_TIMEOUT = env.float("FANOUT_CALL_TIMEOUT")
+SYNC_BULK_UPDATE_BATCH_SIZE = env.int("SYNC_BULK_UPDATE_BATCH_SIZE")
+
+# Projects opened in the last PROJECT_SYNC_ACTIVE_DAYS are refreshed on every
+# source cadence; idle projects and suspended organizations wait the cadence
+# multiplied by their factor.
+PROJECT_SYNC_BATCH_SIZE = env.int("PROJECT_SYNC_BATCH_SIZE")
+PROJECT_SYNC_ACTIVE_DAYS = env.int("PROJECT_SYNC_ACTIVE_DAYS")
+PROJECT_SYNC_IDLE_FACTOR = env.int("PROJECT_SYNC_IDLE_FACTOR")
+PROJECT_SYNC_SUSPENDED_FACTOR = env.int("PROJECT_SYNC_SUSPENDED_FACTOR")
+
+# Log retention, purged in windows of RETENTION_BATCH_SIZE rows with a
+# RETENTION_PAUSE seconds pause between windows
+
+RETENTION_BATCH_SIZE = env.int("RETENTION_BATCH_SIZE")
+RETENTION_PAUSE = env.float("RETENTION_PAUSE")
+STATUS_LOG_RETENTION_DAYS = env.int("STATUS_LOG_RETENTION_DAYS")
+STATUS_LOG_PARTITIONS_AHEAD = env.int("STATUS_LOG_PARTITIONS_AHEAD")
+BILLING_LOG_RETENTION_DAYS = env.int("BILLING_LOG_RETENTION_DAYS")
+
+# Service health checks
+
+SERVICE_PROBE_TIMEOUT = env.float("SERVICE_PROBE_TIMEOUT")
+SERVICE_PROBE_MAX_WORKERS = env.int("SERVICE_PROBE_MAX_WORKERS")
+
+# Seconds before expiry when the cached internal client credentials token is refreshed
+INTERNAL_TOKEN_REFRESH_MARGIN = env.float("INTERNAL_TOKEN_REFRESH_MARGIN")
+
+# Seconds the organization and project authorizations of a user are cached
+# across requests (connect.common.authorizations); 0 disables it. Saves and
+# deletes invalidate the cache, so every process must share the CACHES backend.
+AUTHORIZATION_CACHE_TIMEOUT = env.int("AUTHORIZATION_CACHE_TIMEOUT")
+
+# Pooled sessions of the internal REST clients and Rocket (connect.common.http)
+
+HTTP_POOL_SIZE = env.int("HTTP_POOL_SIZE")
+HTTP_RETRIES = env.int("HTTP_RETRIES")
+HTTP_BACKOFF_FACTOR = env.float("HTTP_BACKOFF_FACTOR")
+HTTP_TIMEOUT = env.float("HTTP_TIMEOUT")
+
 # AWS
 
 AWS_ACCESS_KEY_ID = env.str("AWS_ACCESS_KEY_ID")
@@ -433,6 +504,18 @@ INTELIGENCE_CERTIFICATE_GRPC_CRT = env.str("INTELIGENCE_CERTIFICATE_GRPC_CRT")
 FLOW_CERTIFICATE_GRPC_CRT = env.bool("FLOW_CERTIFICATE_GRPC_CRT")
 INTEGRATIONS_CERTIFICATE_GRPC_CRT = env.str("INTEGRATIONS_CERTIFICATE_GRPC_CRT")
 
+# Deadline in seconds of the gRPC calls without an explicit timeout, and
+# keepalive pings of the shared channels (connect.grpc.channels). Servers
+# with the default policy refuse pings more often than every 5 minutes, so
+# lower GRPC_KEEPALIVE_TIME_MS only together with their
+# grpc.http2.min_recv_ping_interval_without_data_ms
+GRPC_DEFAULT_TIMEOUT = env.float("GRPC_DEFAULT_TIMEOUT")
+GRPC_KEEPALIVE_TIME_MS = env.int("GRPC_KEEPALIVE_TIME_MS")
+GRPC_KEEPALIVE_TIMEOUT_MS = env.int("GRPC_KEEPALIVE_TIMEOUT_MS")
+
+# Projects per round of concurrent calls of the FlowType *_bulk reads
+FLOW_BULK_CHUNK_SIZE = env.int("FLOW_BULK_CHUNK_SIZE")
+
 # Flow Marketing Weni
 
 SEND_REQUEST_FLOW = env.bool("SEND_REQUEST_FLOW")
@@ -471,7 +554,14 @@ ROCKET_TEST_MODE = env.bool("ROCKET_TEST_MODE")
 # Elastic Search
 FLOWS_ELASTIC_URL = env.str("FLOWS_ELASTIC_URL")
 
-SCROLL_SIZE = env.str("SCROLL_SIZE")
-SCROLL_KEEP_ALIVE = env.int("SCROLL_KEEP_ALIVE")
+SCROLL_SIZE = env.int("SCROLL_SIZE")
+SCROLL_KEEP_ALIVE = env.str("SCROLL_KEEP_ALIVE")
+# projects with more active contacts than SCROLL_SLICE_SIZE are scrolled in
+# up to SCROLL_MAX_SLICES parallel slices
+SCROLL_MAX_SLICES = env.int("SCROLL_MAX_SLICES")
+SCROLL_SLICE_SIZE = env.int("SCROLL_SLICE_SIZE")
+# projects ingested concurrently by sync_contacts and the seconds each may take
+SYNC_CONTACTS_WORKERS = env.int("SYNC_CONTACTS_WORKERS")
+SYNC_CONTACTS_TIMEOUT = env.float("SYNC_CONTACTS_TIMEOUT")
 
 FLOWS_REST_ENDPOINT = env.str("FLOWS_REST_ENDPOINT")
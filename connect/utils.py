@@ -1,16 +1,17 @@
-import requests
 import pendulum
+from connect.common.http import get_session
 from connect.common.models import Project
-from connect.billing.models import Contact
+from connect.billing.models import ContactActivity
 
 
 def upload_photo_rocket(server_rocket: str, jwt_token: str, avatar_url: str) -> bool:
-    login = requests.post(
+    session = get_session("rocket")
+    login = session.post(
         url="{}/api/v1/login/".format(server_rocket),
         json={"serviceName": "keycloak", "accessToken": jwt_token, "expiresIn": 200},
     ).json()
 
-    set_photo = requests.post(
+    set_photo = session.post(
         url="{}/api/v1/users.setAvatar".format(server_rocket),
         headers={
             "X-Auth-Token": login.get("data", {}).get("authToken"),
@@ -39,12 +40,10 @@ def es_convert_datetime(before: str, after: str):
 
 
 def count_contacts(project: Project, before: str, after: str):
-    # contacts_day_count = ContactCount.objects.filter(project=project).filter(created_at__range=(after, before))
     tz = pendulum.timezone("America/Maceio")
     after = pendulum.parse(after).in_timezone(tz)
     before = pendulum.parse(before).in_timezone(tz)
-    contacts_day_count = Contact.objects.filter(project=project).filter(last_seen_on__range=(after, before)).distinct("contact_flow_uuid").count()
-    return contacts_day_count
+    return ContactActivity.objects.count_distinct(project, after, before)
 
 
 def check_module_permission(claims, user):
@@ -5,3 +5,11 @@ bind = '0.0.0.0:80'
 workers = os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
 worker_class = 'gevent'
 raw_env = ['DJANGO_SETTINGS_MODULE=connect.settings']
+
+
+def post_worker_init(worker):
+    # gRPC channels are opened lazily inside each worker; make their calls
+    # cooperative with the gevent loop patched by the worker
+    from grpc.experimental import gevent as grpc_gevent
+
+    grpc_gevent.init_gevent()